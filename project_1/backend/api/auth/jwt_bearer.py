@@ -1,47 +1,114 @@
+import threading
+import time
 from fastapi import Request, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt
 import requests
 from api.core.config import settings
 
+# Minimum delay between two JWKS downloads triggered by unknown key IDs
+JWKS_REFRESH_INTERVAL = 60
+
+# Delay before retrying a failed JWKS download; doubles with every consecutive
+# failure, up to JWKS_REFRESH_INTERVAL
+JWKS_RETRY_INTERVAL = 5
+
+
+class JWKSCache:
+    """Process-wide cache of Cognito signing keys, indexed by `kid`."""
+
+    def __init__(self, jwks_url: str):
+        self.jwks_url = jwks_url
+        self._keys: dict[str, dict] = {}
+        self._fetched_at: float | None = None
+        self._failed_at: float | None = None
+        self._failures = 0
+        self._lock = threading.Lock()
+
+    def get(self, kid: str) -> dict | None:
+        return self._keys.get(kid)
+
+    def refresh(self, kid: str) -> dict | None:
+        # Keys are rotated rarely, so an unknown kid triggers at most one
+        # download per interval (invalid tokens cannot force a fetch per request).
+        # Failed downloads are retried with backoff, so an unreachable Cognito
+        # does not cost every request a download timeout either.
+        with self._lock:
+            now = time.monotonic()
+            recently_fetched = (
+                self._fetched_at is not None
+                and now - self._fetched_at < JWKS_REFRESH_INTERVAL
+            )
+            recently_failed = (
+                self._failed_at is not None
+                and now - self._failed_at < min(
+                    JWKS_RETRY_INTERVAL * 2 ** (self._failures - 1), JWKS_REFRESH_INTERVAL
+                )
+            )
+            if kid not in self._keys and not recently_fetched and not recently_failed:
+                try:
+                    jwks = requests.get(self.jwks_url, timeout=5).json()
+                    keys = {
+                        key["kid"]: {
+                            "kty": key["kty"],
+                            "kid": key["kid"],
+                            "use": key["use"],
+                            "n": key["n"],
+                            "e": key["e"]
+                        }
+                        for key in jwks["keys"]
+                    }
+                except Exception:
+                    self._failed_at = time.monotonic()
+                    self._failures += 1
+                    raise
+                self._keys = keys
+                self._fetched_at = time.monotonic()
+                self._failed_at = None
+                self._failures = 0
+            return self._keys.get(kid)
+
+
+issuer = f"{settings.COGNITO_ISSUER_URL.rstrip('/')}/{settings.COGNITO_POOL_ID}"
+jwks_cache = JWKSCache(f"{issuer}/.well-known/jwks.json")
+
 
 class JWTBearer(HTTPBearer):
     def __init__(self, auto_error: bool = True):
         super().__init__(auto_error=auto_error)
-        self.jwks_url = f"{settings.COGNITO_ISSUER_URL.rstrip('/')}/{settings.COGNITO_POOL_ID}/.well-known/jwks.json"
-        self.issuer = f"{settings.COGNITO_ISSUER_URL.rstrip('/')}/{settings.COGNITO_POOL_ID}"
+        self.issuer = issuer
 
     async def __call__(self, request: Request):
         credentials: HTTPAuthorizationCredentials = await super().__call__(request)
 
         if credentials and credentials.scheme == "Bearer":
-            payload = self.verify_jwt(credentials.credentials)
+            token = credentials.credentials
+            kid = self.get_kid(token)
+            if kid and jwks_cache.get(kid) is None:
+                # Download keys in a worker thread, never on the event loop
+                try:
+                    await run_in_threadpool(jwks_cache.refresh, kid)
+                except Exception:
+                    pass
+
+            payload = self.verify_jwt(token)
             if not payload:
                 raise HTTPException(status_code=403, detail="Invalid or expired token.")
             return payload
 
         raise HTTPException(status_code=403, detail="Invalid authorization credentials.")
 
-    def verify_jwt(self, token: str):
+    @staticmethod
+    def get_kid(token: str) -> str | None:
         try:
-            jwks = requests.get(self.jwks_url).json()
-            unverified_header = jwt.get_unverified_header(token)
-
-            rsa_key = next(
-                (
-                    {
-                        "kty": key["kty"],
-                        "kid": key["kid"],
-                        "use": key["use"],
-                        "n": key["n"],
-                        "e": key["e"]
-                    }
-                    for key in jwks["keys"]
-                    if key["kid"] == unverified_header["kid"]
-                ),
-                None
-            )
+            return jwt.get_unverified_header(token).get("kid")
+        except Exception:
+            return None
 
+    def verify_jwt(self, token: str):
+        try:
+            rsa_key = jwks_cache.get(self.get_kid(token))
             if not rsa_key:
                 return None
 
@@ -58,3 +125,8 @@ class JWTBearer(HTTPBearer):
 
         except Exception:
             return None
+
+
+# Shared instance, so FastAPI verifies the token once per request even when
+# it is declared both in `dependencies=[...]` and as a parameter
+jwt_bearer = JWTBearer()
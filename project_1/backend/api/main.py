@@ -1,7 +1,7 @@
 from fastapi import Depends, FastAPI, File, Form, HTTPException, Response, UploadFile, status
 from sqlalchemy.orm import Session
 
-from api.auth.jwt_bearer import JWTBearer
+from api.auth.jwt_bearer import jwt_bearer
 from api.core.middleware import add_middleware
 from api.services.db.deps import get_db
 from api.services.s3 import upload_file_to_s3
@@ -51,10 +51,10 @@ def health_check():
         401: {"description": "Unauthorized – invalid or missing token"}
     },
     tags=["Users"],
-    dependencies=[Depends(JWTBearer())]
+    dependencies=[Depends(jwt_bearer)]
 )
 def register_user(
-    payload: dict = Depends(JWTBearer()),
+    payload: dict = Depends(jwt_bearer),
     db: Session = Depends(get_db)
 ):
     """
@@ -96,10 +96,10 @@ def register_user(
         200: {"description": "List of conversations returned successfully"},
         401: {"description": "Unauthorized – invalid or missing token"},
     },
-    dependencies=[Depends(JWTBearer())]
+    dependencies=[Depends(jwt_bearer)]
 )
 def get_conversations(
-    payload: dict = Depends(JWTBearer()),
+    payload: dict = Depends(jwt_bearer),
     db: Session = Depends(get_db)
 ):
     """
@@ -142,11 +142,11 @@ def get_conversations(
         401: {"description": "Unauthorized – invalid or missing token"}
     },
     tags=["Messages"],
-    dependencies=[Depends(JWTBearer())]
+    dependencies=[Depends(jwt_bearer)]
 )
 def get_conversation_messages(
     conversation_id: int,
-    payload: dict = Depends(JWTBearer()),
+    payload: dict = Depends(jwt_bearer),
     db: Session = Depends(get_db)
 ):
     """
@@ -182,11 +182,11 @@ def get_conversation_messages(
         401: {"description": "Unauthorized – invalid or missing token"}
     },
     tags=["Messages"],
-    dependencies=[Depends(JWTBearer())]
+    dependencies=[Depends(jwt_bearer)]
 )
 def send_message(
     message_in: MessageCreate,
-    payload: dict = Depends(JWTBearer()),
+    payload: dict = Depends(jwt_bearer),
     db: Session = Depends(get_db)
 ):
     """
@@ -230,12 +230,12 @@ def send_message(
         401: {"description": "Unauthorized – invalid or missing token"}
     },
     tags=["Messages"],
-    dependencies=[Depends(JWTBearer())]
+    dependencies=[Depends(jwt_bearer)]
 )
 async def upload_media_message(
     conversation_id: int = Form(...),
     file: UploadFile = File(...),
-    payload: dict = Depends(JWTBearer()),
+    payload: dict = Depends(jwt_bearer),
     db: Session = Depends(get_db)
 ):
     """
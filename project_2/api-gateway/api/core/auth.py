@@ -1,40 +1,92 @@
 # api/core/auth.py
 
+import hashlib
+import threading
+import time
 from fastapi import Request, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt
-from cachetools import TTLCache
+from cachetools import TLRUCache
+from starlette.concurrency import run_in_threadpool
 import requests
 
 
+# Age after which the JWKS is downloaded again
+JWKS_TTL = 3600
+# Timeout of a JWKS download in seconds
+JWKS_TIMEOUT = 5
+# Delay before retrying a failed JWKS download; doubles with every consecutive
+# failure, up to JWKS_RETRY_MAX_INTERVAL
+JWKS_RETRY_INTERVAL = 5
+JWKS_RETRY_MAX_INTERVAL = 60
+
+
+def _expires_at(_key: str, claims: dict, _now: float) -> float:
+    return claims.get("exp", 0)
+
+
 class CognitoJWTBearer(HTTPBearer):
-    _jwks_cache = TTLCache(maxsize=1, ttl=3600)
+    """
+    Bearer authentication with Cognito-issued RS256 JWTs.
 
-    def __init__(self, pool_id: str, client_id: str, issuer_url: str, auto_error: bool = True):
+    The dependency returns the verified token claims. Each token is verified
+    once: successfully verified tokens are kept in a bounded LRU cache keyed
+    by the token's SHA-256 hash until their `exp`, so repeated requests with
+    the same token skip signature verification. Verification (and the JWKS
+    download) runs in a worker thread to keep RSA work off the event loop.
+
+    The JWKS is shared by all instances and downloaded again after
+    `JWKS_TTL`. Only one thread downloads it, outside the lock, while the
+    others keep verifying with the previous keys; failed downloads are
+    retried with backoff.
+    """
+    # Shared JWKS state, guarded by `_jwks_lock` (verification runs in worker threads)
+    _jwks_lock = threading.Lock()
+    _jwks: dict | None = None
+    _jwks_fetched_at: float | None = None
+    _jwks_fetching = False
+    _jwks_failed_at: float | None = None
+    _jwks_failures = 0
+
+    def __init__(
+        self,
+        pool_id: str,
+        client_id: str,
+        issuer_url: str,
+        auto_error: bool = True,
+        cache_size: int = 10_000
+    ):
         super().__init__(auto_error=auto_error)
         self.pool_id = pool_id
         self.client_id = client_id
         self.issuer = f"{issuer_url.rstrip('/')}/{pool_id}"
         self.jwks_url = f"{self.issuer}/.well-known/jwks.json"
+        self._verified_cache = TLRUCache(maxsize=cache_size, ttu=_expires_at, timer=time.time)
 
-    async def __call__(self, request: Request):
+    async def __call__(self, request: Request) -> dict:
         credentials: HTTPAuthorizationCredentials = await super().__call__(request)
 
         if not credentials or credentials.scheme != "Bearer":
             raise HTTPException(status_code=403, detail="Invalid authorization credentials.")
 
         token = credentials.credentials
-        payload = self.verify_jwt(token)
-        if not payload:
-            raise HTTPException(status_code=403, detail="Invalid or expired token.")
-        return credentials
+        key = hashlib.sha256(token.encode()).hexdigest()
+
+        payload = self._verified_cache.get(key)
+        if payload is None:
+            payload = await run_in_threadpool(self.verify_jwt, token)
+            if not payload:
+                raise HTTPException(status_code=403, detail="Invalid or expired token.")
+            self._verified_cache[key] = payload
+
+        return payload
 
     def verify_jwt(self, token: str):
         try:
-            if 'jwks' not in self._jwks_cache:
-                self._jwks_cache['jwks'] = requests.get(self.jwks_url).json()
+            jwks = self._get_jwks()
+            if jwks is None:
+                return None
 
-            jwks = self._jwks_cache['jwks']
             unverified_header = jwt.get_unverified_header(token)
 
             rsa_key = next(
@@ -56,11 +108,48 @@ class CognitoJWTBearer(HTTPBearer):
         except Exception:
             return None
 
-    def get_verified_payload(self, token: str) -> dict:
+    def _get_jwks(self) -> dict | None:
         """
-        Shortcut method to get verified payload or raise HTTPException if invalid.
+        Return the JWKS, downloading it if it is missing or older than `JWKS_TTL`.
+
+        Returns:
+            dict | None: The JWKS, or None if it has never been downloaded
+            (the download failed, is backing off or runs in another thread).
         """
-        payload = self.verify_jwt(token)
-        if not payload:
-            raise HTTPException(status_code=403, detail="Invalid or expired token.")
-        return payload
+        cls = CognitoJWTBearer
+        with cls._jwks_lock:
+            now = time.monotonic()
+            jwks = cls._jwks
+            stale = jwks is None or now - cls._jwks_fetched_at >= JWKS_TTL
+            backing_off = (
+                cls._jwks_failed_at is not None
+                and now - cls._jwks_failed_at < min(
+                    JWKS_RETRY_INTERVAL * 2 ** (cls._jwks_failures - 1), JWKS_RETRY_MAX_INTERVAL
+                )
+            )
+            if not stale or cls._jwks_fetching or backing_off:
+                return jwks
+            cls._jwks_fetching = True
+
+        try:
+            response = requests.get(self.jwks_url, timeout=JWKS_TIMEOUT)
+            response.raise_for_status()
+            jwks = response.json()
+            if not isinstance(jwks.get("keys"), list):
+                raise ValueError("JWKS without keys")
+        except Exception as e:
+            print(f"JWKS download failed: {str(e)}")
+            with cls._jwks_lock:
+                cls._jwks_fetching = False
+                cls._jwks_failed_at = time.monotonic()
+                cls._jwks_failures += 1
+                # Previous keys stay in use until a download succeeds
+                return cls._jwks
+
+        with cls._jwks_lock:
+            cls._jwks = jwks
+            cls._jwks_fetched_at = time.monotonic()
+            cls._jwks_fetching = False
+            cls._jwks_failed_at = None
+            cls._jwks_failures = 0
+        return jwks
@@ -7,9 +7,23 @@ class Settings(BaseSettings):
     CHAT_SERVICE_HOST: str
     CHAT_SERVICE_PORT: int
 
+    UPSTREAM_MAX_CONNECTIONS: int = 100
+    UPSTREAM_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    UPSTREAM_KEEPALIVE_EXPIRY: float = 30.0
+    UPSTREAM_TIMEOUT: float = 30.0
+    UPSTREAM_POOL_TIMEOUT: float = 5.0
+    # Requires the optional `h2` package (httpx[http2])
+    UPSTREAM_HTTP2: bool = False
+    # Separate pool for event streams (one connection per open stream)
+    UPSTREAM_STREAM_MAX_CONNECTIONS: int = 1000
+
+    PROXY_MAX_BODY_SIZE: int = 25 * 1024 * 1024
+    PROXY_BUFFER_THRESHOLD: int = 64 * 1024
+
     COGNITO_ISSUER_URL: str
     COGNITO_POOL_ID: str
     COGNITO_CLIENT_ID: str
+    JWT_CACHE_SIZE: int = 10_000
 
     CORS_ALLOW_ORIGINS: str
 
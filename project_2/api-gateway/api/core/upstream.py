@@ -0,0 +1,150 @@
+# api/core/upstream.py
+
+"""
+Shared HTTP clients for the upstream microservices.
+
+One long-lived `httpx.AsyncClient` is kept per upstream service, so proxied
+requests reuse keep-alive connections instead of opening a new TCP connection
+for every call. Clients are created in the application lifespan and closed on
+shutdown.
+
+Long-lived streams (Server-Sent Events) use a separate upstream with its own
+pool and no read timeout, so open streams cannot exhaust the connections
+of regular API calls.
+
+Each upstream also tracks how busy its connection pool is (requests in
+flight, peak usage and pool timeouts); `GET /metrics/upstreams/` exposes
+these numbers to spot pool saturation under load.
+"""
+
+import httpx
+from api.core.config import settings
+
+
+class Upstream:
+    """
+    A single upstream service with its pooled client and pool usage counters.
+
+    Attributes:
+        name (str): Upstream name used in metrics.
+        base_url (str): Base URL of the service.
+        max_connections (int): Connection limit of the pool.
+        read_timeout (float | None): Read timeout of upstream responses, None to wait indefinitely.
+        client (httpx.AsyncClient | None): Shared client, available after `start()`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        max_connections: int,
+        max_keepalive_connections: int,
+        read_timeout: float | None = settings.UPSTREAM_TIMEOUT
+    ):
+        self.name = name
+        self.base_url = base_url
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.read_timeout = read_timeout
+        self.client: httpx.AsyncClient | None = None
+
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests_total = 0
+        self.pool_timeouts = 0
+
+    def start(self):
+        """Create the pooled client."""
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=settings.UPSTREAM_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(
+                settings.UPSTREAM_TIMEOUT,
+                read=self.read_timeout,
+                pool=settings.UPSTREAM_POOL_TIMEOUT
+            ),
+            http2=settings.UPSTREAM_HTTP2,
+        )
+
+    async def stop(self):
+        """Close the pooled client and all its connections."""
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+
+    def acquire(self):
+        """Record the start of a request using a pool connection."""
+        self.in_flight += 1
+        self.requests_total += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def release(self):
+        """Record the end of a request started with `acquire()`."""
+        self.in_flight -= 1
+
+    def record_pool_timeout(self):
+        """Record a request that could not get a connection from the pool in time."""
+        self.pool_timeouts += 1
+
+    def metrics(self) -> dict:
+        """
+        Return current pool usage.
+
+        Returns:
+            dict: In-flight, peak and total request counts, pool timeouts
+            and saturation (in-flight requests relative to the connection limit).
+        """
+        return {
+            "max_connections": self.max_connections,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "saturation": round(self.in_flight / self.max_connections, 3),
+            "requests_total": self.requests_total,
+            "pool_timeouts": self.pool_timeouts,
+        }
+
+
+class UpstreamRegistry:
+    """
+    All upstream services of the gateway, keyed by name.
+    """
+
+    def __init__(self, upstreams: list[Upstream]):
+        self._upstreams = {upstream.name: upstream for upstream in upstreams}
+
+    def __getitem__(self, name: str) -> Upstream:
+        return self._upstreams[name]
+
+    def start(self):
+        for upstream in self._upstreams.values():
+            upstream.start()
+
+    async def stop(self):
+        for upstream in self._upstreams.values():
+            await upstream.stop()
+
+    def metrics(self) -> dict:
+        return {name: upstream.metrics() for name, upstream in self._upstreams.items()}
+
+
+upstreams = UpstreamRegistry([
+    Upstream(
+        name="chat",
+        base_url=f"http://{settings.CHAT_SERVICE_HOST}:{settings.CHAT_SERVICE_PORT}",
+        max_connections=settings.UPSTREAM_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.UPSTREAM_MAX_KEEPALIVE_CONNECTIONS,
+    ),
+    # Event streams stay open indefinitely; keep-alive comments arrive every
+    # REALTIME_KEEPALIVE_INTERVAL seconds, so reads are not timed out
+    Upstream(
+        name="chat_stream",
+        base_url=f"http://{settings.CHAT_SERVICE_HOST}:{settings.CHAT_SERVICE_PORT}",
+        max_connections=settings.UPSTREAM_STREAM_MAX_CONNECTIONS,
+        max_keepalive_connections=0,
+        read_timeout=None,
+    ),
+])
@@ -3,14 +3,17 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from api.core.middleware import add_middleware
+from api.core.upstream import upstreams
 from api.routes import proxy
 
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
     print("Starting up API Gateway...")
+    upstreams.start()
     yield
     print("Shutting down API Gateway...")
+    await upstreams.stop()
 
 app = FastAPI(
     lifespan=lifespan,
@@ -34,5 +37,14 @@ add_middleware(app)
 def health_check():
     return {"status": "ok"}
 
+@app.get(
+    "/metrics/upstreams/",
+    summary="Upstream pool metrics",
+    description="Connection pool usage of each upstream service",
+    tags=["Health"]
+)
+def upstream_metrics():
+    return upstreams.metrics()
+
 # Mount routers
 app.include_router(proxy.router, prefix="/api")
\ No newline at end of file
@@ -2,17 +2,108 @@
 
 import httpx
 import json
-from fastapi import APIRouter, Request, HTTPException, Response, Depends
-from fastapi.security import HTTPAuthorizationCredentials
+from fastapi import APIRouter, Request, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from api.core.auth import CognitoJWTBearer
 from api.core.config import settings
+from api.core.upstream import Upstream, upstreams
 
 jwt_bearer = CognitoJWTBearer(
     pool_id=settings.COGNITO_POOL_ID,
     client_id=settings.COGNITO_CLIENT_ID,
     issuer_url=settings.COGNITO_ISSUER_URL,
+    cache_size=settings.JWT_CACHE_SIZE,
 )
 
+# Connection-specific headers that must not be forwarded by a proxy (RFC 9110, section 7.6.1)
+HOP_BY_HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailer", "transfer-encoding", "upgrade",
+}
+
+
+class RequestBodyTooLarge(Exception):
+    """Raised while streaming a request body that exceeds `PROXY_MAX_BODY_SIZE`."""
+
+
+async def _limited_body(request: Request):
+    """Yield the request body chunk by chunk, enforcing the maximum body size."""
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > settings.PROXY_MAX_BODY_SIZE:
+            raise RequestBodyTooLarge()
+        yield chunk
+
+
+async def _request_body(request: Request):
+    """
+    Return the body to forward upstream.
+
+    Bodies of known size up to `PROXY_BUFFER_THRESHOLD` are read into memory,
+    so they can be re-sent if the upstream redirects (e.g. to add a trailing
+    slash). Larger or chunked bodies are streamed without buffering.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length is not None:
+        try:
+            size = int(content_length)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid Content-Length header.")
+        if size > settings.PROXY_MAX_BODY_SIZE:
+            raise HTTPException(status_code=413, detail="Request body too large.")
+        if size <= settings.PROXY_BUFFER_THRESHOLD:
+            return await request.body()
+    elif "transfer-encoding" not in request.headers:
+        return b""
+
+    return _limited_body(request)
+
+
+class UpstreamStream:
+    """
+    Body of a streamed upstream response, closed exactly once.
+
+    The upstream response is closed and its `in_flight` slot released when
+    the body is fully sent, and also when the client disconnects or the
+    stream fails midway, in which case Starlette runs no background task.
+    """
+
+    def __init__(self, response: httpx.Response, upstream: Upstream):
+        self.response = response
+        self.upstream = upstream
+        self.closed = False
+
+    async def __aiter__(self):
+        try:
+            async for chunk in self.response.aiter_raw():
+                yield chunk
+        finally:
+            await self.aclose()
+
+    async def aclose(self):
+        if self.closed:
+            return
+        self.closed = True
+        # Released first, so the counter stays right even if closing is cancelled
+        self.upstream.release()
+        await self.response.aclose()
+
+
+class UpstreamStreamingResponse(StreamingResponse):
+    """Streaming response that always closes its `UpstreamStream`, even if sending is cancelled."""
+
+    def __init__(self, stream: UpstreamStream, **kwargs):
+        super().__init__(stream.__aiter__(), **kwargs)
+        self.stream = stream
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.stream.aclose()
+
+
 router = APIRouter()
 
 @router.api_route(
@@ -24,63 +115,61 @@ router = APIRouter()
 async def proxy(
     full_path: str,
     request: Request,
-    credentials: HTTPAuthorizationCredentials = Depends(jwt_bearer)
+    token_payload: dict = Depends(jwt_bearer)
 ):
-    # 1. Extract request data
+    # 1. Extract request data (the body is forwarded as-is, without decoding)
     method = request.method
-    headers = dict(request.headers)
+    headers = {
+        k: v for k, v in request.headers.items()
+        if k.lower() not in HOP_BY_HOP_HEADERS and k.lower() != "host"
+    }
     query_params = request.query_params
-    body = await request.body()
+    body = await _request_body(request)
 
     # 2. Set target microservice based on the path
-    if full_path.startswith(("messages", "chats", "users")):
-        service_host = settings.CHAT_SERVICE_HOST
-        service_port = settings.CHAT_SERVICE_PORT
+    if full_path.startswith("messages/stream"):
+        # Streams hold their connection while open, so they get their own pool
+        upstream = upstreams["chat_stream"]
+    elif full_path.startswith(("messages", "chats", "users")):
+        upstream = upstreams["chat"]
     else:
         raise HTTPException(status_code=404, detail="Unknown path prefix, no matching service.")
 
-    # 3. Build target URL
-    target_url = f"http://{service_host}:{service_port}/{full_path}"
+    # 3. Build target URL (relative to the upstream client's base URL)
+    target_url = f"/{full_path}"
 
-    # 4. Inject token payload as custom header
-    token = credentials.credentials
-    try:
-        token_payload = jwt_bearer.get_verified_payload(token)
-        headers["X-User-Payload"] = json.dumps(token_payload)
-    except Exception as e:
-        raise HTTPException(status_code=403, detail="Invalid or expired token.")
+    # 4. Inject the verified token payload as custom header
+    headers["X-User-Payload"] = json.dumps(token_payload)
 
-    # 5. Forward request to internal service
+    # 5. Forward request to internal service over the shared, pooled client
+    client = upstream.client
+    upstream_request = client.build_request(
+        method=method,
+        url=target_url,
+        content=body,
+        params=query_params,
+        headers=headers
+    )
+    upstream.acquire()
     try:
-        async with httpx.AsyncClient() as client:
-            if headers.get("content-type", "").startswith("application/json"):
-                parsed_body = json.loads(body or "{}")
-                proxy_response = await client.request(
-                    method=method,
-                    url=target_url,
-                    json=parsed_body,
-                    params=query_params,
-                    headers=headers,
-                    timeout=30.0,
-                    follow_redirects=True
-                )
-            else:
-                proxy_response = await client.request(
-                    method=method,
-                    url=target_url,
-                    content=body,
-                    params=query_params,
-                    headers=headers,
-                    timeout=30.0,
-                    follow_redirects=True
-                )
+        proxy_response = await client.send(upstream_request, stream=True, follow_redirects=True)
+    except RequestBodyTooLarge:
+        upstream.release()
+        raise HTTPException(status_code=413, detail="Request body too large.")
+    except httpx.StreamConsumed:
+        upstream.release()
+        raise HTTPException(status_code=400, detail="Streamed request body cannot follow a redirect; use the canonical path.")
+    except httpx.PoolTimeout:
+        upstream.release()
+        upstream.record_pool_timeout()
+        raise HTTPException(status_code=503, detail="Service is overloaded, try again later.")
     except httpx.RequestError as e:
+        upstream.release()
         raise HTTPException(status_code=502, detail=f"Error contacting service: {str(e)}")
 
-    # 6. Return response
-    return Response(
-        content=proxy_response.content,
+    # 6. Stream the response back without decoding (Content-Encoding is preserved)
+    return UpstreamStreamingResponse(
+        UpstreamStream(proxy_response, upstream),
         status_code=proxy_response.status_code,
-        headers={k: v for k, v in proxy_response.headers.items() if k.lower() != "content-encoding"},
-        media_type=proxy_response.headers.get("content-type")
+        headers={k: v for k, v in proxy_response.headers.items() if k.lower() not in HOP_BY_HOP_HEADERS}
     )
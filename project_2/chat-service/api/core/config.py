@@ -17,6 +17,21 @@ class Settings(BaseSettings):
     MEDIA_SERVICE_PORT: int
 
     NOTIFICATION_RECEIVER_EMAIL: str
+
+    OUTBOX_BATCH_SIZE: int = 50
+    OUTBOX_POLL_INTERVAL: float = 5.0
+    OUTBOX_MAX_ATTEMPTS: int = 20
+    OUTBOX_BACKOFF_BASE: float = 2.0
+    OUTBOX_BACKOFF_MAX: float = 300.0
+    # Must exceed the time to send a batch (HTTP timeout of 5 s per request)
+    OUTBOX_CLAIM_LEASE: float = 60.0
+    OUTBOX_DEAD_RETENTION_DAYS: int = 7
+    OUTBOX_PRUNE_INTERVAL: float = 3600.0
+
+    REALTIME_CHANNEL: str = "chat_messages"
+    REALTIME_QUEUE_SIZE: int = 100
+    REALTIME_KEEPALIVE_INTERVAL: float = 15.0
+
     CORS_ALLOW_ORIGINS: str
 
     model_config = SettingsConfigDict(
@@ -3,9 +3,10 @@
 """
 Database initialization script.
 
-This script creates all database tables based on the SQLAlchemy ORM models.
-It connects to the database using the async engine and runs the schema creation
-within an async context.
+This script brings the database schema up to date by applying all pending
+versioned migrations from `api/db/migrations/` (see `api/db/migrate.py`).
+It is safe to run repeatedly and on databases that were created earlier
+with `Base.metadata.create_all`.
 
 Usage:
     Run the script directly to initialize the database schema:
@@ -14,21 +15,16 @@ Usage:
 """
 
 import asyncio
-from api.db.session import engine
-from api.models.base import Base
-from api.models.user import User
-from api.models.chat import Chat
-from api.models import user, chat, message
+from api.db.migrate import run_migrations
 
 async def init_db():
     """
     Initializes the database schema.
 
-    This function connects to the database and creates all tables
-    defined in the SQLAlchemy models (Base metadata).
+    This function applies all pending migrations to the database
+    configured in the environment.
     """
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    await run_migrations()
 
 if __name__ == "__main__":
     # Run the async init function using asyncio
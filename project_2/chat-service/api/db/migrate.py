@@ -0,0 +1,168 @@
+# api/db/migrate.py
+
+"""
+Versioned schema migrations for the chat database.
+
+Migrations are plain SQL files stored in `api/db/migrations/` and named
+`<version>_<description>.sql` (e.g. `0003_hot_path_indexes.sql`). They are
+applied in version order, each in its own transaction, and recorded in the
+`schema_migrations` table so every migration runs exactly once per database.
+
+A PostgreSQL advisory lock is held while migrating, so several replicas can
+run the migrator at startup without applying the same migration twice.
+
+Usage:
+    Apply all pending migrations:
+
+    $ python api/db/migrate.py
+"""
+
+import asyncio
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from api.db.session import engine
+
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+
+# Arbitrary application-wide key for pg_advisory_lock
+MIGRATION_LOCK_ID = 724_031_001
+
+_FILENAME_PATTERN = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+
+@dataclass(frozen=True)
+class Migration:
+    """
+    A single schema migration loaded from disk.
+
+    Attributes:
+        version (int): Monotonic version number taken from the file name prefix.
+        name (str): Human-readable description taken from the file name.
+        statements (list[str]): SQL statements to execute, in order.
+    """
+    version: int
+    name: str
+    statements: list[str]
+
+
+def _split_statements(sql: str) -> list[str]:
+    """
+    Split a SQL script into individual statements.
+
+    Comment lines are dropped and statements are separated on `;`.
+    Migrations must therefore not contain semicolons inside literals
+    or function bodies.
+
+    Args:
+        sql (str): Content of a migration file.
+
+    Returns:
+        list[str]: Non-empty SQL statements.
+    """
+    lines = [line for line in sql.splitlines() if not line.strip().startswith("--")]
+    return [stmt.strip() for stmt in "\n".join(lines).split(";") if stmt.strip()]
+
+
+def load_migrations() -> list[Migration]:
+    """
+    Load all migrations from the migrations directory, ordered by version.
+
+    Returns:
+        list[Migration]: Migrations sorted by ascending version.
+
+    Raises:
+        RuntimeError: If a file name is malformed or two files share a version.
+    """
+    migrations = {}
+    for path in sorted(MIGRATIONS_DIR.glob("*.sql")):
+        match = _FILENAME_PATTERN.match(path.name)
+        if not match:
+            raise RuntimeError(f"Invalid migration file name: {path.name}")
+
+        version = int(match.group(1))
+        if version in migrations:
+            raise RuntimeError(f"Duplicate migration version: {version}")
+
+        migrations[version] = Migration(
+            version=version,
+            name=match.group(2),
+            statements=_split_statements(path.read_text()),
+        )
+
+    return [migrations[version] for version in sorted(migrations)]
+
+
+async def _applied_versions(conn: AsyncConnection) -> set[int]:
+    """
+    Ensure the bookkeeping table exists and return the applied versions.
+
+    Args:
+        conn (AsyncConnection): Open database connection.
+
+    Returns:
+        set[int]: Versions already recorded in `schema_migrations`.
+    """
+    await conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        " version INTEGER PRIMARY KEY,"
+        " name TEXT NOT NULL,"
+        " applied_at TIMESTAMP NOT NULL DEFAULT NOW()"
+        ")"
+    ))
+    result = await conn.execute(text("SELECT version FROM schema_migrations"))
+    await conn.commit()
+    return set(result.scalars().all())
+
+
+async def run_migrations() -> list[Migration]:
+    """
+    Apply all pending migrations to the chat database.
+
+    Each migration runs in its own transaction together with the insert
+    into `schema_migrations`, so a failing migration leaves no partial
+    changes and is retried on the next run.
+
+    Returns:
+        list[Migration]: The migrations applied by this call (empty if up to date).
+    """
+    applied = []
+
+    async with engine.connect() as conn:
+        await conn.execute(text(f"SELECT pg_advisory_lock({MIGRATION_LOCK_ID})"))
+        await conn.commit()
+        try:
+            done = await _applied_versions(conn)
+
+            for migration in load_migrations():
+                if migration.version in done:
+                    continue
+
+                for statement in migration.statements:
+                    await conn.exec_driver_sql(statement)
+                await conn.execute(
+                    text("INSERT INTO schema_migrations (version, name) VALUES (:version, :name)"),
+                    {"version": migration.version, "name": migration.name},
+                )
+                await conn.commit()
+                applied.append(migration)
+        finally:
+            await conn.rollback()
+            await conn.execute(text(f"SELECT pg_advisory_unlock({MIGRATION_LOCK_ID})"))
+            await conn.commit()
+
+    return applied
+
+
+async def main():
+    applied = await run_migrations()
+    if not applied:
+        print("Database schema is up to date.")
+    for migration in applied:
+        print(f"Applied migration {migration.version:04d}_{migration.name}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
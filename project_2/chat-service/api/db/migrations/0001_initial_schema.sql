@@ -0,0 +1,28 @@
+-- 0001_initial_schema.sql
+-- Baseline schema of the chat database (users, chats, messages).
+-- Uses IF NOT EXISTS so databases created earlier with
+-- Base.metadata.create_all can adopt the migration history as-is.
+
+CREATE TABLE IF NOT EXISTS users (
+    sub VARCHAR PRIMARY KEY,
+    email VARCHAR NOT NULL UNIQUE,
+    first_name VARCHAR NOT NULL,
+    last_name VARCHAR NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS chats (
+    id SERIAL PRIMARY KEY,
+    user1_sub VARCHAR NOT NULL REFERENCES users(sub),
+    user2_sub VARCHAR NOT NULL REFERENCES users(sub),
+    created_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS messages (
+    id SERIAL PRIMARY KEY,
+    chat_id INTEGER REFERENCES chats(id) ON DELETE CASCADE,
+    sender_sub VARCHAR NOT NULL REFERENCES users(sub),
+    content TEXT,
+    media_url VARCHAR,
+    media_id UUID,
+    sent_at TIMESTAMP DEFAULT NOW()
+);
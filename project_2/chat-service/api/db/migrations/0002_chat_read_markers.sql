@@ -0,0 +1,5 @@
+-- 0002_chat_read_markers.sql
+-- Per-participant read markers used to compute unread counts in GET /chats.
+
+ALTER TABLE chats ADD COLUMN IF NOT EXISTS user1_last_read_id INTEGER;
+ALTER TABLE chats ADD COLUMN IF NOT EXISTS user2_last_read_id INTEGER;
@@ -0,0 +1,15 @@
+-- 0003_hot_path_indexes.sql
+-- Indexes for the inbox, message history and chat creation queries.
+--
+-- The unique index on the unordered participant pair replaces the
+-- application-level "does this chat exist" check. It fails to build if
+-- duplicate chats already exist; remove them before applying.
+
+CREATE INDEX IF NOT EXISTS ix_chats_user1_sub ON chats (user1_sub);
+CREATE INDEX IF NOT EXISTS ix_chats_user2_sub ON chats (user2_sub);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_chats_participant_pair
+    ON chats (LEAST(user1_sub, user2_sub), GREATEST(user1_sub, user2_sub));
+
+CREATE INDEX IF NOT EXISTS ix_messages_chat_id_sent_at ON messages (chat_id, sent_at, id);
+CREATE INDEX IF NOT EXISTS ix_messages_sender_sub ON messages (sender_sub);
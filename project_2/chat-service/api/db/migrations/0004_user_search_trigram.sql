@@ -0,0 +1,10 @@
+-- 0004_user_search_trigram.sql
+-- Trigram index for GET /users/search.
+--
+-- The indexed expression must match the one used by the query
+-- (first_name || ' ' || last_name) for the planner to use it.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS ix_users_full_name_trgm
+    ON users USING gin ((first_name || ' ' || last_name) gin_trgm_ops);
@@ -0,0 +1,19 @@
+-- 0005_notification_outbox.sql
+-- Transactional outbox for new-message notifications.
+-- Rows are inserted in the same transaction as the message and drained
+-- by the background dispatcher in api/services/outbox.py.
+
+CREATE TABLE IF NOT EXISTS notification_outbox (
+    id SERIAL PRIMARY KEY,
+    message_id INTEGER NOT NULL REFERENCES messages(id) ON DELETE CASCADE,
+    sender_sub VARCHAR NOT NULL,
+    content TEXT,
+    has_media BOOLEAN NOT NULL DEFAULT FALSE,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    last_error TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS ix_notification_outbox_available_at
+    ON notification_outbox (available_at, id);
@@ -0,0 +1,9 @@
+-- 0006_outbox_dead_entries.sql
+-- Outbox entries that ran out of delivery attempts are kept as dead entries
+-- (dead_at set) for inspection, and pruned after OUTBOX_DEAD_RETENTION_DAYS.
+
+ALTER TABLE notification_outbox ADD COLUMN IF NOT EXISTS dead_at TIMESTAMP;
+
+CREATE INDEX IF NOT EXISTS ix_notification_outbox_dead_at
+    ON notification_outbox (dead_at)
+    WHERE dead_at IS NOT NULL;
@@ -8,7 +8,7 @@ mounts all the routers, and defines lifecycle events.
 
 Mounted routers:
 - /healthz/: Health check endpoint.
-- /messages: Message-related endpoints (create, get messages).
+- /messages: Message-related endpoints (create, get and stream messages).
 - /chats: Chat-related endpoints (list chats).
 - /users: User-related endpoints (search, register).
 
@@ -20,6 +20,8 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from api.core.middleware import add_middleware
 from api.routes import message, chat, user
+from api.services.outbox import dispatcher
+from api.services.realtime import listener
 
 
 @asynccontextmanager
@@ -27,6 +29,9 @@ async def lifespan(_app: FastAPI):
     """
     Define the startup and shutdown logic for the chat-service.
 
+    Starts the notification outbox dispatcher and the real-time message
+    listener on startup and stops them on shutdown.
+
     Args:
         _app (FastAPI): The FastAPI application instance.
 
@@ -34,8 +39,12 @@ async def lifespan(_app: FastAPI):
         None
     """
     print("Starting up chat-service...")
+    dispatcher.start()
+    listener.start()
     yield
     print("Shutting down chat-service...")
+    await listener.stop()
+    await dispatcher.stop()
 
 
 # Initialize the FastAPI application
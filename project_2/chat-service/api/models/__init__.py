@@ -1,3 +1,4 @@
 from .user import User
 from .chat import Chat
-from .message import Message
\ No newline at end of file
+from .message import Message
+from .outbox import NotificationOutbox
\ No newline at end of file
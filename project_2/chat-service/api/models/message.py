@@ -8,7 +8,7 @@ text content and optional media attachments.
 """
 
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Text, func
+from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Text, Index, func
 from sqlalchemy.orm import relationship
 from .base import Base
 
@@ -39,7 +39,16 @@ class Message(Base):
     media_id = Column(UUID(as_uuid=True), nullable=True)
     sent_at = Column(DateTime, server_default=func.now())
 
+    __table_args__ = (
+        # Serves per-chat history ordered by (sent_at, id) and the last-message lookup
+        Index("ix_messages_chat_id_sent_at", "chat_id", "sent_at", "id"),
+        Index("ix_messages_sender_sub", "sender_sub"),
+    )
+
     chat = relationship(
         "Chat",
         back_populates="messages"
     )
+
+    # Fetch `sent_at` with INSERT ... RETURNING, so a flushed message can be serialized without a refresh
+    __mapper_args__ = {"eager_defaults": True}
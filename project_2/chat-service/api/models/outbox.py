@@ -0,0 +1,58 @@
+# api/models/outbox.py
+
+"""
+SQLAlchemy model for the NotificationOutbox table.
+
+This model represents a pending new-message notification. Rows are written
+in the same transaction as the message itself and delivered asynchronously
+to the notification-service by the outbox dispatcher.
+"""
+
+from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Text, Boolean, Index, func
+from sqlalchemy.orm import relationship
+from .base import Base
+
+class NotificationOutbox(Base):
+    """
+    Outbox entry for a notification that still has to be delivered.
+
+    Attributes:
+        id (int): Primary key (delivery order).
+        message_id (int): Foreign key referencing the message that triggered the notification.
+        sender_sub (str): Cognito `sub` of the message sender.
+        content (str | None): Text content of the message, if any.
+        has_media (bool): Whether the message contains media.
+        attempts (int): Number of failed delivery attempts so far.
+        available_at (datetime): Earliest time of the next delivery attempt.
+        last_error (str | None): Error of the last failed attempt, if any.
+        dead_at (datetime | None): When the entry ran out of delivery attempts;
+            dead entries are no longer sent and are pruned after a retention period.
+        created_at (datetime): Timestamp when the entry was created (auto-generated).
+
+    Relationships:
+        message (Message): The message that triggered the notification.
+    """
+
+    __tablename__ = "notification_outbox"
+
+    id = Column(Integer, primary_key=True)
+    message_id = Column(Integer, ForeignKey("messages.id", ondelete="CASCADE"), nullable=False)
+    sender_sub = Column(String, nullable=False)
+    content = Column(Text, nullable=True)
+    has_media = Column(Boolean, nullable=False, server_default="false")
+    attempts = Column(Integer, nullable=False, server_default="0")
+    available_at = Column(DateTime, nullable=False, server_default=func.now())
+    last_error = Column(Text, nullable=True)
+    dead_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+
+    message = relationship("Message")
+
+    __table_args__ = (
+        Index("ix_notification_outbox_available_at", "available_at", "id"),
+        Index(
+            "ix_notification_outbox_dead_at",
+            "dead_at",
+            postgresql_where=dead_at.isnot(None)
+        ),
+    )
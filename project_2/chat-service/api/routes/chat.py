@@ -4,19 +4,25 @@
 Chat endpoints module.
 
 This module provides endpoints for managing user chats:
-- Retrieving all chats for the authenticated user.
+- Retrieving all chats for the authenticated user, with a last-message preview
+  and unread count, sorted by recent activity.
 - Creating a new chat with another user if it doesn't already exist.
 """
 
 import json
 from fastapi import APIRouter, Depends, HTTPException, Header
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, case, func, or_, true
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from api.db.deps import get_db
 from api.models.chat import Chat
+from api.models.message import Message
 from api.models.user import User
 from api.schemas.chat import ChatListItem, ChatParticipant, ChatCreate
 
+# Maximum number of characters of the last message included in the chat list
+PREVIEW_LENGTH = 100
+
 router = APIRouter()
 
 
@@ -24,7 +30,11 @@ router = APIRouter()
     "/",
     response_model=list[ChatListItem],
     summary="Get user chats",
-    description="Returns all chats for the authenticated user, excluding full user data.",
+    description=(
+        "Returns all chats for the authenticated user, excluding full user data. "
+        "Each chat includes a preview of its last message and the number of unread messages, "
+        "and the list is sorted by most recent activity."
+    ),
     responses={
         200: {"description": "List of user chats"},
         400: {"description": "Invalid token payload"},
@@ -38,14 +48,16 @@ async def get_user_chats(
     """
     Retrieve all chats for the authenticated user.
 
-    For each chat, it includes minimal chat information and basic details of the other participant.
+    For each chat, it includes minimal chat information, basic details of the other participant,
+    a preview of the last message and the unread count. The list is built with a single query
+    and sorted by the time of the last message (or chat creation for empty chats), newest first.
 
     Args:
         x_user_payload (str): JWT payload (JSON string) from the gateway-provided header.
         db (AsyncSession): Dependency-injected SQLAlchemy async session.
 
     Returns:
-        list[ChatListItem]: List of user's chats with simplified participant info.
+        list[ChatListItem]: List of user's chats with participant info and last-message summary.
 
     Raises:
         HTTPException: If token is missing or malformed, or sub is not present.
@@ -59,31 +71,62 @@ async def get_user_chats(
     if not current_user_sub:
         raise HTTPException(status_code=400, detail="Missing 'sub' in token payload")
 
-    # Retrieve all chats where current user is a participant
-    result = await db.execute(
-        select(Chat).where(
-            (Chat.user1_sub == current_user_sub) | (Chat.user2_sub == current_user_sub)
+    # Build the whole inbox in a single round trip:
+    # - join the other participant's profile,
+    # - pick the newest message per chat with a LATERAL subquery,
+    # - count messages from the other participant newer than the user's read marker.
+    is_user1 = Chat.user1_sub == current_user_sub
+    other_sub = case((is_user1, Chat.user2_sub), else_=Chat.user1_sub)
+    last_read_id = case((is_user1, Chat.user1_last_read_id), else_=Chat.user2_last_read_id)
+
+    last_message = (
+        select(
+            func.left(Message.content, PREVIEW_LENGTH).label("content"),
+            Message.media_url,
+            Message.sent_at,
         )
+        .where(Message.chat_id == Chat.id)
+        .order_by(Message.sent_at.desc(), Message.id.desc())
+        .limit(1)
+        .lateral("last_message")
+    )
+    unread_count = (
+        select(func.count(Message.id))
+        .where(
+            Message.chat_id == Chat.id,
+            Message.sender_sub != current_user_sub,
+            Message.id > func.coalesce(last_read_id, 0),
+        )
+        .scalar_subquery()
     )
-    chats = result.scalars().all()
-    chat_items = []
-
-    # For each chat, fetch the other participant's basic details
-    for chat in chats:
-        other_sub = chat.user2_sub if chat.user1_sub == current_user_sub else chat.user1_sub
-        user_result = await db.execute(select(User).where(User.sub == other_sub))
-        other_user = user_result.scalar_one_or_none()
-
-        if other_user:
-            chat_items.append(ChatListItem(
-                id=chat.id,
-                participant=ChatParticipant(
-                    first_name=other_user.first_name,
-                    last_name=other_user.last_name
-                )
-            ))
 
-    return chat_items
+    stmt = (
+        select(
+            Chat.id,
+            User.first_name,
+            User.last_name,
+            last_message.c.content,
+            last_message.c.media_url,
+            last_message.c.sent_at,
+            unread_count.label("unread_count"),
+        )
+        .join(User, User.sub == other_sub)
+        .outerjoin(last_message, true())
+        .where(or_(Chat.user1_sub == current_user_sub, Chat.user2_sub == current_user_sub))
+        .order_by(func.coalesce(last_message.c.sent_at, Chat.created_at).desc(), Chat.id.desc())
+    )
+    result = await db.execute(stmt)
+
+    return [
+        ChatListItem(
+            id=row.id,
+            participant=ChatParticipant(first_name=row.first_name, last_name=row.last_name),
+            last_message_preview=row.content or ("[Media]" if row.media_url else None),
+            last_message_at=row.sent_at,
+            unread_count=row.unread_count,
+        )
+        for row in result
+    ]
 
 
 @router.post(
@@ -139,31 +182,29 @@ async def create_chat(
     if not target_user:
         raise HTTPException(status_code=404, detail="Target user not found")
 
-    existing_chat_result = await db.execute(
-        select(Chat).where(
-            ((Chat.user1_sub == current_user_sub) & (Chat.user2_sub == chat_in.target_user_sub)) |
-            ((Chat.user1_sub == chat_in.target_user_sub) & (Chat.user2_sub == current_user_sub))
+    # Insert the chat unless one already exists for this (unordered) pair of users.
+    # The unique index on (LEAST, GREATEST) makes this atomic under concurrent requests.
+    insert_result = await db.execute(
+        pg_insert(Chat)
+        .values(user1_sub=current_user_sub, user2_sub=chat_in.target_user_sub)
+        .on_conflict_do_nothing(
+            index_elements=[
+                func.least(Chat.user1_sub, Chat.user2_sub),
+                func.greatest(Chat.user1_sub, Chat.user2_sub),
+            ]
         )
+        .returning(Chat.id)
     )
-    existing_chat = existing_chat_result.scalar_one_or_none()
-    if existing_chat:
+    new_chat_id = insert_result.scalar_one_or_none()
+    if new_chat_id is None:
         raise HTTPException(status_code=409, detail="Chat already exists")
 
-    new_chat = Chat(user1_sub=current_user_sub, user2_sub=chat_in.target_user_sub)
-    db.add(new_chat)
     await db.commit()
-    await db.refresh(new_chat)
-
-    # Load the user1 and user2 relationships
-    await db.refresh(new_chat, attribute_names=["user1", "user2"])
-
-    # Determine the other user based on the current user's sub
-    other_user = new_chat.user2 if new_chat.user1_sub == current_user_sub else new_chat.user1
 
     return ChatListItem(
-        id=new_chat.id,
+        id=new_chat_id,
         participant=ChatParticipant(
-            first_name=other_user.first_name,
-            last_name=other_user.last_name
+            first_name=target_user.first_name,
+            last_name=target_user.last_name
         )
     )
@@ -1,17 +1,53 @@
 # api/routes/message.py
 
+import asyncio
 import json
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Header
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import tuple_, update, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from api.core.config import settings
 from api.db.deps import get_db
 from api.models.message import Message
 from api.models.chat import Chat
-from api.schemas.message import MessageOut, MessageTextIn
-from api.services.notification import send_notification_for_message
+from api.schemas.message import MarkReadIn, MessageOut, MessageTextIn
+from api.services.outbox import enqueue_message_notification, dispatcher
 from api.services.media import upload_media_to_s3
+from api.services.pagination import encode_cursor, decode_cursor
+from api.services.realtime import broker, publish_message_event
 from uuid import UUID
 
+# Page size limits for GET /messages/{chat_id}/
+MESSAGES_PAGE_DEFAULT = 50
+MESSAGES_PAGE_MAX = 200
+
+
+def get_user_sub(x_user_payload: str) -> str:
+    """
+    Extracts the user's `sub` from the X-User-Payload header.
+
+    Args:
+        x_user_payload (str): JSON string from the X-User-Payload header.
+
+    Returns:
+        str: The Cognito `sub` of the authenticated user.
+
+    Raises:
+        HTTPException: 400 if the payload is invalid or has no `sub`.
+    """
+    try:
+        payload = json.loads(x_user_payload)
+        user_sub = payload.get("sub")
+    except (json.JSONDecodeError, AttributeError):
+        raise HTTPException(status_code=400, detail="Invalid X-User-Payload header")
+
+    if not user_sub:
+        raise HTTPException(status_code=400, detail="Missing 'sub' in token payload")
+
+    return user_sub
+
 
 async def get_validated_chat_and_user(
     db: AsyncSession,
@@ -35,14 +71,7 @@ async def get_validated_chat_and_user(
             - 403: User is not a participant of the chat.
             - 404: Chat not found.
     """
-    try:
-        payload = json.loads(x_user_payload)
-        sender_sub = payload.get("sub")
-    except (json.JSONDecodeError, AttributeError):
-        raise HTTPException(status_code=400, detail="Invalid X-User-Payload header")
-
-    if not sender_sub:
-        raise HTTPException(status_code=400, detail="Missing 'sub' in token payload")
+    sender_sub = get_user_sub(x_user_payload)
 
     # Check if chat exists
     chat_result = await db.execute(select(Chat).where(Chat.id == chat_id))
@@ -75,7 +104,7 @@ router = APIRouter()
         400: {"description": "Invalid input data or missing token payload"},
         403: {"description": "The user is not a participant of the specified chat"},
         404: {"description": "Chat not found"},
-        500: {"description": "Unexpected server error (e.g., notification failure)"}
+        500: {"description": "Unexpected server error"}
     },
     tags=["Messages"]
 )
@@ -97,8 +126,9 @@ async def create_text_message(
     2. Validate that the message `content` is non-empty.
     3. Verify that the chat with the given `chat_id` exists.
     4. Ensure the sender is a participant of the chat.
-    5. Insert the message into the database.
-    6. Trigger a notification to inform recipients about the new message.
+    5. Insert the message, its notification outbox entry and its real-time
+       event (NOTIFY) in one transaction.
+    6. Wake up the outbox dispatcher, which notifies recipients asynchronously.
 
     Args:
         message_in (MessageTextIn): The input payload containing `chat_id` and `content`.
@@ -113,7 +143,6 @@ async def create_text_message(
             - 400: If the token payload is invalid or `content` is empty.
             - 403: If the sender is not a participant of the specified chat.
             - 404: If the specified chat does not exist.
-            - 500: If sending the notification fails unexpectedly.
     """
     sender_sub, chat = await get_validated_chat_and_user(db, message_in.chat_id, x_user_payload)
 
@@ -127,18 +156,12 @@ async def create_text_message(
     )
 
     db.add(message)
+    enqueue_message_notification(db, message)
+    # The flush assigns `id` and `sent_at`; the NOTIFY is sent by the same commit
+    await db.flush()
+    await publish_message_event(db, message, chat)
     await db.commit()
-    await db.refresh(message)
-
-    try:
-        await send_notification_for_message(
-            db=db,
-            sender_sub=sender_sub,
-            message_content=message_in.content,
-            has_media=False
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to send notification: {str(e)}")
+    dispatcher.notify()
 
     return message
 
@@ -184,7 +207,7 @@ async def create_media_message(
             - 400: Invalid input (e.g., no media, bad type) or failed upload.
             - 403: User is not a participant of the chat.
             - 404: Chat not found.
-            - 500: Notification or upload error.
+            - 500: Upload error.
     """
     sender_sub, chat = await get_validated_chat_and_user(db, chat_id, x_user_payload)
 
@@ -200,85 +223,282 @@ async def create_media_message(
     )
 
     db.add(message)
+    enqueue_message_notification(db, message)
+    # The flush assigns `id` and `sent_at`; the NOTIFY is sent by the same commit
+    await db.flush()
+    await publish_message_event(db, message, chat)
     await db.commit()
-    await db.refresh(message)
-
-    try:
-        await send_notification_for_message(
-            db=db,
-            sender_sub=sender_sub,
-            message_content=None,
-            has_media=True
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to send notification: {str(e)}")
+    dispatcher.notify()
 
     return message
 
 
+@router.get(
+    "/stream/",
+    summary="Stream new messages",
+    description=(
+        "Opens a Server-Sent Events stream delivering every new message in any chat of the "
+        "authenticated user (identified via the X-User-Payload header), as soon as it is stored. "
+        "Each `message` event carries a `MessageOut` JSON object; its event ID is a cursor that can be "
+        "passed as `after` to `GET /messages/{chat_id}/` to catch up after a reconnect."
+    ),
+    responses={
+        200: {"description": "Event stream (`text/event-stream`)"},
+        400: {"description": "Invalid token payload"},
+        422: {"description": "Missing X-User-Payload header"},
+    },
+    response_class=StreamingResponse
+)
+async def stream_messages(
+    request: Request,
+    x_user_payload: str = Header(..., alias="X-User-Payload")
+):
+    """
+    Stream new messages to the authenticated user over Server-Sent Events.
+
+    The subscription covers all chats of the user, including chats created
+    while the stream is open. New messages reach the stream through
+    PostgreSQL NOTIFY, so they are delivered regardless of which replica
+    stored them. A comment line is sent every `REALTIME_KEEPALIVE_INTERVAL`
+    seconds to keep idle connections open through proxies.
+
+    If the client falls behind by more than `REALTIME_QUEUE_SIZE` messages,
+    the stream is closed; the client should reconnect and fetch missed
+    messages with the `after` cursor.
+
+    Args:
+        request (Request): Incoming request, used to detect client disconnects.
+        x_user_payload (str): JSON string from the `X-User-Payload` header (must include `sub`).
+
+    Returns:
+        StreamingResponse: A `text/event-stream` response.
+
+    Raises:
+        HTTPException:
+            - 400: Invalid token payload.
+            - 422: Missing X-User-Payload header.
+    """
+    user_sub = get_user_sub(x_user_payload)
+    subscription = broker.subscribe(user_sub)
+
+    async def events():
+        try:
+            yield ": connected\n\n"
+            while not subscription.overflowed:
+                if await request.is_disconnected():
+                    break
+                try:
+                    message = await asyncio.wait_for(
+                        subscription.queue.get(),
+                        timeout=settings.REALTIME_KEEPALIVE_INTERVAL
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+
+                event_id = encode_cursor(message["sent_at"], message["id"])
+                yield f"id: {event_id}\nevent: message\ndata: {json.dumps(message)}\n\n"
+        finally:
+            broker.unsubscribe(user_sub, subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get(
     "/{chat_id}/",
     response_model=list[MessageOut],
     summary="Get messages from a chat",
     description=(
-        "Retrieves all messages from a given chat, ordered by time sent. "
+        "Retrieves a page of messages from a given chat, ordered by time sent. "
+        "Without a cursor the most recent `limit` messages are returned. Pass the value of the "
+        "`X-Next-Cursor` response header as `before` to page back through older messages, or use "
+        "`after` to fetch messages newer than a known cursor. "
         "Requires the authenticated user to be a participant of the chat (validated via X-User-Payload header)."
     ),
     responses={
-        200: {"description": "List of messages in the chat"},
-        400: {"description": "Invalid token payload"},
+        200: {"description": "Page of messages in the chat"},
+        400: {"description": "Invalid token payload or cursor"},
         403: {"description": "User is not a participant of the chat"},
         404: {"description": "Chat not found"},
-        422: {"description": "Missing X-User-Payload header"},
+        422: {"description": "Missing X-User-Payload header or invalid query parameters"},
     }
 )
 async def get_chat_messages(
     chat_id: int,
+    response: Response,
+    before: str | None = Query(None, description="Return messages older than this cursor"),
+    after: str | None = Query(None, description="Return messages newer than this cursor"),
+    limit: int = Query(MESSAGES_PAGE_DEFAULT, ge=1, le=MESSAGES_PAGE_MAX, description="Maximum number of messages"),
     x_user_payload: str = Header(..., alias="X-User-Payload"),
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Retrieve all messages from a specific chat for the authenticated user.
+    Retrieve a page of messages from a specific chat for the authenticated user.
 
-    Ensures that the requesting user is a participant of the chat before returning messages.
+    Pagination uses a keyset on `(sent_at, id)`, so every page costs the same
+    regardless of how long the chat history is. Messages in a page are always
+    ordered from oldest to newest. When more messages exist in the requested
+    direction, an opaque cursor is returned in the `X-Next-Cursor` header.
+    The request is read-only; chats are marked as read with
+    `POST /messages/{chat_id}/read/`.
 
     Args:
         chat_id (int): ID of the chat whose messages are to be retrieved.
+        response (Response): Outgoing response, used to set the `X-Next-Cursor` header.
+        before (str | None): Cursor; return messages older than it (paging back in history).
+        after (str | None): Cursor; return messages newer than it (catching up).
+        limit (int): Maximum number of messages in the page.
         x_user_payload (str): JSON string from the `X-User-Payload` header (must include `sub`).
         db (AsyncSession): SQLAlchemy async session.
 
     Returns:
-        list[MessageOut]: A list of all messages in the specified chat, ordered by timestamp.
+        list[MessageOut]: A page of messages in the specified chat, ordered by timestamp.
 
     Raises:
         HTTPException:
-            - 400: Invalid token payload.
+            - 400: Invalid token payload, invalid cursor, or both `before` and `after` given.
             - 403: User is not a participant of the chat.
             - 404: Chat not found.
             - 422: Missing X-User-Payload header.
     """
-    # Parse the token to extract the user's sub
-    try:
-        payload = json.loads(x_user_payload)
-        current_user_sub = payload.get("sub")
-    except (json.JSONDecodeError, AttributeError):
-        raise HTTPException(status_code=400, detail="Invalid X-User-Payload header")
+    if before and after:
+        raise HTTPException(status_code=400, detail="Use either 'before' or 'after', not both")
 
-    if not current_user_sub:
-        raise HTTPException(status_code=400, detail="Missing 'sub' in token payload")
+    await get_validated_chat_and_user(db, chat_id, x_user_payload)
 
-    # Check if the chat exists
-    result = await db.execute(select(Chat).where(Chat.id == chat_id))
-    chat = result.scalar_one_or_none()
-    if not chat:
-        raise HTTPException(status_code=404, detail="Chat not found")
+    sort_key = tuple_(Message.sent_at, Message.id)
+    stmt = select(Message).where(Message.chat_id == chat_id)
 
-    # Check if the user is a participant
-    if current_user_sub not in [chat.user1_sub, chat.user2_sub]:
-        raise HTTPException(status_code=403, detail="You are not a participant of this chat")
+    if after:
+        # Walk forward from the cursor, oldest first
+        stmt = stmt.where(sort_key > tuple_(*_decode_message_cursor(after)))
+        stmt = stmt.order_by(Message.sent_at, Message.id)
+    else:
+        # Walk backward from the cursor (or from the newest message), newest first
+        if before:
+            stmt = stmt.where(sort_key < tuple_(*_decode_message_cursor(before)))
+        stmt = stmt.order_by(Message.sent_at.desc(), Message.id.desc())
+
+    # Fetch one extra row to know whether another page exists
+    result = await db.execute(stmt.limit(limit + 1))
+    messages = list(result.scalars().all())
 
-    # Retrieve all messages, ordered by sent_at
-    result = await db.execute(
-        select(Message).where(Message.chat_id == chat_id).order_by(Message.sent_at)
+    has_more = len(messages) > limit
+    messages = messages[:limit]
+
+    if not after:
+        messages.reverse()
+
+    if has_more:
+        edge = messages[-1] if after else messages[0]
+        response.headers["X-Next-Cursor"] = encode_cursor(edge.sent_at.isoformat(), edge.id)
+
+    return messages
+
+
+@router.post(
+    "/{chat_id}/read/",
+    status_code=204,
+    summary="Mark a chat as read",
+    description=(
+        "Marks the chat as read by the authenticated user (identified via the X-User-Payload header) "
+        "up to the given message, which resets its unread count in `GET /chats/`. "
+        "The read marker only moves forward."
+    ),
+    responses={
+        204: {"description": "Chat marked as read"},
+        400: {"description": "Invalid token payload"},
+        403: {"description": "User is not a participant of the chat"},
+        404: {"description": "Chat or message not found"},
+        422: {"description": "Missing X-User-Payload header or invalid body"},
+    }
+)
+async def mark_chat_messages_read(
+    chat_id: int,
+    read_in: MarkReadIn,
+    x_user_payload: str = Header(..., alias="X-User-Payload"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Mark a chat as read up to a message for the authenticated user.
+
+    Kept separate from `GET /messages/{chat_id}/`, so reads (retries,
+    prefetches) stay free of side effects and do not lock the chat row.
+
+    Args:
+        chat_id (int): ID of the chat to mark as read.
+        read_in (MarkReadIn): ID of the newest message the user has seen.
+        x_user_payload (str): JSON string from the `X-User-Payload` header (must include `sub`).
+        db (AsyncSession): SQLAlchemy async session.
+
+    Raises:
+        HTTPException:
+            - 400: Invalid token payload.
+            - 403: User is not a participant of the chat.
+            - 404: Chat not found, or the message does not belong to it.
+            - 422: Missing X-User-Payload header or invalid body.
+    """
+    current_user_sub, chat = await get_validated_chat_and_user(db, chat_id, x_user_payload)
+
+    message_exists = await db.scalar(
+        select(Message.id).where(Message.chat_id == chat_id, Message.id == read_in.message_id)
+    )
+    if message_exists is None:
+        raise HTTPException(status_code=404, detail="Message not found")
+
+    await mark_chat_read(db, chat, current_user_sub, read_in.message_id)
+
+
+async def mark_chat_read(db: AsyncSession, chat: Chat, user_sub: str, message_id: int):
+    """
+    Advance the user's read marker in a chat to the given message.
+
+    The marker only moves forward, so marking an older message never
+    increases the unread count. When the loaded marker is already at or
+    past `message_id`, nothing is written.
+
+    Args:
+        db (AsyncSession): The database session.
+        chat (Chat): The chat whose read marker is updated.
+        user_sub (str): Cognito `sub` of the reading participant.
+        message_id (int): ID of the newest message the user has seen.
+    """
+    is_user1 = chat.user1_sub == user_sub
+    last_read_id = chat.user1_last_read_id if is_user1 else chat.user2_last_read_id
+    if last_read_id is not None and last_read_id >= message_id:
+        return
+
+    column = Chat.user1_last_read_id if is_user1 else Chat.user2_last_read_id
+    await db.execute(
+        update(Chat)
+        .where(
+            Chat.id == chat.id,
+            or_(column.is_(None), column < message_id)
+        )
+        .values({column: message_id})
     )
-    return result.scalars().all()
+    await db.commit()
+
+
+def _decode_message_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decode a message cursor into its `(sent_at, id)` sort key.
+
+    Args:
+        cursor (str): Opaque cursor received from the client.
+
+    Returns:
+        tuple[datetime, int]: The `sent_at` timestamp and message ID.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed.
+    """
+    sent_at, message_id = decode_cursor(cursor, size=2)
+    try:
+        return datetime.fromisoformat(sent_at), int(message_id)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -4,7 +4,7 @@
 Routes for user-related operations.
 
 This module provides endpoints to:
-- search users by name (first name or last name, case-insensitive),
+- search users by name (trigram-ranked, case-insensitive, paginated),
 - register a new user after authentication via Cognito.
 
 Endpoints:
@@ -14,13 +14,18 @@ Endpoints:
 
 from fastapi import APIRouter, status, Depends, Response, Query, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, exists
+from sqlalchemy import select, or_, and_, exists, func, literal_column
 from api.db.deps import get_db
 from api.models import User, Chat
 from api.schemas.user import UserSearchOut, UserRegisterOut
+from api.services.pagination import encode_cursor, decode_cursor
 from fastapi import Header
 import json
 
+# Page size limits for GET /users/search
+SEARCH_PAGE_DEFAULT = 20
+SEARCH_PAGE_MAX = 50
+
 # Create a router instance for user-related routes
 router = APIRouter()
 
@@ -114,18 +119,22 @@ async def register_user(
     response_model=list[UserSearchOut],
     summary="Search users by name (excluding self and existing chat partners)",
     description=(
-        "Returns users whose first name or last name contains the given query string "
-        "(case-insensitive). Excludes the current authenticated user and users "
-        "who already have a chat with them."
+        "Returns users whose full name contains or closely resembles the given query string "
+        "(case-insensitive), best matches first. Excludes the current authenticated user and users "
+        "who already have a chat with them. At most `limit` users are returned; pass the value of the "
+        "`X-Next-Cursor` response header as `cursor` to fetch the next page."
     ),
     responses={
         200: {"description": "List of matching users"},
-        400: {"description": "Invalid token payload"},
+        400: {"description": "Invalid token payload or cursor"},
         422: {"description": "Validation error (e.g., missing query param or header)"},
     }
 )
 async def search_users(
+    response: Response,
     query: str = Query(..., min_length=1),
+    limit: int = Query(SEARCH_PAGE_DEFAULT, ge=1, le=SEARCH_PAGE_MAX, description="Maximum number of users"),
+    cursor: str | None = Query(None, description="Return users ranked after this cursor"),
     x_user_payload: str = Header(..., alias="X-User-Payload"),
     db: AsyncSession = Depends(get_db)
 ):
@@ -133,21 +142,27 @@ async def search_users(
     Search for users by name, excluding the current user and existing chat partners.
 
     This endpoint allows the authenticated user to search for other users by their
-    first or last name. The search is case-insensitive and filters out:
+    full name ("first last"). A user matches when the name contains the query
+    (case-insensitive) or is similar to it according to `pg_trgm` word similarity,
+    so both filters are served by the trigram index on the full name. Results are
+    ranked by similarity and paginated with a `(rank, sub)` keyset. Filtered out are:
     - the current authenticated user,
-    - users with whom a chat already exists.
+    - users with whom a chat already exists (anti-join on the unique chat-pair index).
 
     Args:
+        response (Response): Outgoing response, used to set the `X-Next-Cursor` header.
         query (str): The search query string (minimum length of 1 character).
+        limit (int): Maximum number of users in the page.
+        cursor (str | None): Cursor from a previous page's `X-Next-Cursor` header.
         x_user_payload (str): A JSON string containing the JWT payload, provided by the API gateway
             via the X-User-Payload header. Must include the 'sub' field.
         db (AsyncSession): The asynchronous database session (injected).
 
     Returns:
-        list[UserSearchOut]: A list of users matching the search criteria.
+        list[UserSearchOut]: A page of users matching the search criteria.
 
     Raises:
-        HTTPException: 400 if the token payload is invalid or missing required fields.
+        HTTPException: 400 if the token payload or cursor is invalid.
         HTTPException: 422 if the X-User-Payload header is missing.
     """
     try:
@@ -159,24 +174,39 @@ async def search_users(
     if not current_user_sub:
         raise HTTPException(status_code=400, detail="Missing 'sub' in token payload")
 
+    # Must match the expression of the trigram index (see migration 0004)
+    full_name = User.first_name + literal_column("' '") + User.last_name
+    rank = func.word_similarity(query, full_name)
+
     # Build the ORM query:
-    # 1. Match users whose first or last name contains the search query (case-insensitive).
+    # 1. Match users whose full name contains or resembles the query.
     # 2. Exclude the current user from the results.
     # 3. Exclude users who are already in a chat with the current user.
     stmt = (
-        select(User)
+        select(User, rank.label("rank"))
         .where(
-            (User.first_name.ilike(f"%{query}%")) | (User.last_name.ilike(f"%{query}%")),
+            or_(full_name.icontains(query, autoescape=True), full_name.op("%>")(query)),
             User.sub != current_user_sub,
             ~exists().where(
-                or_(
-                    (Chat.user1_sub == current_user_sub) & (Chat.user2_sub == User.sub),
-                    (Chat.user2_sub == current_user_sub) & (Chat.user1_sub == User.sub),
-                )
+                func.least(Chat.user1_sub, Chat.user2_sub) == func.least(current_user_sub, User.sub),
+                func.greatest(Chat.user1_sub, Chat.user2_sub) == func.greatest(current_user_sub, User.sub),
             )
         )
+        .order_by(rank.desc(), User.sub)
     )
 
-    result = await db.execute(stmt)
-    users = result.scalars().all()
-    return users
\ No newline at end of file
+    if cursor:
+        last_rank, last_sub = decode_cursor(cursor, size=2)
+        if not isinstance(last_rank, (int, float)) or not isinstance(last_sub, str):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        stmt = stmt.where(or_(rank < last_rank, and_(rank == last_rank, User.sub > last_sub)))
+
+    # Fetch one extra row to know whether another page exists
+    result = await db.execute(stmt.limit(limit + 1))
+    rows = result.all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1].rank, rows[-1].User.sub)
+
+    return [row.User for row in rows]
@@ -1,5 +1,7 @@
 # api/schemas/chat.py
 
+from datetime import datetime
+from typing import Optional
 from pydantic import BaseModel, Field
 
 
@@ -20,12 +22,16 @@ class ChatParticipant(BaseModel):
 class ChatListItem(BaseModel):
     """Schema representing a single chat entry in the user's chat list.
 
-    Returned by the GET /chats endpoint, this model includes the chat ID
-    and the basic data of the other participant.
+    Returned by the GET /chats endpoint, this model includes the chat ID,
+    the basic data of the other participant, a preview of the last message
+    and the number of messages the current user has not read yet.
     """
 
     id: int = Field(..., description="Unique ID of the chat")
     participant: ChatParticipant = Field(..., description="Information about the other participant in the chat")
+    last_message_preview: Optional[str] = Field(None, description="Shortened text of the most recent message, if any")
+    last_message_at: Optional[datetime] = Field(None, description="Timestamp of the most recent message, if any")
+    unread_count: int = Field(0, description="Number of messages from the other participant not read yet")
 
     class Config:
         from_attributes = True
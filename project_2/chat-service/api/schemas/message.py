@@ -25,6 +25,10 @@ class MessageOut(BaseModel):
         from_attributes = True
 
 
+class MarkReadIn(BaseModel):
+    message_id: int = Field(..., description="ID of the newest message the user has seen")
+
+
 class MessageTextIn(BaseModel):
     chat_id: int = Field(..., description="ID of the chat where the message is sent")
     content: str = Field(..., min_length=1, description="Text content of the message (must be non-empty)")
@@ -0,0 +1,267 @@
+# api/services/outbox.py
+
+"""
+Transactional outbox for new-message notifications.
+
+Message endpoints do not call the notification-service themselves. Instead,
+`enqueue_message_notification` adds a `NotificationOutbox` row to the same
+session as the message, so both are committed atomically. The
+`OutboxDispatcher` background task then drains the outbox in batches:
+
+- pending rows are claimed with `SELECT ... FOR UPDATE SKIP LOCKED` in a
+  short transaction that leases them for `OUTBOX_CLAIM_LEASE` seconds, so
+  several replicas can dispatch concurrently without sending duplicates
+  and no transaction or row lock is held while notifications are sent,
+- the sender's name is resolved with a single join for the whole batch,
+- a batch is delivered concurrently over one shared HTTP client,
+- delivered rows are deleted; failed rows are retried later with
+  exponential backoff, up to `OUTBOX_MAX_ATTEMPTS` attempts,
+- rows that run out of attempts are logged and marked dead (`dead_at`);
+  they stay in the table for inspection and are pruned after
+  `OUTBOX_DEAD_RETENTION_DAYS`.
+
+Send-message latency therefore depends only on the database insert, and
+notifications are kept until the notification-service is reachable again.
+"""
+
+import asyncio
+from datetime import timedelta
+import httpx
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.core.config import settings
+from api.db.session import async_session
+from api.models.message import Message
+from api.models.outbox import NotificationOutbox
+from api.models.user import User
+from api.services.notification import build_notification_payload, send_notification
+
+
+def enqueue_message_notification(db: AsyncSession, message: Message) -> None:
+    """
+    Add a notification for a new message to the outbox.
+
+    The entry is only added to the session; it is written by the caller's
+    commit, in the same transaction as the message.
+
+    Args:
+        db (AsyncSession): The session the message was added to.
+        message (Message): The new (possibly not yet flushed) message.
+    """
+    db.add(NotificationOutbox(
+        message=message,
+        sender_sub=message.sender_sub,
+        content=message.content,
+        has_media=message.media_url is not None
+    ))
+
+
+class OutboxDispatcher:
+    """
+    Background task delivering outbox entries to the notification-service.
+
+    The dispatcher polls the outbox every `poll_interval` seconds and can be
+    woken up earlier with `notify()` right after a message is committed.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        poll_interval: float,
+        max_attempts: int,
+        backoff_base: float,
+        backoff_max: float,
+        claim_lease: float,
+        dead_retention: timedelta,
+        prune_interval: float
+    ):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.claim_lease = claim_lease
+        self.dead_retention = dead_retention
+        self.prune_interval = prune_interval
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._client: httpx.AsyncClient | None = None
+
+    def start(self):
+        """Start the dispatch loop on the running event loop."""
+        self._client = httpx.AsyncClient(timeout=5.0)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the dispatch loop and close the HTTP client."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    def notify(self):
+        """Wake the dispatcher up so a newly committed entry is sent without waiting for the next poll."""
+        self._wakeup.set()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        next_prune = loop.time()
+        while True:
+            if loop.time() >= next_prune:
+                next_prune = loop.time() + self.prune_interval
+                try:
+                    await self.prune_dead_entries()
+                except Exception as e:
+                    print(f"Notification outbox pruning failed: {str(e)}")
+
+            try:
+                claimed = await self.dispatch_batch()
+            except Exception as e:
+                print(f"Notification outbox dispatch failed: {str(e)}")
+                claimed = 0
+
+            # A full batch means more entries are probably waiting
+            if claimed >= self.batch_size:
+                continue
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def _backoff(self, attempts: int) -> timedelta:
+        return timedelta(seconds=min(self.backoff_base * 2 ** attempts, self.backoff_max))
+
+    async def dispatch_batch(self) -> int:
+        """
+        Claim and deliver one batch of due outbox entries.
+
+        The batch is claimed in a short transaction that moves `available_at`
+        forward by `claim_lease` seconds, so other dispatchers skip the rows
+        while they are being sent. Notifications are sent outside of any
+        transaction, and the outcomes are recorded in a second short
+        transaction. Entries of a dispatcher that dies mid-send become due
+        again when the lease expires.
+
+        Returns:
+            int: Number of entries claimed (delivered or rescheduled).
+        """
+        async with async_session() as db:
+            result = await db.execute(
+                select(NotificationOutbox, User.first_name, User.last_name)
+                .outerjoin(User, User.sub == NotificationOutbox.sender_sub)
+                .where(
+                    NotificationOutbox.available_at <= func.now(),
+                    NotificationOutbox.attempts < self.max_attempts,
+                    NotificationOutbox.dead_at.is_(None)
+                )
+                .order_by(NotificationOutbox.id)
+                .limit(self.batch_size)
+                .with_for_update(of=NotificationOutbox, skip_locked=True)
+            )
+            rows = result.all()
+            if not rows:
+                return 0
+
+            await db.execute(
+                update(NotificationOutbox)
+                .where(NotificationOutbox.id.in_([entry.id for entry, _, _ in rows]))
+                .values(available_at=func.now() + timedelta(seconds=self.claim_lease))
+            )
+            await db.commit()
+
+        payloads = [
+            build_notification_payload(
+                sender_name=f"{first_name} {last_name}" if first_name else f"Unknown ({entry.sender_sub})",
+                message_content=entry.content,
+                has_media=entry.has_media
+            )
+            for entry, first_name, last_name in rows
+        ]
+        outcomes = await asyncio.gather(
+            *(send_notification(self._client, payload) for payload in payloads),
+            return_exceptions=True
+        )
+
+        async with async_session() as db:
+            delivered = []
+            for (entry, _, _), outcome in zip(rows, outcomes):
+                if isinstance(outcome, Exception):
+                    error = str(outcome)[:1000] or type(outcome).__name__
+                    dead = entry.attempts + 1 >= self.max_attempts
+                    if dead:
+                        print(
+                            f"Notification for message {entry.message_id} dropped after "
+                            f"{entry.attempts + 1} attempts (outbox entry {entry.id}): {error}"
+                        )
+                    await db.execute(
+                        update(NotificationOutbox)
+                        .where(NotificationOutbox.id == entry.id)
+                        .values(
+                            attempts=NotificationOutbox.attempts + 1,
+                            last_error=error,
+                            available_at=func.now() + self._backoff(entry.attempts),
+                            dead_at=func.now() if dead else None
+                        )
+                    )
+                else:
+                    delivered.append(entry.id)
+
+            if delivered:
+                await db.execute(
+                    delete(NotificationOutbox).where(NotificationOutbox.id.in_(delivered))
+                )
+            await db.commit()
+        return len(rows)
+
+    async def prune_dead_entries(self):
+        """
+        Mark exhausted entries dead and delete dead entries past their retention.
+
+        Entries that reached `max_attempts` without being marked (e.g. after
+        the limit was lowered) are marked dead too. Remaining dead entries
+        are counted in the log, so lost notifications stay visible.
+        """
+        async with async_session() as db:
+            marked = await db.execute(
+                update(NotificationOutbox)
+                .where(
+                    NotificationOutbox.dead_at.is_(None),
+                    NotificationOutbox.attempts >= self.max_attempts
+                )
+                .values(dead_at=func.now())
+            )
+            pruned = await db.execute(
+                delete(NotificationOutbox)
+                .where(NotificationOutbox.dead_at < func.now() - self.dead_retention)
+            )
+            dead = await db.scalar(
+                select(func.count()).where(NotificationOutbox.dead_at.isnot(None))
+            )
+            await db.commit()
+
+        if marked.rowcount or pruned.rowcount or dead:
+            print(
+                f"Notification outbox: {dead} dead entries kept, "
+                f"{marked.rowcount} newly marked, {pruned.rowcount} pruned"
+            )
+
+
+# Shared dispatcher, started and stopped in the application lifespan
+dispatcher = OutboxDispatcher(
+    batch_size=settings.OUTBOX_BATCH_SIZE,
+    poll_interval=settings.OUTBOX_POLL_INTERVAL,
+    max_attempts=settings.OUTBOX_MAX_ATTEMPTS,
+    backoff_base=settings.OUTBOX_BACKOFF_BASE,
+    backoff_max=settings.OUTBOX_BACKOFF_MAX,
+    claim_lease=settings.OUTBOX_CLAIM_LEASE,
+    dead_retention=timedelta(days=settings.OUTBOX_DEAD_RETENTION_DAYS),
+    prune_interval=settings.OUTBOX_PRUNE_INTERVAL
+)
@@ -0,0 +1,57 @@
+# api/services/pagination.py
+
+"""
+Cursor helpers for keyset pagination.
+
+This module encodes and decodes the opaque cursors returned to clients by
+paginated endpoints. A cursor carries the sort key of the last row of a page
+(e.g. `(sent_at, id)` for messages), so the next page can be fetched with a
+`WHERE (sort_key) < (cursor)` condition instead of an OFFSET scan.
+
+The cursor is a URL-safe base64 string of a JSON array. Clients must treat it
+as opaque and only pass it back unchanged.
+"""
+
+import base64
+import json
+from fastapi import HTTPException
+
+
+def encode_cursor(*values) -> str:
+    """
+    Encode sort key values into an opaque, URL-safe cursor string.
+
+    Args:
+        *values: JSON-serializable values of the sort key, in key order.
+
+    Returns:
+        str: URL-safe base64 cursor without padding.
+    """
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """
+    Decode an opaque cursor back into its sort key values.
+
+    Args:
+        cursor (str): Cursor previously produced by `encode_cursor`.
+        size (int): Expected number of values in the sort key.
+
+    Returns:
+        list: The decoded sort key values.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed or has an unexpected shape.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return values
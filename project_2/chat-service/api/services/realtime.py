@@ -0,0 +1,210 @@
+# api/services/realtime.py
+
+"""
+Real-time delivery of new messages.
+
+New messages are fanned out to connected clients in two hops:
+
+1. The replica that stores the message publishes an event with PostgreSQL
+   `NOTIFY` on the `REALTIME_CHANNEL` channel (`publish_message_event`), in
+   the transaction inserting the message. PostgreSQL delivers it only when
+   that transaction commits, so no extra round trip or commit is needed and
+   events are never sent for messages that were not stored.
+2. Every replica keeps one dedicated connection that `LISTEN`s on that channel
+   (`RealtimeListener`) and hands received events to the in-process
+   `MessageBroker`, which pushes them to the subscribers of both chat
+   participants.
+
+Events carry the serialized message when it fits in a NOTIFY payload;
+otherwise only the message ID is sent and listeners load the message
+from the database.
+"""
+
+import asyncio
+import json
+import asyncpg
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.core.config import settings
+from api.db.session import async_session
+from api.models.chat import Chat
+from api.models.message import Message
+from api.schemas.message import MessageOut
+
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+MAX_NOTIFY_PAYLOAD = 7900
+
+
+class Subscription:
+    """
+    A single client's stream of message events.
+
+    Attributes:
+        queue (asyncio.Queue): Pending events for the client.
+        overflowed (bool): Set when the client fell too far behind and
+            must reconnect and catch up with `GET /messages/{chat_id}/?after=...`.
+    """
+
+    def __init__(self, max_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self.overflowed = False
+
+
+class MessageBroker:
+    """
+    In-process publish/subscribe of message events, keyed by user `sub`.
+
+    A subscription receives every new message of every chat its user
+    participates in, including chats created after subscribing.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set[Subscription]] = {}
+
+    def subscribe(self, user_sub: str) -> Subscription:
+        """Register a new subscription for the given user."""
+        subscription = Subscription(self.queue_size)
+        self._subscribers.setdefault(user_sub, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, user_sub: str, subscription: Subscription):
+        """Remove a subscription previously returned by `subscribe`."""
+        subscriptions = self._subscribers.get(user_sub)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscribers[user_sub]
+
+    def has_subscribers(self, user_subs: list[str]) -> bool:
+        """Return True if any of the given users has an open subscription on this replica."""
+        return any(sub in self._subscribers for sub in user_subs)
+
+    def publish(self, user_subs: list[str], message: dict):
+        """
+        Push a serialized message to all subscriptions of the given users.
+
+        Subscriptions whose queue is full are marked as overflowed instead of
+        blocking the publisher.
+        """
+        for sub in user_subs:
+            for subscription in self._subscribers.get(sub, ()):
+                try:
+                    subscription.queue.put_nowait(message)
+                except asyncio.QueueFull:
+                    subscription.overflowed = True
+
+
+async def publish_message_event(db: AsyncSession, message: Message, chat: Chat):
+    """
+    Publish a new message to all replicas via PostgreSQL NOTIFY.
+
+    Must be called in the transaction inserting the message, before its
+    commit; the event is delivered when the transaction commits.
+
+    Args:
+        db (AsyncSession): The database session used to store the message.
+        message (Message): The flushed message (with `id` and `sent_at`).
+        chat (Chat): The chat the message belongs to (provides the recipients).
+    """
+    recipients = [chat.user1_sub, chat.user2_sub]
+    payload = json.dumps({
+        "recipients": recipients,
+        "message": MessageOut.model_validate(message).model_dump(mode="json"),
+    })
+    if len(payload.encode()) > MAX_NOTIFY_PAYLOAD:
+        payload = json.dumps({"recipients": recipients, "message_id": message.id})
+
+    await db.execute(select(func.pg_notify(settings.REALTIME_CHANNEL, payload)))
+
+
+class RealtimeListener:
+    """
+    Background task that LISTENs for message events and feeds the broker.
+
+    Uses a dedicated asyncpg connection (outside the SQLAlchemy pool) and
+    reconnects automatically if the connection is lost.
+    """
+
+    def __init__(self, broker: MessageBroker, channel: str, reconnect_delay: float = 2.0):
+        self.broker = broker
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self._task: asyncio.Task | None = None
+        # Running message loads; referenced until done so they are not garbage-collected
+        self._pending: set[asyncio.Task] = set()
+
+    def start(self):
+        """Start listening on the running event loop."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop listening and close the connection."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in list(self._pending):
+            task.cancel()
+
+    async def _run(self):
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(
+                    host=settings.PSQL_HOST,
+                    port=int(settings.PSQL_PORT),
+                    user=settings.PSQL_USER,
+                    password=settings.PSQL_PASSWORD,
+                    database=settings.PSQL_NAME,
+                )
+                closed = asyncio.Event()
+                connection.add_termination_listener(lambda _conn: closed.set())
+                await connection.add_listener(self.channel, self._on_notify)
+                await closed.wait()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Realtime listener error: {str(e)}")
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(self.reconnect_delay)
+
+    def _on_notify(self, _connection, _pid, _channel, payload: str):
+        try:
+            event = json.loads(payload)
+            recipients = event["recipients"]
+        except (ValueError, KeyError, TypeError):
+            return
+
+        if not self.broker.has_subscribers(recipients):
+            return
+
+        if "message" in event:
+            self.broker.publish(recipients, event["message"])
+        else:
+            task = asyncio.create_task(self._load_and_publish(recipients, event["message_id"]))
+            self._pending.add(task)
+            task.add_done_callback(self._on_load_done)
+
+    def _on_load_done(self, task: asyncio.Task):
+        self._pending.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Realtime message load error: {str(task.exception())}")
+
+    async def _load_and_publish(self, recipients: list[str], message_id: int):
+        async with async_session() as db:
+            result = await db.execute(select(Message).where(Message.id == message_id))
+            message = result.scalar_one_or_none()
+        if message is not None:
+            self.broker.publish(recipients, MessageOut.model_validate(message).model_dump(mode="json"))
+
+
+# Shared broker and listener, started and stopped in the application lifespan
+broker = MessageBroker(queue_size=settings.REALTIME_QUEUE_SIZE)
+listener = RealtimeListener(broker, channel=settings.REALTIME_CHANNEL)
@@ -1,10 +1,13 @@
 import {
   Component,
   ElementRef,
+  EventEmitter,
   Input,
+  Output,
   ViewChild,
   AfterViewChecked,
-  OnChanges
+  OnChanges,
+  SimpleChanges
 } from '@angular/core';
 
 
@@ -19,6 +22,11 @@ export class ChatWindowComponent implements AfterViewChecked, OnChanges {
   @Input() userSub: string | null = null;
   @Input() messages: any[] = [];
   @Input() loadingMessages: boolean = false;
+  @Input() hasOlderMessages: boolean = false;
+  @Input() loadingOlderMessages: boolean = false;
+
+  // Emitted when the user asks for the page of messages before the oldest loaded one
+  @Output() loadOlder = new EventEmitter<void>();
 
   @ViewChild('messagesEnd') messagesEnd!: ElementRef;
 
@@ -31,8 +39,14 @@ export class ChatWindowComponent implements AfterViewChecked, OnChanges {
     }
   }
 
-  ngOnChanges(): void {
-    this.autoScrollEnabled = true;
+  ngOnChanges(changes: SimpleChanges): void {
+    // Scroll down for a new chat or new messages, but not when older messages are prepended
+    const messages = changes['messages'];
+    const previousLast = messages?.previousValue?.[messages.previousValue.length - 1];
+    const currentLast = messages?.currentValue?.[messages.currentValue.length - 1];
+    if (changes['selectedChat'] || changes['loadingMessages'] || (messages && previousLast?.id !== currentLast?.id)) {
+      this.autoScrollEnabled = true;
+    }
   }
 
   handleMediaLoadError(message: any): void {
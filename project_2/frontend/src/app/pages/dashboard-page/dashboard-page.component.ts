@@ -2,8 +2,7 @@ import { Component, OnDestroy, OnInit, ViewChild } from '@angular/core';
 import { AuthService } from '../../services/auth.service';
 import { MessageService } from '../../services/message.service';
 import { MediaLoaderService } from '../../services/media-loader.service';
-import { interval, Subscription } from 'rxjs';
-import { switchMap } from 'rxjs/operators';
+import { Subscription } from 'rxjs';
 
 type ViewMode = 'chats' | 'users';
 
@@ -19,7 +18,10 @@ export class DashboardPageComponent implements OnInit, OnDestroy {
   userSub: string | null = null;
   messages: any[] = [];
   loadingMessages: boolean = false;
-  messagePollingSub: Subscription | null = null;
+  olderCursor: string | null = null;
+  loadingOlderMessages: boolean = false;
+  lastReadId: number | null = null;
+  messageStreamSub: Subscription | null = null;
   activeView: ViewMode = 'chats';
 
   @ViewChild('chatWindow') chatWindowRef!: any;
@@ -32,47 +34,62 @@ export class DashboardPageComponent implements OnInit, OnDestroy {
 
   ngOnInit(): void {
     this.userSub = this.authService.getUserSub();
+
+    // New messages are pushed over the stream instead of being polled
+    this.messageStreamSub = this.messageService.streamMessages().subscribe(message =>
+      message === null ? this.onStreamConnected() : this.onStreamedMessage(message)
+    );
   }
 
   // Called when component is destroyed
   ngOnDestroy(): void {
-    this.stopPolling();
+    this.messageStreamSub?.unsubscribe();
+    this.messageStreamSub = null;
   }
 
   switchView(view: ViewMode): void {
     this.activeView = view;
     this.selectedChat = null;
     this.messages = [];
-    this.stopPolling();
+    this.olderCursor = null;
   }
 
   // Called when a chat is selected from the sidebar
   selectChat(chat: any): void {
     this.selectedChat = chat;
     this.messages = [];
+    this.olderCursor = null;
+    this.lastReadId = null;
     this.loadingMessages = true;
 
     this.loadMessagesOnce();
+  }
 
-    this.stopPolling();
-    this.messagePollingSub = interval(10000)
-      .pipe(switchMap(() => this.messageService.getMessages(chat.id)))
-      .subscribe(messages => this.updateMessages(messages));
+  // Messages sent while the stream was disconnected are fetched again after each (re)connect
+  onStreamConnected(): void {
+    if (this.selectedChat && !this.loadingMessages) {
+      this.loadMessagesOnce();
+    }
   }
 
-  stopPolling(): void {
-    this.messagePollingSub?.unsubscribe();
-    this.messagePollingSub = null;
+  async onStreamedMessage(message: any): Promise<void> {
+    if (message.chat_id !== this.selectedChat?.id) {
+      return;
+    }
+
+    const [prepared] = this.prepareMessages([message]);
+    if (prepared.media_url) {
+      await this.mediaLoader.preloadImage(prepared);
+    }
+    if (prepared.chat_id === this.selectedChat?.id) {
+      this.updateMessages([prepared]);
+    }
   }
 
 
   loadMessagesOnce(): void {
-    this.messageService.getMessages(this.selectedChat.id).subscribe(async (msgs) => {
-      const prepared = msgs.map(msg => ({
-        ...msg,
-        loadFailed: false,
-        loading: !!msg.media_url
-      }));
+    this.messageService.getMessages(this.selectedChat.id).subscribe(async (page) => {
+      const prepared = this.prepareMessages(page.messages);
 
       await Promise.allSettled(
         prepared.map(msg =>
@@ -80,19 +97,82 @@ export class DashboardPageComponent implements OnInit, OnDestroy {
         )
       );
 
-      this.messages = prepared;
+      // Keep older pages loaded meanwhile; the newest page replaces only what it covers
+      this.messages = this.mergeMessages(this.messages, prepared);
+      if (this.messages.length === prepared.length) {
+        this.olderCursor = page.nextCursor;
+      }
       this.loadingMessages = false;
       this.chatWindowRef?.scrollToBottom?.();
+      this.markRead();
+    });
+  }
+
+  // Advances the read marker of the open chat to its newest loaded message
+  private markRead(): void {
+    const chatId = this.selectedChat?.id;
+    const newestId = this.messages[this.messages.length - 1]?.id;
+    if (!chatId || !newestId || (this.lastReadId !== null && this.lastReadId >= newestId)) {
+      return;
+    }
+
+    this.lastReadId = newestId;
+    this.messageService.markChatRead(chatId, newestId).subscribe({
+      error: () => {
+        if (this.selectedChat?.id === chatId && this.lastReadId === newestId) {
+          this.lastReadId = null;
+        }
+      }
+    });
+  }
+
+  // Loads the page of messages preceding the oldest loaded one
+  loadOlderMessages(): void {
+    if (!this.selectedChat || !this.olderCursor || this.loadingOlderMessages) {
+      return;
+    }
+
+    const chatId = this.selectedChat.id;
+    this.loadingOlderMessages = true;
+    this.messageService.getMessages(chatId, this.olderCursor).subscribe({
+      next: (page) => {
+        if (this.selectedChat?.id !== chatId) {
+          return;
+        }
+        this.messages = this.mergeMessages(this.prepareMessages(page.messages), this.messages);
+        this.olderCursor = page.nextCursor;
+        this.loadingOlderMessages = false;
+      },
+      error: () => this.loadingOlderMessages = false
     });
   }
 
-  updateMessages(newMsgs: any[]): void {
-    this.messages = newMsgs.map(msg => ({
+  updateMessages(newest: any[]): void {
+    const lastId = this.messages[this.messages.length - 1]?.id;
+
+    this.messages = this.mergeMessages(this.messages, newest);
+    if (this.messages[this.messages.length - 1]?.id !== lastId) {
+      this.chatWindowRef?.scrollToBottom?.();
+      this.markRead();
+    }
+  }
+
+  private prepareMessages(msgs: any[]): any[] {
+    return msgs.map(msg => ({
       ...msg,
       loadFailed: false,
       loading: !!msg.media_url
     }));
-    this.chatWindowRef?.scrollToBottom?.();
+  }
+
+  // Merges two message lists by ID (entries of `newer` win), ordered by send time
+  private mergeMessages(older: any[], newer: any[]): any[] {
+    const byId = new Map<number, any>();
+    [...older, ...newer].forEach(msg => byId.set(msg.id, msg));
+
+    return [...byId.values()].sort((a, b) =>
+      a.sent_at === b.sent_at ? a.id - b.id : (a.sent_at < b.sent_at ? -1 : 1)
+    );
   }
 
   onMessageSent(): void {
@@ -1,17 +1,129 @@
-import { Injectable } from '@angular/core';
-import { HttpClient } from '@angular/common/http';
+import { Injectable, NgZone } from '@angular/core';
+import { HttpClient, HttpParams } from '@angular/common/http';
 import { Observable } from 'rxjs';
+import { map } from 'rxjs/operators';
+import { AuthService } from './auth.service';
+import { runtimeEnv } from '../../environments/runtime-env';
+
+// A page of chat messages (oldest first) and the cursor of the next older page, if any
+export interface MessagePage {
+  messages: any[];
+  nextCursor: string | null;
+}
+
+// Reconnect delay of the message stream; doubles after every failed attempt
+const STREAM_RETRY_DELAY_MS = 1000;
+const STREAM_RETRY_MAX_DELAY_MS = 30000;
 
 
 @Injectable({
   providedIn: 'root'
 })
 export class MessageService {
-  constructor(private http: HttpClient) {}
+  constructor(
+    private http: HttpClient,
+    private authService: AuthService,
+    private zone: NgZone
+  ) {}
+
+  // Retrieves the newest page of messages for a given chat, or the page older than `before`
+  getMessages(chatId: number, before?: string): Observable<MessagePage> {
+    let params = new HttpParams();
+    if (before) {
+      params = params.set('before', before);
+    }
+
+    return this.http
+      .get<any[]>(`/api/messages/${chatId}/`, { params, observe: 'response' })
+      .pipe(map(response => ({
+        messages: response.body ?? [],
+        nextCursor: response.headers.get('X-Next-Cursor')
+      })));
+  }
+
+  // Streams new messages of all the user's chats (Server-Sent Events), reconnecting when the
+  // stream ends. EventSource cannot send the Authorization header, so the stream is read with fetch.
+  // Emits `null` after every (re)connect, so callers can catch up on messages missed meanwhile.
+  streamMessages(): Observable<any | null> {
+    return new Observable<any | null>(subscriber => {
+      let controller: AbortController | null = null;
+      let retryTimer: ReturnType<typeof setTimeout> | null = null;
+      let retryDelay = STREAM_RETRY_DELAY_MS;
+      let stopped = false;
+
+      const emit = (value: any | null) => this.zone.run(() => subscriber.next(value));
+
+      const connect = async () => {
+        controller = new AbortController();
+        try {
+          const response = await fetch(`${runtimeEnv.apiUrl}/api/messages/stream/`, {
+            headers: {
+              Accept: 'text/event-stream',
+              Authorization: `Bearer ${this.authService.getIdToken()}`
+            },
+            signal: controller.signal
+          });
+          if (!response.ok || !response.body) {
+            throw new Error(`Message stream failed with status ${response.status}`);
+          }
+
+          retryDelay = STREAM_RETRY_DELAY_MS;
+          emit(null);
+
+          const reader = response.body.getReader();
+          const decoder = new TextDecoder();
+          let buffer = '';
+          while (true) {
+            const { value, done } = await reader.read();
+            if (done) {
+              break;
+            }
+            buffer += decoder.decode(value, { stream: true });
+
+            // Events are separated by a blank line; comment lines (keep-alives) start with ':'
+            let end: number;
+            while ((end = buffer.indexOf('\n\n')) >= 0) {
+              const lines = buffer.slice(0, end).split('\n');
+              buffer = buffer.slice(end + 2);
+
+              const data = lines
+                .filter(line => line.startsWith('data:'))
+                .map(line => line.slice(5).trimStart())
+                .join('\n');
+              if (lines.includes('event: message') && data) {
+                emit(JSON.parse(data));
+              }
+            }
+          }
+        } catch (error) {
+          if (stopped) {
+            return;
+          }
+          console.error('Message stream error:', error);
+        }
+
+        if (!stopped) {
+          retryTimer = setTimeout(connect, retryDelay);
+          retryDelay = Math.min(retryDelay * 2, STREAM_RETRY_MAX_DELAY_MS);
+        }
+      };
+
+      // The long-lived read loop runs outside Angular, so it does not keep triggering change detection
+      this.zone.runOutsideAngular(() => connect());
+
+      return () => {
+        stopped = true;
+        if (retryTimer) {
+          clearTimeout(retryTimer);
+        }
+        controller?.abort();
+      };
+    });
+  }
 
-  // Retrieves all messages for a given chat
-  getMessages(chatId: number): Observable<any[]> {
-    return this.http.get<any[]>(`/api/messages/${chatId}/`);
+  // Marks a chat as read up to the given message
+  markChatRead(chatId: number, messageId: number): Observable<void> {
+    return this.http.post<void>(`/api/messages/${chatId}/read/`, { message_id: messageId });
   }
 
   // Sends a text message to the specified chat
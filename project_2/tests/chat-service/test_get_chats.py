@@ -109,3 +109,27 @@ async def test_get_chats_user_with_multiple_chats():
         assert "participant" in chat
         assert "first_name" in chat["participant"]
         assert "last_name" in chat["participant"]
+
+
+@pytest.mark.asyncio
+async def test_get_chats_includes_last_message_and_unread_count():
+    """
+    Test that each chat carries a last-message preview, its timestamp and an unread count,
+    and that chats are sorted by most recent activity.
+    """
+    user_sub = "test-sub-multi"
+    headers = {"X-User-Payload": json.dumps({"sub": user_sub})}
+
+    async with httpx.AsyncClient(base_url=BASE_URL) as client:
+        response = await client.get("/chats", headers=headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    for chat in data:
+        assert "last_message_preview" in chat
+        assert "last_message_at" in chat
+        assert isinstance(chat["unread_count"], int)
+        assert chat["unread_count"] >= 0
+
+    timestamps = [chat["last_message_at"] for chat in data if chat["last_message_at"]]
+    assert timestamps == sorted(timestamps, reverse=True)
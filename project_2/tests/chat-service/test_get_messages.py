@@ -118,3 +118,60 @@ async def test_get_messages_invalid_json_in_header():
 
     assert response.status_code == 400
     assert response.json()["detail"] == "Invalid X-User-Payload header"
+
+
+@pytest.mark.asyncio
+async def test_get_messages_limit_and_cursor():
+    """
+    Test paging back through a chat history with `limit` and the `X-Next-Cursor` header.
+    Assumes chat_id=1 has at least two messages and test-sub-123 is a participant.
+    """
+    payload = {"sub": "test-sub-123"}
+    headers = {"X-User-Payload": json.dumps(payload)}
+
+    async with httpx.AsyncClient(base_url=BASE_URL) as client:
+        first = await client.get("/messages/1", params={"limit": 1}, headers=headers)
+        assert first.status_code == 200
+        assert len(first.json()) == 1
+
+        cursor = first.headers.get("X-Next-Cursor")
+        assert cursor
+
+        second = await client.get("/messages/1", params={"limit": 1, "before": cursor}, headers=headers)
+
+    assert second.status_code == 200
+    older = second.json()
+    assert len(older) == 1
+    assert older[0]["id"] != first.json()[0]["id"]
+    assert older[0]["sent_at"] <= first.json()[0]["sent_at"]
+
+
+@pytest.mark.asyncio
+async def test_get_messages_invalid_cursor():
+    """
+    Test retrieving messages with a malformed cursor.
+    Should return 400.
+    """
+    payload = {"sub": "test-sub-123"}
+    headers = {"X-User-Payload": json.dumps(payload)}
+
+    async with httpx.AsyncClient(base_url=BASE_URL) as client:
+        response = await client.get("/messages/1", params={"before": "not-a-cursor"}, headers=headers)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+@pytest.mark.asyncio
+async def test_get_messages_limit_out_of_range():
+    """
+    Test retrieving messages with a limit above the allowed maximum.
+    Should return 422.
+    """
+    payload = {"sub": "test-sub-123"}
+    headers = {"X-User-Payload": json.dumps(payload)}
+
+    async with httpx.AsyncClient(base_url=BASE_URL) as client:
+        response = await client.get("/messages/1", params={"limit": 10000}, headers=headers)
+
+    assert response.status_code == 422
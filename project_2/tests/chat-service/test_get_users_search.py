@@ -154,3 +154,55 @@ async def test_user_search_invalid_header():
     assert response.status_code == 400
     data = response.json()
     assert data["detail"] == "Invalid X-User-Payload header"
+
+
+@pytest.mark.asyncio
+async def test_user_search_limit_and_cursor():
+    """
+    Test that results are capped by `limit` and that the next page can be fetched
+    with the cursor from the `X-Next-Cursor` header without repeating users.
+    Registers two users with a unique last name, so the query has exactly two matches.
+    """
+    last_name = f"Pager{uuid4().hex[:12]}"
+
+    async with httpx.AsyncClient(base_url=BASE_URL) as client:
+        for first_name in ("Alice", "Bob"):
+            payload = {
+                "sub": f"test-sub-page-{uuid4()}",
+                "email": f"page-{uuid4()}@example.com",
+                "given_name": first_name,
+                "family_name": last_name
+            }
+            response = await client.post("/users/register", headers={"X-User-Payload": json.dumps(payload)})
+            assert response.status_code == 201
+
+        first = await client.get("/users/search", params={"query": last_name, "limit": 1}, headers=HEADERS)
+        assert first.status_code == 200
+        assert len(first.json()) == 1
+
+        cursor = first.headers.get("X-Next-Cursor")
+        assert cursor, "X-Next-Cursor must be set while more matches exist"
+
+        second = await client.get(
+            "/users/search", params={"query": last_name, "limit": 1, "cursor": cursor}, headers=HEADERS
+        )
+
+    assert second.status_code == 200
+    assert len(second.json()) == 1
+    assert second.json()[0]["sub"] != first.json()[0]["sub"]
+    assert "X-Next-Cursor" not in second.headers
+
+
+@pytest.mark.asyncio
+async def test_user_search_invalid_cursor():
+    """
+    Test search with a malformed cursor.
+    Should return 400.
+    """
+    async with httpx.AsyncClient(base_url=BASE_URL) as client:
+        response = await client.get(
+            "/users/search", params={"query": "Test", "cursor": "not-a-cursor"}, headers=HEADERS
+        )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,93 @@
+# tests/chat-service/test_post_messages_read.py
+
+import pytest
+import httpx
+import json
+
+BASE_URL = "http://localhost:8001"
+
+
+@pytest.mark.asyncio
+async def test_mark_chat_read_resets_unread_count():
+    """
+    Test marking a chat as read up to its newest message.
+    Should return 204 and report no unread messages in that chat afterwards.
+    Assumes chat_id=1 has messages and test-sub-123 is a participant.
+    """
+    headers = {"X-User-Payload": json.dumps({"sub": "test-sub-123"})}
+
+    async with httpx.AsyncClient(base_url=BASE_URL) as client:
+        messages = (await client.get("/messages/1", params={"limit": 1}, headers=headers)).json()
+        assert messages
+
+        response = await client.post("/messages/1/read/", json={"message_id": messages[-1]["id"]}, headers=headers)
+        assert response.status_code == 204
+
+        chats = (await client.get("/chats", headers=headers)).json()
+
+    chat = next(c for c in chats if c["id"] == 1)
+    assert chat["unread_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_get_messages_does_not_mark_chat_read():
+    """
+    Test that fetching messages has no side effect on the read marker:
+    the unread count of the chat is the same before and after the fetch.
+    Assumes chat_id=1 exists and test-sub-123 is a participant.
+    """
+    headers = {"X-User-Payload": json.dumps({"sub": "test-sub-123"})}
+
+    async with httpx.AsyncClient(base_url=BASE_URL) as client:
+        first = await client.get("/chats", headers=headers)
+        await client.get("/messages/1", headers=headers)
+        second = await client.get("/chats", headers=headers)
+
+    before = next(c for c in first.json() if c["id"] == 1)["unread_count"]
+    after = next(c for c in second.json() if c["id"] == 1)["unread_count"]
+    assert after == before
+
+
+@pytest.mark.asyncio
+async def test_mark_chat_read_message_from_other_chat():
+    """
+    Test marking a chat as read with a message ID that does not belong to it.
+    Should return 404.
+    """
+    headers = {"X-User-Payload": json.dumps({"sub": "test-sub-123"})}
+
+    async with httpx.AsyncClient(base_url=BASE_URL) as client:
+        response = await client.post("/messages/1/read/", json={"message_id": 999999}, headers=headers)
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Message not found"
+
+
+@pytest.mark.asyncio
+async def test_mark_chat_read_not_participant():
+    """
+    Test marking a chat as read by a user who is not a participant.
+    Should return 403.
+    Assumes chat_id=1 exists and test-sub-other is not a participant.
+    """
+    headers = {"X-User-Payload": json.dumps({"sub": "test-sub-other"})}
+
+    async with httpx.AsyncClient(base_url=BASE_URL) as client:
+        response = await client.post("/messages/1/read/", json={"message_id": 1}, headers=headers)
+
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_mark_chat_read_nonexistent_chat():
+    """
+    Test marking a chat that does not exist.
+    Should return 404.
+    """
+    headers = {"X-User-Payload": json.dumps({"sub": "test-sub-123"})}
+
+    async with httpx.AsyncClient(base_url=BASE_URL) as client:
+        response = await client.post("/messages/9999/read/", json={"message_id": 1}, headers=headers)
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Chat not found"
@@ -0,0 +1,64 @@
+# tests/chat-service/test_stream_messages.py
+
+import asyncio
+import pytest
+import httpx
+import json
+
+BASE_URL = "http://localhost:8001"
+
+
+async def read_next_message_event(response: httpx.Response) -> dict:
+    """Read SSE lines until a complete `message` event is received and return its data."""
+    event_type, data = None, None
+    async for line in response.aiter_lines():
+        if line.startswith("event: "):
+            event_type = line[len("event: "):]
+        elif line.startswith("data: "):
+            data = line[len("data: "):]
+        elif line == "" and event_type == "message" and data is not None:
+            return json.loads(data)
+
+
+@pytest.mark.asyncio
+async def test_stream_delivers_new_message():
+    """Test that a new message is pushed to the stream of a chat participant.
+
+    Opens a stream for a participant of chat 1, sends a text message
+    to that chat and reads one event from the stream.
+
+    Expected:
+        - 200 OK with `text/event-stream` content type
+        - The stream receives the sent message
+    """
+    content = "Realtime stream test message"
+    headers = {"X-User-Payload": json.dumps({"sub": "test-sub-123"})}  # must be participant of chat_id=1
+
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=10.0) as client:
+        async with client.stream("GET", "/messages/stream/", headers=headers) as stream:
+            assert stream.status_code == 200
+            assert stream.headers["content-type"].startswith("text/event-stream")
+
+            response = await client.post(
+                "/messages/text/",
+                json={"chat_id": 1, "content": content},
+                headers=headers
+            )
+            assert response.status_code == 200
+
+            event = await asyncio.wait_for(read_next_message_event(stream), timeout=5.0)
+            assert event["id"] == response.json()["id"]
+            assert event["content"] == content
+
+
+@pytest.mark.asyncio
+async def test_stream_missing_header_should_fail():
+    """Test opening a stream without X-User-Payload header.
+
+    Expected:
+        - 422 Unprocessable Entity (missing header)
+    """
+    async with httpx.AsyncClient(base_url=BASE_URL) as client:
+        response = await client.get("/messages/stream/")
+
+    assert response.status_code == 422
@@ -17,6 +17,18 @@ DYNAMODB = boto3.resource(
 )
 NOTIFICATIONS_TABLE = "Notifications"
 
+
+async def wait_for_notifications(text: str, timeout: float = 5.0) -> list:
+    """Poll DynamoDB until notifications containing `text` appear (delivery is asynchronous via the outbox)."""
+    table = DYNAMODB.Table(NOTIFICATIONS_TABLE)
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        items = table.scan().get("Items", [])
+        matching = [item for item in items if text in item["message"]]
+        if matching or asyncio.get_running_loop().time() >= deadline:
+            return matching
+        await asyncio.sleep(0.2)
+
 # Sample payload to mimic X-User-Payload (token payload)
 X_USER_PAYLOAD = json.dumps({
     "sub": "test-sub-123",
@@ -42,12 +54,7 @@ async def test_send_text_message_and_check_notification():
     message_data = response.json()
     assert message_data["content"] == payload["content"]
 
-    await asyncio.sleep(0.2)  # Allow time for DynamoDB write
-
-    table = DYNAMODB.Table(NOTIFICATIONS_TABLE)
-    scan = table.scan()
-    items = scan.get("Items", [])
-    matching = [item for item in items if payload["content"] in item["message"]]
+    matching = await wait_for_notifications(payload["content"])
     assert matching, "Notification not found in DynamoDB"
     notification = matching[0]
     assert "Contains media: No" in notification["message"]
@@ -67,13 +74,8 @@ async def test_send_long_text_message_notification():
         response = await client.post("/messages/text", json=payload, headers=headers)
 
     assert response.status_code == 200
-    await asyncio.sleep(0.2)
-
-    table = DYNAMODB.Table(NOTIFICATIONS_TABLE)
-    scan = table.scan()
-    items = scan.get("Items", [])
     snippet = long_text[:100]
-    matching = [item for item in items if snippet in item["message"]]
+    matching = await wait_for_notifications(snippet)
     assert matching, "Notification for long message not found"
 
 
@@ -91,12 +93,7 @@ async def test_send_unicode_text_message_notification():
         response = await client.post("/messages/text", json=payload, headers=headers)
 
     assert response.status_code == 200
-    await asyncio.sleep(0.2)
-
-    table = DYNAMODB.Table(NOTIFICATIONS_TABLE)
-    scan = table.scan()
-    items = scan.get("Items", [])
-    matching = [item for item in items if "Test message with emoji" in item["message"]]
+    matching = await wait_for_notifications("Test message with emoji")
     assert matching, "Notification for Unicode message not found"
     notification = matching[0]
     assert "🚀" in notification["message"]
@@ -3,8 +3,10 @@
 Retrieve all chats of the authenticated user.
 
 This AWS Lambda function returns a list of chat entries where the authenticated
-user is a participant. For each chat, it includes the chat ID and basic
-information about the other participant.
+user is a participant. For each chat, it includes the chat ID, basic
+information about the other participant, a preview of the last message
+and the unread count. The whole list is built with a single query and
+sorted by most recent activity.
 
 Triggered by:
     GET /api/chats
@@ -21,64 +23,91 @@ Required environment variables:
 """
 
 from http import HTTPStatus
-from sqlalchemy import select
+from sqlalchemy import select, case, func, or_, true
 
-from shared.auth import configure_cognito, get_current_user_sub
-from shared.db import sync_session
-from shared.models import Chat, User
+from shared.auth import configure_cognito
+from shared.middleware import lambda_handler, authenticate, db_session
+from shared.models import Chat, Message, User
 from shared.schemas.chat import ChatListItem, ChatParticipant
 from shared.utils import build_response
 
+# Maximum number of characters of the last message included in the chat list
+PREVIEW_LENGTH = 100
+
 # Initialize Cognito verifier on cold start
 configure_cognito()
 
 
-def handler(event, context):
+@lambda_handler("GET /api/chats", authenticate, db_session, error_key="error")
+def handler(request):
     """
     Lambda handler for retrieving all chats of the authenticated user.
 
     Args:
-        event (dict): API Gateway event with JWT token in headers.
-        context (LambdaContext): Lambda runtime context (unused).
+        request (Request): Invocation state with JWT claims and a database session.
 
     Returns:
         dict: API Gateway-compatible HTTP response containing chat list.
     """
-    try:
-        user_sub = get_current_user_sub(event)
-    except Exception as e:
-        return build_response(HTTPStatus.UNAUTHORIZED, {"error": str(e)})
-
-    try:
-        with sync_session() as session:
-            chats = session.execute(
-                select(Chat).where(
-                    (Chat.user1_sub == user_sub) | (Chat.user2_sub == user_sub)
-                )
-            ).scalars().all()
-
-            chat_items = []
-
-            for chat in chats:
-                other_sub = chat.user2_sub if chat.user1_sub == user_sub else chat.user1_sub
-
-                other_user = session.execute(
-                    select(User).where(User.sub == other_sub)
-                ).scalar_one_or_none()
-
-                if not other_user:
-                    continue
-
-                item = ChatListItem(
-                    id=chat.id,
-                    participant=ChatParticipant(
-                        first_name=other_user.first_name,
-                        last_name=other_user.last_name,
-                    ),
-                )
-                chat_items.append(item.model_dump())
-
-            return build_response(HTTPStatus.OK, chat_items)
-
-    except Exception as e:
-        return build_response(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"Internal error: {str(e)}"})
+    user_sub = request.user_sub
+
+    is_user1 = Chat.user1_sub == user_sub
+    other_sub = case((is_user1, Chat.user2_sub), else_=Chat.user1_sub)
+    last_read_id = case((is_user1, Chat.user1_last_read_id), else_=Chat.user2_last_read_id)
+
+    # Newest message per chat, evaluated once per chat row
+    last_message = (
+        select(
+            func.left(Message.content, PREVIEW_LENGTH).label("content"),
+            Message.media_url,
+            Message.sent_at,
+        )
+        .where(Message.chat_id == Chat.id)
+        .order_by(Message.sent_at.desc(), Message.id.desc())
+        .limit(1)
+        .lateral("last_message")
+    )
+    # Messages from the other participant newer than the user's read marker
+    unread_count = (
+        select(func.count(Message.id))
+        .where(
+            Message.chat_id == Chat.id,
+            Message.sender_sub != user_sub,
+            Message.id > func.coalesce(last_read_id, 0),
+        )
+        .scalar_subquery()
+    )
+
+    stmt = (
+        select(
+            Chat.id,
+            User.first_name,
+            User.last_name,
+            last_message.c.content,
+            last_message.c.media_url,
+            last_message.c.sent_at,
+            unread_count.label("unread_count"),
+        )
+        .join(User, User.sub == other_sub)
+        .outerjoin(last_message, true())
+        .where(or_(Chat.user1_sub == user_sub, Chat.user2_sub == user_sub))
+        .order_by(func.coalesce(last_message.c.sent_at, Chat.created_at).desc(), Chat.id.desc())
+    )
+
+    rows = request.db.execute(stmt).all()
+
+    chat_items = [
+        ChatListItem(
+            id=row.id,
+            participant=ChatParticipant(
+                first_name=row.first_name,
+                last_name=row.last_name,
+            ),
+            last_message_preview=row.content or ("[Media]" if row.media_url else None),
+            last_message_at=row.sent_at,
+            unread_count=row.unread_count,
+        )
+        for row in rows
+    ]
+
+    return build_response(HTTPStatus.OK, chat_items, event=request.event)
@@ -10,16 +10,17 @@ Triggered by:
     GET /api/health
 """
 
+from shared.middleware import lambda_handler
 from shared.utils import build_response
 
 
-def handler(event, context):
+@lambda_handler("GET /api/health")
+def handler(request):
     """
     Synchronous Lambda handler for public health check.
 
     Args:
-        event (dict): API Gateway event (unused).
-        context (LambdaContext): Lambda runtime metadata (unused).
+        request (Request): Invocation state (unused).
 
     Returns:
         dict: API Gateway-compatible HTTP response.
@@ -17,30 +17,26 @@ Required environment variables:
     - COGNITO_ISSUER_URL
 """
 
-from shared.auth import configure_cognito, get_current_user_sub
+from shared.auth import configure_cognito
+from shared.middleware import lambda_handler, authenticate
 from shared.utils import build_response
 
 # Initialize Cognito verifier on cold start
 configure_cognito()
 
-def handler(event, context):
+
+@lambda_handler("GET /api/health/secure", authenticate, error_key="error")
+def handler(request):
     """
     Synchronous Lambda entry point for secure health check.
 
     Args:
-        event (dict): API Gateway event with headers including JWT.
-        context (LambdaContext): Lambda runtime metadata (unused).
+        request (Request): Invocation state with verified JWT claims.
 
     Returns:
         dict: API Gateway-compatible HTTP response.
     """
-    try:
-        user_sub = get_current_user_sub(event)
-        return build_response(200, {
-            "status": "ok",
-            "authenticated_as": user_sub
-        })
-    except Exception as e:
-        return build_response(401, {
-            "error": f"Unauthorized: {str(e)}"
-        })
+    return build_response(200, {
+        "status": "ok",
+        "authenticated_as": request.user_sub
+    })
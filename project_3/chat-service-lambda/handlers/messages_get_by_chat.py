@@ -3,7 +3,8 @@
 Retrieve messages from a given chat if the user is a participant.
 
 This AWS Lambda function validates the user's JWT token and returns all messages
-from a specified chat ID, ordered by timestamp.
+from a specified chat ID, ordered by timestamp. It is read-only; chats are
+marked as read with POST /api/messages/{chat_id}/read.
 
 Triggered by:
     GET /api/messages/{chat_id}
@@ -23,8 +24,8 @@ from http import HTTPStatus
 from sqlalchemy import select
 from pydantic import TypeAdapter
 
-from shared.auth import configure_cognito, get_current_user_sub
-from shared.db import sync_session
+from shared.auth import configure_cognito
+from shared.middleware import lambda_handler, authenticate, db_session, HTTPError
 from shared.models import Chat, Message
 from shared.schemas.message import MessageOut
 from shared.utils import build_response
@@ -32,58 +33,44 @@ from shared.utils import build_response
 # Init Cognito verifier on cold start
 configure_cognito()
 
+# Built once per container instead of on every invocation
+MESSAGES_ADAPTER = TypeAdapter(list[MessageOut])
 
-def handler(event, context):
+
+@lambda_handler("GET /api/messages/{chat_id}", authenticate, db_session, error_key="error")
+def handler(request):
     """
     Lambda handler for retrieving messages from a chat.
 
-    This function validates JWT and returns all messages from a specified
-    chat if the user is a participant.
+    This function returns all messages from a specified chat if the
+    authenticated user is a participant.
 
     Args:
-        event (dict): API Gateway event including pathParameters and headers.
-        context (LambdaContext): AWS Lambda context (unused).
+        request (Request): Invocation state with pathParameters in the event,
+            JWT claims and a database session.
 
     Returns:
         dict: API Gateway-compatible HTTP response with message list or error.
     """
     try:
-        chat_id = int(event["pathParameters"]["chat_id"])
+        chat_id = int(request.event["pathParameters"]["chat_id"])
     except Exception:
-        return build_response(HTTPStatus.BAD_REQUEST, {"error": "Invalid or missing chat_id"})
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid or missing chat_id")
 
-    try:
-        user_sub = get_current_user_sub(event)
-    except Exception as e:
-        return build_response(HTTPStatus.UNAUTHORIZED, {"error": str(e)})
+    user_sub = request.user_sub
+    session = request.db
 
-    try:
-        with sync_session() as session:
-            chat = session.execute(select(Chat).where(Chat.id == chat_id)).scalar_one_or_none()
-
-            if not chat:
-                return build_response(HTTPStatus.NOT_FOUND, {"error": "Chat not found"})
-
-            if user_sub not in [chat.user1_sub, chat.user2_sub]:
-                return build_response(HTTPStatus.FORBIDDEN, {"error": "Access denied"})
-
-            db_messages = session.execute(
-                select(Message).where(Message.chat_id == chat_id).order_by(Message.sent_at)
-            ).scalars().all()
-
-            messages = [MessageOut.model_validate(m) for m in db_messages]
-            json_body = TypeAdapter(list[MessageOut]).dump_json(messages)
-
-            return {
-                "statusCode": HTTPStatus.OK,
-                "headers": {
-                    "Content-Type": "application/json",
-                    "Access-Control-Allow-Origin": "*",
-                    "Access-Control-Allow-Headers": "*",
-                    "Access-Control-Allow-Methods": "GET,POST,PUT,DELETE,OPTIONS,PATCH"
-                },
-                "body": json_body
-            }
-
-    except Exception as e:
-        return build_response(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+    chat = session.execute(select(Chat).where(Chat.id == chat_id)).scalar_one_or_none()
+
+    if not chat:
+        raise HTTPError(HTTPStatus.NOT_FOUND, "Chat not found")
+
+    if user_sub not in [chat.user1_sub, chat.user2_sub]:
+        raise HTTPError(HTTPStatus.FORBIDDEN, "Access denied")
+
+    db_messages = session.execute(
+        select(Message).where(Message.chat_id == chat_id).order_by(Message.sent_at, Message.id)
+    ).scalars().all()
+
+    messages = MESSAGES_ADAPTER.validate_python(db_messages, from_attributes=True)
+    return build_response(HTTPStatus.OK, messages, event=request.event)
@@ -6,6 +6,10 @@ This AWS Lambda function handles multipart/form-data containing a media file.
 It uploads the file to media-service, validates the chat and user, saves the
 message in the database, and publishes a notification event to SQS.
 
+Clients should prefer the two-phase flow (POST /api/messages/media/upload,
+then POST /api/messages/media/confirm), which uploads the file directly to S3
+instead of passing it through API Gateway and Lambda.
+
 Triggered by:
     POST /api/messages/media
 
@@ -27,8 +31,9 @@ from http import HTTPStatus
 from uuid import UUID
 from sqlalchemy import select
 
-from shared.auth import configure_cognito, get_current_user_sub
-from shared.db import sync_session
+from shared import metrics
+from shared.auth import configure_cognito, get_display_name
+from shared.middleware import lambda_handler, authenticate, db_session, HTTPError
 from shared.models.chat import Chat
 from shared.models.message import Message
 from shared.schemas.message import MessageOut
@@ -40,87 +45,70 @@ from shared.sqs import notify_about_message
 configure_cognito()
 
 
-def handler(event, context):
+@lambda_handler("POST /api/messages/media", authenticate, db_session)
+def handler(request):
     """Handle POST /api/messages/media request.
 
     This handler processes a multipart/form-data request with a media file.
-    It uploads the file, verifies the user and chat, stores the message in
-    the database, and publishes a notification event to SQS.
+    It uploads the file, verifies the chat, stores the message in the
+    database, and publishes a notification event to SQS.
 
     Args:
-        event (dict): API Gateway proxy event.
-        context (LambdaContext): AWS Lambda context object (unused).
+        request (Request): Invocation state with JWT claims and a database session.
 
     Returns:
         dict: API Gateway-compatible JSON response.
     """
-    try:
-        sender_sub = get_current_user_sub(event)
-
-        content_type = (
-            event["headers"].get("Content-Type")
-            or event["headers"].get("content-type")
-        )
-        if not content_type:
-            return build_response(
-                HTTPStatus.BAD_REQUEST,
-                {"detail": "Missing Content-Type header"},
-            )
-
+    event = request.event
+    sender_sub = request.user_sub
+    db = request.db
+
+    content_type = (
+        event["headers"].get("Content-Type")
+        or event["headers"].get("content-type")
+    )
+    if not content_type:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Missing Content-Type header")
+
+    with metrics.phase("parse"):
         try:
             file_field, fields = parse_multipart_file(event["body"], content_type)
             chat_id = int(fields.get("chat_id"))
         except Exception as exc:
-            return build_response(
-                HTTPStatus.BAD_REQUEST,
-                {"detail": f"Malformed multipart data: {str(exc)}"},
-            )
-
-        with sync_session() as db:
-            chat = db.execute(select(Chat).where(Chat.id == chat_id)).scalar_one_or_none()
-
-            if chat is None:
-                return build_response(
-                    HTTPStatus.NOT_FOUND,
-                    {"detail": "Chat not found"},
-                )
-
-            if sender_sub not in [chat.user1_sub, chat.user2_sub]:
-                return build_response(
-                    HTTPStatus.FORBIDDEN,
-                    {"detail": "You are not a participant of this chat"},
-                )
-
-            try:
-                metadata = upload_to_media_service(file_field)
-            except Exception as exc:
-                return build_response(
-                    HTTPStatus.BAD_REQUEST, {"detail": str(exc)}
-                )
-
-            message = Message(
-                chat_id=chat_id,
-                sender_sub=sender_sub,
-                content=None,
-                media_url=metadata["url"],
-                media_id=UUID(metadata["id"]),
-            )
-            db.add(message)
-            db.commit()
-            db.refresh(message)
-
-            notify_about_message(
-                db=db,
-                sender_sub=sender_sub,
-                message_text=None,
-                has_media=True,
-            )
-
-            message_out = MessageOut.model_validate(message).model_dump(mode="json")
-            return build_response(HTTPStatus.OK, message_out)
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"Malformed multipart data: {str(exc)}")
+
+    chat = db.execute(select(Chat).where(Chat.id == chat_id)).scalar_one_or_none()
 
+    if chat is None:
+        raise HTTPError(HTTPStatus.NOT_FOUND, "Chat not found")
+
+    if sender_sub not in [chat.user1_sub, chat.user2_sub]:
+        raise HTTPError(HTTPStatus.FORBIDDEN, "You are not a participant of this chat")
+
+    try:
+        with metrics.phase("media_upload"):
+            metadata = upload_to_media_service(file_field)
     except Exception as exc:
-        return build_response(
-            HTTPStatus.INTERNAL_SERVER_ERROR,
-            {"detail": str(exc)},
-        )
+        raise HTTPError(HTTPStatus.BAD_REQUEST, str(exc))
+
+    message = Message(
+        chat_id=chat_id,
+        sender_sub=sender_sub,
+        content=None,
+        media_url=metadata["url"],
+        media_id=UUID(metadata["id"]),
+    )
+    db.add(message)
+    db.commit()
+    db.refresh(message)
+
+    notify_about_message(
+        message_id=message.id,
+        chat_id=message.chat_id,
+        sent_at=message.sent_at,
+        sender_name=get_display_name(request.claims),
+        message_text=None,
+        has_media=True,
+    )
+
+    return build_response(HTTPStatus.OK, MessageOut.model_validate(message))
@@ -0,0 +1,124 @@
+# === handlers/messages_post_media_confirm.py ===
+"""
+Confirm a direct media upload and send it as a message.
+
+Second phase of sending a media message. This AWS Lambda function checks
+that the file reserved by POST /api/messages/media/upload was uploaded to S3
+by the same user for the same chat, then creates the media message (the
+participant check and the insert run as a single statement) and publishes
+a notification event to Amazon SQS.
+
+Confirming the same upload twice does not create a second message; the
+existing message is returned instead.
+
+Triggered by:
+    POST /api/messages/media/confirm
+
+Required environment variables:
+    - COGNITO_POOL_ID
+    - COGNITO_CLIENT_ID
+    - COGNITO_ISSUER_URL
+    - PSQL_USER
+    - PSQL_PASSWORD
+    - PSQL_HOST
+    - PSQL_PORT
+    - PSQL_NAME
+    - AWS_REGION
+    - AWS_ACCESS_KEY_ID
+    - AWS_SECRET_ACCESS_KEY
+    - AWS_SESSION_TOKEN
+    - AWS_S3_BUCKET_NAME
+    - AWS_SQS_NOTIFICATION_QUEUE_URL
+    - NOTIFICATION_RECEIVER_EMAIL
+
+Optional environment variables:
+    - AWS_DYNAMODB_MEDIA_TABLE_NAME
+"""
+
+from http import HTTPStatus
+
+from shared import metrics
+from shared.auth import configure_cognito, get_display_name
+from shared.messages import build_insert_message_statement, select_message_by_media_id
+from shared.middleware import lambda_handler, authenticate, parse_body_as, db_session, HTTPError
+from shared.schemas.message import MediaConfirmIn, MessageOut
+from shared.sqs import notify_about_message
+from shared.storage import (
+    build_media_key,
+    build_media_url,
+    get_uploaded_media,
+    save_media_metadata,
+)
+from shared.utils import build_response
+
+# Configure Cognito verifier on cold start
+configure_cognito()
+
+
+@lambda_handler("POST /api/messages/media/confirm", authenticate, parse_body_as(MediaConfirmIn), db_session)
+def handler(request):
+    """Handle POST /api/messages/media/confirm request.
+
+    This handler verifies that the reserved file was uploaded, saves the
+    media message and publishes a notification event to SQS.
+
+    Args:
+        request (Request): Invocation state with JWT claims, the validated
+            `MediaConfirmIn` body and a database session.
+
+    Returns:
+        dict: API Gateway-compatible JSON response.
+    """
+    sender_sub = request.user_sub
+    confirm_in = request.body
+
+    # The key is derived from the caller and chat, so only the uploader can confirm it
+    key = build_media_key(confirm_in.chat_id, sender_sub, confirm_in.media_id)
+    with metrics.phase("s3"):
+        uploaded = get_uploaded_media(key)
+    if uploaded is None:
+        raise HTTPError(HTTPStatus.NOT_FOUND, "Uploaded media not found")
+
+    media_url = build_media_url(key)
+
+    row = request.db.execute(
+        build_insert_message_statement(
+            confirm_in.chat_id,
+            sender_sub,
+            media_url=media_url,
+            media_id=confirm_in.media_id,
+        )
+    ).one_or_none()
+    request.db.commit()
+
+    if row is None:
+        raise HTTPError(HTTPStatus.NOT_FOUND, "Chat not found")
+
+    if not row.is_participant:
+        raise HTTPError(HTTPStatus.FORBIDDEN, "You are not a participant of this chat")
+
+    if row.id is None:
+        # Duplicate confirm (e.g. a client retry): finish with the existing message.
+        # Saving the metadata and notifying are idempotent, so a confirm that
+        # failed halfway is completed.
+        row = request.db.execute(select_message_by_media_id(confirm_in.media_id)).scalar_one()
+
+    with metrics.phase("dynamodb"):
+        save_media_metadata(
+            confirm_in.media_id,
+            uploaded["filename"],
+            key,
+            uploaded["content_type"],
+            media_url,
+        )
+
+    notify_about_message(
+        message_id=row.id,
+        chat_id=row.chat_id,
+        sent_at=row.sent_at,
+        sender_name=get_display_name(request.claims),
+        message_text=None,
+        has_media=True,
+    )
+
+    return build_response(HTTPStatus.OK, MessageOut.model_validate(row))
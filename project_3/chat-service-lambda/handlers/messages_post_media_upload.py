@@ -0,0 +1,93 @@
+# === handlers/messages_post_media_upload.py ===
+"""
+Request a direct upload target for a media message.
+
+First phase of sending a media message. This AWS Lambda function verifies
+that the authenticated user is a participant of the chat, reserves a media ID
+and returns a presigned S3 POST, so the client uploads the file straight to
+S3 instead of sending it through API Gateway and Lambda.
+
+After the upload the client calls POST /api/messages/media/confirm with the
+returned media ID to create the message.
+
+Triggered by:
+    POST /api/messages/media/upload
+
+Required environment variables:
+    - COGNITO_POOL_ID
+    - COGNITO_CLIENT_ID
+    - COGNITO_ISSUER_URL
+    - PSQL_USER
+    - PSQL_PASSWORD
+    - PSQL_HOST
+    - PSQL_PORT
+    - PSQL_NAME
+    - AWS_REGION
+    - AWS_ACCESS_KEY_ID
+    - AWS_SECRET_ACCESS_KEY
+    - AWS_SESSION_TOKEN
+    - AWS_S3_BUCKET_NAME
+"""
+
+from http import HTTPStatus
+from uuid import uuid4
+from sqlalchemy import select
+
+from shared.auth import configure_cognito
+from shared.middleware import lambda_handler, authenticate, parse_body_as, db_session, HTTPError
+from shared.models.chat import Chat
+from shared.schemas.message import MediaUploadIn, MediaUploadOut
+from shared.storage import (
+    MEDIA_UPLOAD_EXPIRES_IN,
+    MEDIA_UPLOAD_MAX_BYTES,
+    build_media_key,
+    create_media_upload,
+)
+from shared.utils import build_response
+
+# Configure Cognito verifier on cold start
+configure_cognito()
+
+
+@lambda_handler("POST /api/messages/media/upload", authenticate, parse_body_as(MediaUploadIn), db_session)
+def handler(request):
+    """Handle POST /api/messages/media/upload request.
+
+    This handler checks access to the chat and returns a presigned S3 POST
+    for a new media ID.
+
+    Args:
+        request (Request): Invocation state with JWT claims, the validated
+            `MediaUploadIn` body and a database session.
+
+    Returns:
+        dict: API Gateway-compatible JSON response.
+    """
+    sender_sub = request.user_sub
+    upload_in = request.body
+
+    chat = request.db.execute(
+        select(Chat.user1_sub, Chat.user2_sub).where(Chat.id == upload_in.chat_id)
+    ).one_or_none()
+
+    if chat is None:
+        raise HTTPError(HTTPStatus.NOT_FOUND, "Chat not found")
+
+    if sender_sub not in [chat.user1_sub, chat.user2_sub]:
+        raise HTTPError(HTTPStatus.FORBIDDEN, "You are not a participant of this chat")
+
+    media_id = uuid4()
+    presigned = create_media_upload(
+        build_media_key(upload_in.chat_id, sender_sub, media_id),
+        upload_in.filename,
+        upload_in.content_type,
+    )
+
+    upload_out = MediaUploadOut(
+        media_id=media_id,
+        url=presigned["url"],
+        fields=presigned["fields"],
+        max_bytes=MEDIA_UPLOAD_MAX_BYTES,
+        expires_in=MEDIA_UPLOAD_EXPIRES_IN,
+    )
+    return build_response(HTTPStatus.OK, upload_out)
@@ -0,0 +1,89 @@
+# === handlers/messages_post_read.py ===
+"""
+Mark a chat as read up to a given message.
+
+This AWS Lambda function advances the authenticated participant's read
+marker, which the chats_get Lambda uses to compute unread counts. Reading
+messages (GET /api/messages/{chat_id}) has no side effects; clients call
+this endpoint once the messages are shown. The marker only moves forward.
+
+Triggered by:
+    POST /api/messages/{chat_id}/read
+
+Required environment variables:
+    - COGNITO_POOL_ID
+    - COGNITO_CLIENT_ID
+    - COGNITO_ISSUER_URL
+    - PSQL_USER
+    - PSQL_PASSWORD
+    - PSQL_HOST
+    - PSQL_PORT
+    - PSQL_NAME
+"""
+
+from http import HTTPStatus
+from sqlalchemy import select, update, or_
+
+from shared.auth import configure_cognito
+from shared.middleware import lambda_handler, authenticate, parse_body_as, db_session, HTTPError
+from shared.models import Chat, Message
+from shared.schemas.message import MarkReadIn
+from shared.utils import build_response
+
+# Init Cognito verifier on cold start
+configure_cognito()
+
+
+@lambda_handler("POST /api/messages/{chat_id}/read", authenticate, parse_body_as(MarkReadIn), db_session)
+def handler(request):
+    """
+    Lambda handler for marking a chat as read.
+
+    Nothing is written when the user's marker is already at or past the
+    given message.
+
+    Args:
+        request (Request): Invocation state with pathParameters in the event,
+            JWT claims, the validated `MarkReadIn` body and a database session.
+
+    Returns:
+        dict: API Gateway-compatible HTTP response (204 on success).
+    """
+    try:
+        chat_id = int(request.event["pathParameters"]["chat_id"])
+    except Exception:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid or missing chat_id")
+
+    user_sub = request.user_sub
+    session = request.db
+    message_id = request.body.message_id
+
+    chat = session.execute(select(Chat).where(Chat.id == chat_id)).scalar_one_or_none()
+
+    if not chat:
+        raise HTTPError(HTTPStatus.NOT_FOUND, "Chat not found")
+
+    if user_sub not in [chat.user1_sub, chat.user2_sub]:
+        raise HTTPError(HTTPStatus.FORBIDDEN, "Access denied")
+
+    message_exists = session.execute(
+        select(Message.id).where(Message.chat_id == chat_id, Message.id == message_id)
+    ).scalar_one_or_none()
+    if message_exists is None:
+        raise HTTPError(HTTPStatus.NOT_FOUND, "Message not found")
+
+    is_user1 = chat.user1_sub == user_sub
+    last_read_id = chat.user1_last_read_id if is_user1 else chat.user2_last_read_id
+    if last_read_id is None or last_read_id < message_id:
+        last_read = Chat.user1_last_read_id if is_user1 else Chat.user2_last_read_id
+        session.execute(
+            update(Chat)
+            .where(
+                Chat.id == chat_id,
+                or_(last_read.is_(None), last_read < message_id)
+            )
+            .values({last_read: message_id})
+        )
+        session.commit()
+
+    return build_response(HTTPStatus.NO_CONTENT)
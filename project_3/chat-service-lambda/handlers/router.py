@@ -0,0 +1,133 @@
+# === handlers/router.py ===
+"""
+Single entry point for all chat-service endpoints.
+
+This AWS Lambda function dispatches API Gateway requests to the existing
+per-endpoint handlers (`handlers/chats_get.py`, `handlers/messages_post_text.py`,
+...). Deploying it behind every route lets all endpoints share warm
+containers, the Cognito signing keys and the database connection, instead of
+splitting warm capacity between one function per endpoint.
+
+Requests are dispatched on the HTTP API `routeKey` (e.g. `GET /api/chats`).
+For events without a matching route key (e.g. a `$default` route), the method
+and path are matched against the same route templates and `pathParameters`
+are filled in. Handler modules are imported on their first request, so a cold
+start only loads the code of the endpoint being called.
+
+The individual handlers are unchanged and can still be deployed and tested
+on their own.
+
+Triggered by:
+    Every route of the chat-service API.
+
+Required environment variables:
+    The union of the variables required by the individual handlers.
+"""
+
+import importlib
+import re
+from http import HTTPStatus
+
+from shared.utils import build_response
+
+# Route key -> handler module in the `handlers` package
+ROUTES = {
+    "GET /api/health": "health_check",
+    "GET /api/health/secure": "health_check_secure",
+    "POST /api/users/register": "users_post_register",
+    "GET /api/users/search": "users_get_search",
+    "GET /api/chats": "chats_get",
+    "POST /api/chats": "chats_post",
+    "GET /api/messages/{chat_id}": "messages_get_by_chat",
+    "POST /api/messages/{chat_id}/read": "messages_post_read",
+    "POST /api/messages/text": "messages_post_text",
+    "POST /api/messages/media": "messages_post_media",
+    "POST /api/messages/media/upload": "messages_post_media_upload",
+    "POST /api/messages/media/confirm": "messages_post_media_confirm",
+}
+
+
+def _compile_route(route_key: str) -> tuple[str, re.Pattern]:
+    method, template = route_key.split(" ", 1)
+    pattern = re.sub(r"\\{(\w+)\\}", r"(?P<\1>[^/]+)", re.escape(template.rstrip("/")))
+    return method, re.compile(f"^{pattern}/?$")
+
+
+# Path templates are only matched when the event has no known route key;
+# literal routes come first so e.g. /api/messages/text never matches {chat_id}
+_ROUTE_PATTERNS = sorted(
+    ((route_key, *_compile_route(route_key)) for route_key in ROUTES),
+    key=lambda route: "{" in route[0],
+)
+
+_loaded_handlers = {}
+
+
+def _get_handler(module_name: str):
+    """
+    Return the `handler` function of a handler module, importing it on first use.
+
+    Args:
+        module_name (str): Module name inside the `handlers` package.
+
+    Returns:
+        Callable: The module's Lambda handler.
+    """
+    handler_func = _loaded_handlers.get(module_name)
+    if handler_func is None:
+        module = importlib.import_module(f"handlers.{module_name}")
+        handler_func = _loaded_handlers[module_name] = module.handler
+    return handler_func
+
+
+def resolve_route(event: dict) -> str | None:
+    """
+    Find the route key of an API Gateway event.
+
+    Uses `routeKey` when it names a known route, otherwise matches the HTTP
+    method and path against the route templates and stores the extracted
+    path parameters in the event.
+
+    Args:
+        event (dict): API Gateway HTTP API (payload v2.0) or REST API proxy event.
+
+    Returns:
+        str | None: The matching route key, or None if no route matches.
+    """
+    route_key = event.get("routeKey")
+    if route_key in ROUTES:
+        return route_key
+
+    http = event.get("requestContext", {}).get("http", {})
+    method = http.get("method") or event.get("httpMethod")
+    path = event.get("rawPath") or http.get("path") or event.get("path") or ""
+    if method is None:
+        return None
+
+    for candidate, route_method, pattern in _ROUTE_PATTERNS:
+        match = pattern.match(path.rstrip("/") or "/")
+        if route_method == method.upper() and match:
+            if match.groupdict():
+                event["pathParameters"] = {**(event.get("pathParameters") or {}), **match.groupdict()}
+            return candidate
+
+    return None
+
+
+def handler(event, context):
+    """
+    Dispatch an API Gateway request to the handler of its route.
+
+    Args:
+        event (dict): API Gateway proxy event.
+        context (LambdaContext): AWS Lambda context, passed through to the handler.
+
+    Returns:
+        dict: API Gateway-compatible HTTP response from the route handler,
+        or 404 if no route matches.
+    """
+    route_key = resolve_route(event)
+    if route_key is None:
+        return build_response(HTTPStatus.NOT_FOUND, {"error": "Route not found"})
+
+    return _get_handler(ROUTES[route_key])(event, context)
@@ -3,7 +3,8 @@
 Search users by name, excluding the current user and existing chat partners.
 
 This AWS Lambda function enables the authenticated user to search for other users
-by first or last name (case-insensitive). The search excludes:
+by full name (case-insensitive, trigram-ranked). Results are paginated with a
+`limit` and an opaque `cursor` returned in the `X-Next-Cursor` header. The search excludes:
 - the current authenticated user,
 - users who already have an existing chat with them.
 
@@ -25,76 +26,100 @@ Required environment variables:
 """
 
 from http import HTTPStatus
-from sqlalchemy import select, or_, exists
+from sqlalchemy import select, or_, and_, exists, func, literal_column
 from pydantic import TypeAdapter
 
-from shared.auth import configure_cognito, get_current_user_sub
-from shared.db import sync_session
+from shared.auth import configure_cognito
+from shared.middleware import lambda_handler, authenticate, db_session, HTTPError
 from shared.models import User, Chat
+from shared.pagination import encode_cursor, decode_cursor
 from shared.schemas.user import UserSearchOut
 from shared.utils import build_response
 
+# Page size limits for GET /api/users/search
+SEARCH_PAGE_DEFAULT = 20
+SEARCH_PAGE_MAX = 50
+
 # Initialize Cognito verifier on cold start
 configure_cognito()
 
+# Built once per container instead of on every invocation
+USERS_ADAPTER = TypeAdapter(list[UserSearchOut])
+
 
-def handler(event, context):
+@lambda_handler("GET /api/users/search", authenticate, db_session, error_key="error")
+def handler(request):
     """
     Lambda handler to search users by query string.
 
     Steps:
     1. Validates JWT token from Authorization header.
-    2. Extracts `query` parameter from queryStringParameters.
-    3. Finds users matching the query (first_name or last_name), case-insensitive.
+    2. Extracts `query`, `limit` and `cursor` from queryStringParameters.
+    3. Finds users whose full name contains or resembles the query (pg_trgm),
+       ranked by word similarity.
     4. Excludes:
        - the current user,
-       - users already in a chat with them.
+       - users already in a chat with them (anti-join on the chat-pair index).
+    5. Returns at most `limit` users and, if more exist, an `X-Next-Cursor` header.
 
     Args:
-        event (dict): API Gateway event.
-        context (LambdaContext): Lambda context (unused).
+        request (Request): Invocation state with JWT claims and a database session.
 
     Returns:
         dict: API Gateway-compatible HTTP response.
     """
-    try:
-        user_sub = get_current_user_sub(event)
-    except Exception as e:
-        return build_response(HTTPStatus.UNAUTHORIZED, {"error": str(e)})
+    user_sub = request.user_sub
 
-    query_params = event.get("queryStringParameters") or {}
+    query_params = request.event.get("queryStringParameters") or {}
     query = query_params.get("query")
 
     if not query or len(query) < 1:
-        return build_response(HTTPStatus.BAD_REQUEST, {"error": "Missing or invalid 'query' parameter"})
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Missing or invalid 'query' parameter")
 
     try:
-        with sync_session() as db:
-            stmt = (
-                select(User)
-                .where(
-                    or_(
-                        User.first_name.ilike(f"%{query}%"),
-                        User.last_name.ilike(f"%{query}%")
-                    ),
-                    User.sub != user_sub,
-                    ~exists().where(
-                        or_(
-                            (Chat.user1_sub == user_sub) & (Chat.user2_sub == User.sub),
-                            (Chat.user2_sub == user_sub) & (Chat.user1_sub == User.sub)
-                        )
-                    )
-                )
+        limit = int(query_params.get("limit", SEARCH_PAGE_DEFAULT))
+        if not 1 <= limit <= SEARCH_PAGE_MAX:
+            raise ValueError
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"'limit' must be between 1 and {SEARCH_PAGE_MAX}")
+
+    # Must match the expression of the trigram index in fill_db.sql
+    full_name = User.first_name + literal_column("' '") + User.last_name
+    rank = func.word_similarity(query, full_name)
+
+    stmt = (
+        select(User, rank.label("rank"))
+        .where(
+            or_(
+                full_name.icontains(query, autoescape=True),
+                full_name.op("%>")(query)
+            ),
+            User.sub != user_sub,
+            ~exists().where(
+                func.least(Chat.user1_sub, Chat.user2_sub) == func.least(user_sub, User.sub),
+                func.greatest(Chat.user1_sub, Chat.user2_sub) == func.greatest(user_sub, User.sub)
             )
-            result = db.execute(stmt)
-            users = result.scalars().all()
-
-            json_body = TypeAdapter(list[UserSearchOut]).dump_json(users)
-            return {
-                "statusCode": HTTPStatus.OK,
-                "headers": {"Content-Type": "application/json"},
-                "body": json_body
-            }
-
-    except Exception as e:
-        return build_response(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+        )
+        .order_by(rank.desc(), User.sub)
+    )
+
+    cursor = query_params.get("cursor")
+    if cursor:
+        try:
+            last_rank, last_sub = decode_cursor(cursor, size=2)
+            if not isinstance(last_rank, (int, float)) or not isinstance(last_sub, str):
+                raise ValueError("Invalid cursor")
+        except ValueError as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, str(e))
+        stmt = stmt.where(or_(rank < last_rank, and_(rank == last_rank, User.sub > last_sub)))
+
+    # Fetch one extra row to know whether another page exists
+    rows = request.db.execute(stmt.limit(limit + 1)).all()
+
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        headers["X-Next-Cursor"] = encode_cursor(rows[-1].rank, rows[-1].User.sub)
+
+    users = USERS_ADAPTER.validate_python([row.User for row in rows], from_attributes=True)
+    return build_response(HTTPStatus.OK, users, event=request.event, headers=headers)
@@ -22,8 +22,8 @@ Required environment variables:
 from http import HTTPStatus
 from sqlalchemy import select
 
-from shared.auth import configure_cognito, get_token_payload
-from shared.db import sync_session
+from shared.auth import configure_cognito
+from shared.middleware import lambda_handler, authenticate, db_session, HTTPError
 from shared.models import User
 from shared.schemas.user import UserRegisterOut
 from shared.utils import build_response
@@ -34,54 +34,41 @@ REQUIRED_FIELDS = ["sub", "email", "given_name", "family_name"]
 configure_cognito()
 
 
-def handler(event, context):
+@lambda_handler("POST /api/users/register", authenticate, db_session)
+def handler(request):
     """
     Register a new user using data from a validated JWT.
 
     Args:
-        event (dict): API Gateway event with JWT in headers.
-        context (LambdaContext): Lambda runtime context (unused).
+        request (Request): Invocation state with JWT claims and a database session.
 
     Returns:
         dict: API Gateway-compatible HTTP response.
     """
-    try:
-        payload = get_token_payload(event)
-
-        missing = [f for f in REQUIRED_FIELDS if f not in payload]
-        if missing:
-            return build_response(
-                HTTPStatus.BAD_REQUEST,
-                {"detail": f"Missing required field(s): {', '.join(missing)}"}
-            )
-    except Exception as e:
-        return build_response(
-            HTTPStatus.UNAUTHORIZED,
-            {"detail": f"Unauthorized: {str(e)}"}
+    payload = request.claims
+    db = request.db
+
+    missing = [f for f in REQUIRED_FIELDS if f not in payload]
+    if missing:
+        raise HTTPError(
+            HTTPStatus.BAD_REQUEST,
+            f"Missing required field(s): {', '.join(missing)}"
         )
 
-    try:
-        with sync_session() as db:
-            user = db.execute(select(User).where(User.sub == payload["sub"])).scalar_one_or_none()
+    user = db.execute(select(User).where(User.sub == payload["sub"])).scalar_one_or_none()
 
-            if user:
-                return build_response(HTTPStatus.NO_CONTENT)
+    if user:
+        return build_response(HTTPStatus.NO_CONTENT)
 
-            db.add(User(
-                sub=payload["sub"],
-                email=payload["email"],
-                first_name=payload["given_name"],
-                last_name=payload["family_name"]
-            ))
-            db.commit()
+    db.add(User(
+        sub=payload["sub"],
+        email=payload["email"],
+        first_name=payload["given_name"],
+        last_name=payload["family_name"]
+    ))
+    db.commit()
 
-        return build_response(
-            HTTPStatus.CREATED,
-            UserRegisterOut(message="User created successfully").model_dump()
-        )
-
-    except Exception as e:
-        return build_response(
-            HTTPStatus.INTERNAL_SERVER_ERROR,
-            {"error": f"Internal error: {str(e)}"}
-        )
+    return build_response(
+        HTTPStatus.CREATED,
+        UserRegisterOut(message="User created successfully")
+    )
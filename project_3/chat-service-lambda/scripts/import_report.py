@@ -0,0 +1,165 @@
+# === scripts/import_report.py ===
+"""
+Import-time report and regression budget for Lambda handlers.
+
+Each handler module is imported in a fresh interpreter (as in a Lambda cold
+start) and the time spent importing it is measured. The median of several
+runs is compared with the per-handler budget stored in `import_budget.json`,
+and the heaviest top-level imports (from `python -X importtime`) are listed
+to show where the time goes.
+
+Placeholder values are provided for the environment variables read at import
+time, and an empty JWKS snapshot is used so no network request is made.
+
+Usage:
+    Report and check against the budget (exits with status 1 on regression):
+
+    $ python scripts/import_report.py
+
+    Re-measure and write a new budget (median plus 50% headroom, at least 10 ms):
+
+    $ python scripts/import_report.py --write-budget
+"""
+
+import argparse
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+LAMBDA_ROOT = Path(__file__).resolve().parent.parent
+HANDLERS_DIR = LAMBDA_ROOT / "handlers"
+BUDGET_FILE = Path(__file__).resolve().parent / "import_budget.json"
+
+# Budget = measured median * headroom, but never less than median + minimum slack
+BUDGET_HEADROOM = 1.5
+BUDGET_MIN_SLACK_MS = 10
+
+PLACEHOLDER_ENV = {
+    "PSQL_USER": "user",
+    "PSQL_PASSWORD": "password",
+    "PSQL_HOST": "localhost",
+    "PSQL_PORT": "5432",
+    "PSQL_NAME": "chat",
+    "COGNITO_POOL_ID": "pool",
+    "COGNITO_CLIENT_ID": "client",
+    "COGNITO_ISSUER_URL": "https://cognito-idp.localhost/pool",
+    "AWS_REGION": "us-east-1",
+    "AWS_ACCESS_KEY_ID": "placeholder",
+    "AWS_SECRET_ACCESS_KEY": "placeholder",
+    "AWS_SESSION_TOKEN": "placeholder",
+    "MEDIA_SERVICE_HOST": "localhost",
+    "NOTIFICATION_RECEIVER_EMAIL": "user@example.com",
+}
+
+_MEASURE = (
+    "import time, importlib; "
+    "start = time.perf_counter(); "
+    "importlib.import_module('handlers.{name}'); "
+    "print((time.perf_counter() - start) * 1000)"
+)
+
+
+def list_handlers() -> list[str]:
+    return sorted(p.stem for p in HANDLERS_DIR.glob("*.py") if p.stem != "__init__")
+
+
+def parse_importtime(stderr: str, top: int) -> list[tuple[str, float]]:
+    """
+    Return the heaviest top-level imports from `-X importtime` output.
+
+    Args:
+        stderr (str): Output of an interpreter run with `-X importtime`.
+        top (int): Number of entries to return.
+
+    Returns:
+        list[tuple[str, float]]: (module, cumulative milliseconds), heaviest first.
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line.split("|", 2)
+        # Nested imports are indented; keep only direct imports of the handler chain
+        if module.startswith("  ") or not cumulative.strip().isdigit():
+            continue
+        entries.append((module.strip(), int(cumulative) / 1000))
+    return sorted(entries, key=lambda entry: entry[1], reverse=True)[:top]
+
+
+def measure(name: str, env: dict, runs: int) -> tuple[float, list[tuple[str, float]]]:
+    """
+    Import a handler in fresh interpreters and measure the import time.
+
+    Args:
+        name (str): Handler module name (e.g. `chats_get`).
+        env (dict): Environment for the child interpreters.
+        runs (int): Number of measurements.
+
+    Returns:
+        tuple: Median import time in milliseconds and the heaviest imports of the last run.
+    """
+    timings, heaviest = [], []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", _MEASURE.format(name=name)],
+            cwd=LAMBDA_ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Importing handlers.{name} failed:\n{result.stderr[-2000:]}")
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+        heaviest = parse_importtime(result.stderr, top=3)
+    return statistics.median(timings), heaviest
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Measurements per handler")
+    parser.add_argument("--write-budget", action="store_true", help="Write a new budget from this run")
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as snapshot:
+        json.dump({"keys": []}, snapshot)
+
+    env = {**PLACEHOLDER_ENV, **os.environ, "COGNITO_JWKS_SNAPSHOT": snapshot.name}
+    budget = json.loads(BUDGET_FILE.read_text()) if BUDGET_FILE.exists() else {}
+
+    results = {}
+    failed = []
+    try:
+        print(f"{'handler':<22} {'import ms':>10} {'budget ms':>10}  heaviest imports")
+        for name in list_handlers():
+            elapsed, heaviest = measure(name, env, args.runs)
+            results[name] = elapsed
+            limit = budget.get(name)
+            if limit is not None and elapsed > limit:
+                failed.append(name)
+            heavy = ", ".join(f"{module} {ms:.0f}ms" for module, ms in heaviest)
+            print(f"{name:<22} {elapsed:>10.1f} {limit if limit is not None else '-':>10}  {heavy}")
+    finally:
+        os.unlink(snapshot.name)
+
+    if args.write_budget:
+        new_budget = {
+            name: math.ceil(max(elapsed * BUDGET_HEADROOM, elapsed + BUDGET_MIN_SLACK_MS))
+            for name, elapsed in results.items()
+        }
+        BUDGET_FILE.write_text(json.dumps(new_budget, indent=2) + "\n")
+        print(f"Budget written to {BUDGET_FILE}")
+        return 0
+
+    if failed:
+        print(f"Import-time budget exceeded: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,614 @@
+# === scripts/local_lambda.py ===
+"""
+Local API Gateway emulator and benchmark harness for the Lambda handlers.
+
+Runs the chat-service handlers in-process, without deploying to AWS:
+
+- HTTP requests are turned into API Gateway HTTP API (payload v2.0) proxy
+  events, like the ones the deployed routes receive.
+- Tokens are signed with a local RSA key whose JWKS is written to a snapshot
+  file (`COGNITO_JWKS_SNAPSHOT`), so `shared.auth` verifies them unchanged.
+- SQS is replaced by an in-memory client that records sent messages, and
+  media-service by a small local HTTP server.
+- The handlers talk to a real PostgreSQL database configured by the usual
+  `PSQL_*` variables (defaults below). Seed it with
+  `config/db-scripts/fill_db.sql`; the benchmark inserts messages, so use a
+  disposable database.
+
+Modes:
+    serve   Serve the API on a local port through `handlers/router.py`.
+            Requests without an Authorization header are signed as `--user`.
+
+    bench   Benchmark handlers. For each handler it reports the cold import
+            time (median of fresh interpreters, as in `import_report.py`),
+            the first invocation (includes opening the database connection)
+            and warm invocation latency percentiles.
+
+Usage:
+    $ python scripts/local_lambda.py serve --port 3000
+
+    $ python scripts/local_lambda.py bench chats_get users_get_search messages_post_media
+
+    Save results, and later fail (exit status 1) if a handler got slower:
+
+    $ python scripts/local_lambda.py bench --save bench.json
+    $ python scripts/local_lambda.py bench --baseline bench.json --tolerance 1.25
+"""
+
+import argparse
+import base64
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit, urlencode
+from uuid import uuid4
+
+from import_report import LAMBDA_ROOT, PLACEHOLDER_ENV, measure
+
+sys.path.insert(0, str(LAMBDA_ROOT))
+
+LOCAL_ISSUER = "https://cognito-idp.localhost/local-pool"
+LOCAL_CLIENT_ID = "local-client"
+LOCAL_KEY_ID = "local-key"
+
+# Local PostgreSQL used unless PSQL_* variables are already set
+LOCAL_DB_ENV = {
+    "PSQL_USER": "postgres",
+    "PSQL_PASSWORD": "postgres",
+    "PSQL_HOST": "localhost",
+    "PSQL_PORT": "5432",
+    "PSQL_NAME": "postgres",
+}
+
+DEFAULT_USER = "user-sub-0"  # First user in fill_db.sql
+
+# Content types API Gateway passes as text; other bodies arrive base64-encoded
+TEXT_CONTENT_TYPES = ("text/", "application/json", "application/xml", "application/javascript")
+
+# 1x1 transparent PNG used as the media file in benchmarks
+SAMPLE_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+
+
+def _b64url_uint(value: int) -> str:
+    data = value.to_bytes((value.bit_length() + 7) // 8, "big")
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+class LocalCognito:
+    """
+    Signs ID tokens with a local RSA key and publishes its JWKS snapshot.
+    """
+
+    def __init__(self):
+        import rsa
+
+        public_key, private_key = rsa.newkeys(2048)
+        self._private_pem = private_key.save_pkcs1().decode()
+        self.jwks = {
+            "keys": [{
+                "kty": "RSA",
+                "alg": "RS256",
+                "use": "sig",
+                "kid": LOCAL_KEY_ID,
+                "n": _b64url_uint(public_key.n),
+                "e": _b64url_uint(public_key.e),
+            }]
+        }
+
+    def write_snapshot(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.jwks, f)
+
+    def issue_token(self, sub: str, given_name: str = "Local", family_name: str = "User", ttl: int = 3600) -> str:
+        """
+        Return a signed ID token for a user, accepted by `shared.auth`.
+
+        Args:
+            sub (str): Cognito `sub` of the user (must exist in the database).
+            given_name (str): First name claim.
+            family_name (str): Last name claim.
+            ttl (int): Token lifetime in seconds.
+
+        Returns:
+            str: The encoded JWT.
+        """
+        from jose import jwt
+
+        now = int(time.time())
+        claims = {
+            "sub": sub,
+            "aud": LOCAL_CLIENT_ID,
+            "iss": LOCAL_ISSUER,
+            "token_use": "id",
+            "given_name": given_name,
+            "family_name": family_name,
+            "email": f"{sub}@example.com",
+            "iat": now,
+            "exp": now + ttl,
+        }
+        return jwt.encode(claims, self._private_pem, algorithm="RS256", headers={"kid": LOCAL_KEY_ID})
+
+
+class RecordingSQSClient:
+    """
+    Stand-in for the boto3 SQS client that keeps sent messages in memory.
+    """
+
+    def __init__(self):
+        self.messages = []
+
+    def send_message(self, **kwargs) -> dict:
+        self.messages.append(kwargs)
+        return {"MessageId": str(uuid4())}
+
+
+class _MediaUploadHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path.rstrip("/") != "/media/upload":
+            self.send_error(404)
+            return
+
+        media_id = str(uuid4())
+        body = json.dumps({
+            "id": media_id,
+            "filename": "upload",
+            "url": f"http://{self.server.host}/media/{media_id}",
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MediaServiceStub:
+    """
+    Stand-in for media-service: accepts POST /media/upload and returns fake metadata.
+    """
+
+    def __init__(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _MediaUploadHandler)
+        self._server.host = f"127.0.0.1:{self._server.server_port}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    @property
+    def host(self) -> str:
+        return self._server.host
+
+    def close(self):
+        self._server.shutdown()
+
+
+class LambdaContext:
+    """
+    Minimal stand-in for the AWS Lambda context object.
+    """
+
+    function_name = "chat_service_local"
+    memory_limit_in_mb = 128
+
+    def __init__(self, timeout: float = 5):
+        self.aws_request_id = str(uuid4())
+        self._deadline = time.monotonic() + timeout
+
+    def get_remaining_time_in_millis(self) -> int:
+        return max(0, int((self._deadline - time.monotonic()) * 1000))
+
+
+def build_event(
+    method: str,
+    path: str,
+    query: dict | str | None = None,
+    headers: dict | None = None,
+    body: bytes | str | None = None,
+    claims: dict | None = None,
+) -> dict:
+    """
+    Build an API Gateway HTTP API (payload v2.0) proxy event.
+
+    Header names are lower-cased and repeated query parameters are joined with
+    commas, as API Gateway does. Non-text bodies (e.g. multipart uploads) are
+    base64-encoded. The route key is `$default`; `handlers/router.py` resolves
+    the route and path parameters from the path.
+
+    Args:
+        method (str): HTTP method.
+        path (str): Request path (without query string).
+        query (dict | str | None): Query parameters or a raw query string.
+        headers (dict | None): Request headers.
+        body (bytes | str | None): Raw request body.
+        claims (dict | None): Verified JWT claims, as set by the API Gateway authorizer.
+
+    Returns:
+        dict: The proxy event.
+    """
+    raw_query = query if isinstance(query, str) else urlencode(query or {})
+    query_params = {}
+    for name, value in parse_qsl(raw_query, keep_blank_values=True):
+        query_params[name] = f"{query_params[name]},{value}" if name in query_params else value
+
+    headers = {name.lower(): value for name, value in (headers or {}).items()}
+    if isinstance(body, str):
+        body = body.encode()
+
+    is_base64 = False
+    if body:
+        content_type = headers.get("content-type", "")
+        if content_type.startswith(TEXT_CONTENT_TYPES):
+            body = body.decode()
+        else:
+            body, is_base64 = base64.b64encode(body).decode(), True
+
+    now = datetime.now(timezone.utc)
+    request_context = {
+        "accountId": "local",
+        "apiId": "local",
+        "domainName": "localhost",
+        "http": {
+            "method": method.upper(),
+            "path": path,
+            "protocol": "HTTP/1.1",
+            "sourceIp": "127.0.0.1",
+            "userAgent": headers.get("user-agent", "local-lambda"),
+        },
+        "requestId": str(uuid4()),
+        "routeKey": "$default",
+        "stage": "$default",
+        "time": now.strftime("%d/%b/%Y:%H:%M:%S +0000"),
+        "timeEpoch": int(now.timestamp() * 1000),
+    }
+    if claims:
+        request_context["authorizer"] = {
+            "jwt": {"claims": {name: str(value) for name, value in claims.items()}, "scopes": None}
+        }
+
+    event = {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": path,
+        "rawQueryString": raw_query,
+        "headers": headers,
+        "requestContext": request_context,
+        "isBase64Encoded": is_base64,
+    }
+    if query_params:
+        event["queryStringParameters"] = query_params
+    if body:
+        event["body"] = body
+    return event
+
+
+def build_multipart(fields: dict, file_name: str, file_data: bytes, file_type: str) -> tuple[bytes, str]:
+    """
+    Encode form fields and one file as multipart/form-data.
+
+    Returns:
+        tuple: The body and its Content-Type header value.
+    """
+    boundary = uuid4().hex
+    parts = [
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        for name, value in fields.items()
+    ]
+    parts.append(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="media_file"; filename="{file_name}"\r\n'
+        f"Content-Type: {file_type}\r\n\r\n".encode() + file_data + b"\r\n"
+    )
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+class LocalLambda:
+    """
+    In-process environment for the handlers: local Cognito, SQS and media-service stand-ins.
+
+    Environment variables are set before any handler module is imported, so
+    this must be created before importing from `handlers` or `shared`.
+    """
+
+    def __init__(self, user: str = DEFAULT_USER, emit_metrics: bool = True):
+        self.user = user
+        self.cognito = LocalCognito()
+        self.media_service = MediaServiceStub()
+        self.sqs = RecordingSQSClient()
+
+        self._snapshot = tempfile.NamedTemporaryFile("w", suffix=".json", delete=False)
+        self._snapshot.close()
+        self.cognito.write_snapshot(self._snapshot.name)
+
+        for name, value in {**PLACEHOLDER_ENV, **LOCAL_DB_ENV}.items():
+            os.environ.setdefault(name, value)
+        os.environ.update({
+            "COGNITO_POOL_ID": "local-pool",
+            "COGNITO_CLIENT_ID": LOCAL_CLIENT_ID,
+            "COGNITO_ISSUER_URL": LOCAL_ISSUER,
+            "COGNITO_JWKS_SNAPSHOT": self._snapshot.name,
+            "MEDIA_SERVICE_HOST": self.media_service.host,
+            "AWS_SQS_NOTIFICATION_QUEUE_URL": "local://notifications",
+        })
+        if not emit_metrics:
+            os.environ.setdefault("METRICS_ENABLED", "false")
+
+        import shared.sqs
+        shared.sqs._sqs_client = self.sqs
+
+        self.token = self.cognito.issue_token(user)
+        from jose import jwt
+        self.claims = jwt.get_unverified_claims(self.token)
+
+    @property
+    def env(self) -> dict:
+        return dict(os.environ)
+
+    def request(self, method: str, path: str, query=None, headers=None, body=None, authorized: bool = True) -> dict:
+        """
+        Build the event for a request, signed as the current user.
+        """
+        headers = dict(headers or {})
+        claims = None
+        if authorized and not any(name.lower() == "authorization" for name in headers):
+            headers["Authorization"] = f"Bearer {self.token}"
+            claims = self.claims
+        return build_event(method, path, query=query, headers=headers, body=body, claims=claims)
+
+    def invoke(self, event: dict) -> dict:
+        """Dispatch an event through `handlers/router.py`."""
+        from handlers.router import handler
+
+        return handler(event, LambdaContext())
+
+    def close(self):
+        self.media_service.close()
+        os.unlink(self._snapshot.name)
+
+
+def decode_body(response: dict) -> bytes:
+    """Return the raw body bytes of a handler response, decompressed if needed."""
+    body = response.get("body") or ""
+    data = base64.b64decode(body) if response.get("isBase64Encoded") else body.encode()
+
+    encoding = (response.get("headers") or {}).get("Content-Encoding")
+    if encoding == "gzip":
+        import gzip
+        data = gzip.decompress(data)
+    elif encoding == "br":
+        import brotli
+        data = brotli.decompress(data)
+    return data
+
+
+# === serve ===
+
+def serve(local: LocalLambda, port: int):
+    """
+    Serve the API on localhost, one request at a time (like a single Lambda container).
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def _handle(self):
+            url = urlsplit(self.path)
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+            if self.command == "OPTIONS":
+                # CORS preflight is answered by API Gateway itself
+                self.send_response(204)
+                self.send_header("Access-Control-Allow-Origin", "*")
+                self.send_header("Access-Control-Allow-Headers", "*")
+                self.send_header("Access-Control-Allow-Methods", "GET,POST,OPTIONS")
+                self.end_headers()
+                return
+
+            event = local.request(self.command, url.path, query=url.query, headers=dict(self.headers), body=body)
+            start = time.perf_counter()
+            response = local.invoke(event)
+            elapsed = (time.perf_counter() - start) * 1000
+
+            body = response.get("body") or ""
+            data = base64.b64decode(body) if response.get("isBase64Encoded") else body.encode()
+            self.send_response(int(response["statusCode"]))
+            for name, value in (response.get("headers") or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            print(f"{self.command} {self.path} -> {int(response['statusCode'])} ({elapsed:.1f} ms)")
+
+        do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = _handle
+
+        def log_message(self, format, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", port), Handler)
+    print(f"Serving chat-service Lambdas on http://127.0.0.1:{port} as {local.user} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+# === bench ===
+
+def build_scenarios(local: LocalLambda, search_query: str) -> dict:
+    """
+    Return the benchmark request of each handler, keyed by handler module name.
+
+    The ID of the user's first chat is looked up through GET /api/chats; handlers
+    that need a chat are left out if the user has none.
+    """
+    chats_response = local.invoke(local.request("GET", "/api/chats"))
+    if int(chats_response["statusCode"]) != 200:
+        raise RuntimeError(f"GET /api/chats failed: {decode_body(chats_response).decode()}")
+    chats = json.loads(decode_body(chats_response))
+
+    scenarios = {
+        "health_check": lambda: local.request("GET", "/api/health", authorized=False),
+        "health_check_secure": lambda: local.request("GET", "/api/health/secure"),
+        "chats_get": lambda: local.request("GET", "/api/chats", headers={"Accept-Encoding": "gzip, br"}),
+        "users_get_search": lambda: local.request(
+            "GET", "/api/users/search", query={"query": search_query}, headers={"Accept-Encoding": "gzip, br"}
+        ),
+    }
+    if not chats:
+        print(f"User {local.user} has no chats; skipping chat-specific handlers")
+        return scenarios
+
+    chat_id = chats[0]["id"]
+
+    def media_request():
+        body, content_type = build_multipart({"chat_id": chat_id}, "pixel.png", SAMPLE_PNG, "image/png")
+        return local.request("POST", "/api/messages/media", headers={"Content-Type": content_type}, body=body)
+
+    scenarios.update({
+        "messages_get_by_chat": lambda: local.request(
+            "GET", f"/api/messages/{chat_id}", headers={"Accept-Encoding": "gzip, br"}
+        ),
+        "messages_post_text": lambda: local.request(
+            "POST", "/api/messages/text",
+            headers={"Content-Type": "application/json"},
+            body=json.dumps({"chat_id": chat_id, "content": "Benchmark message"}),
+        ),
+        "messages_post_media": media_request,
+    })
+    return scenarios
+
+
+def benchmark_handler(local: LocalLambda, make_event, requests: int) -> dict:
+    """
+    Invoke one handler repeatedly and measure its latency.
+
+    The handler is called directly (not through the router). Events are built
+    before timing starts.
+
+    Args:
+        local (LocalLambda): Local environment.
+        make_event (Callable): Returns a fresh event for each invocation.
+        requests (int): Number of warm invocations.
+
+    Returns:
+        dict: First and warm invocation timings in milliseconds and error count.
+    """
+    from handlers.router import resolve_route, ROUTES, _get_handler
+
+    event = make_event()
+    handler_func = _get_handler(ROUTES[resolve_route(event)])
+
+    errors = 0
+    start = time.perf_counter()
+    response = handler_func(event, LambdaContext())
+    first = (time.perf_counter() - start) * 1000
+    if int(response["statusCode"]) >= 400:
+        raise RuntimeError(f"Request failed with {int(response['statusCode'])}: {decode_body(response).decode()}")
+
+    timings = []
+    for event in [make_event() for _ in range(requests)]:
+        start = time.perf_counter()
+        response = handler_func(event, LambdaContext())
+        timings.append((time.perf_counter() - start) * 1000)
+        errors += int(response["statusCode"]) >= 400
+
+    quantiles = statistics.quantiles(timings, n=100, method="inclusive")
+    return {
+        "first_ms": first,
+        "p50_ms": statistics.median(timings),
+        "p95_ms": quantiles[94],
+        "p99_ms": quantiles[98],
+        "mean_ms": statistics.fmean(timings),
+        "errors": errors,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Return descriptions of the metrics that exceed the baseline by more than `tolerance`.
+    """
+    regressions = []
+    for name, result in results.items():
+        for metric in ("import_ms", "p50_ms", "p95_ms"):
+            previous = baseline.get(name, {}).get(metric)
+            if previous and result[metric] > previous * tolerance:
+                regressions.append(f"{name} {metric}: {result[metric]:.1f} ms (baseline {previous:.1f} ms)")
+    return regressions
+
+
+def bench(local: LocalLambda, args) -> int:
+    scenarios = build_scenarios(local, args.query)
+    names = args.handlers or list(scenarios)
+    unknown = [name for name in names if name not in scenarios]
+    if unknown:
+        print(f"No benchmark scenario for: {', '.join(unknown)} (available: {', '.join(scenarios)})")
+        return 2
+
+    results = {}
+    print(f"{'handler':<22} {'import':>8} {'first':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'errors':>7}  (ms)")
+    for name in names:
+        import_ms, _ = measure(name, local.env, args.import_runs)
+        result = {"import_ms": import_ms, **benchmark_handler(local, scenarios[name], args.requests)}
+        results[name] = result
+        print(
+            f"{name:<22} {result['import_ms']:>8.1f} {result['first_ms']:>8.1f} {result['p50_ms']:>8.1f} "
+            f"{result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f} {result['errors']:>7}"
+        )
+
+    if local.sqs.messages:
+        print(f"Notifications recorded by the SQS stand-in: {len(local.sqs.messages)}")
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2) + "\n")
+        print(f"Results written to {args.save}")
+
+    if args.baseline:
+        regressions = compare(results, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        if regressions:
+            print("Latency regressions:\n  " + "\n  ".join(regressions))
+            return 1
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user", default=DEFAULT_USER, help="Cognito sub the requests are signed as")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="Serve the API locally")
+    serve_parser.add_argument("--port", type=int, default=3000)
+
+    bench_parser = commands.add_parser("bench", help="Benchmark handlers")
+    bench_parser.add_argument("handlers", nargs="*", help="Handler modules to benchmark (default: all)")
+    bench_parser.add_argument("--requests", type=int, default=100, help="Warm invocations per handler")
+    bench_parser.add_argument("--import-runs", type=int, default=5, help="Cold import measurements per handler")
+    bench_parser.add_argument("--query", default="an", help="Search query for users_get_search")
+    bench_parser.add_argument("--save", help="Write results to this JSON file")
+    bench_parser.add_argument("--baseline", help="Compare with results saved by --save")
+    bench_parser.add_argument("--tolerance", type=float, default=1.25, help="Allowed slowdown factor vs the baseline")
+    args = parser.parse_args()
+    if args.command == "bench" and args.requests < 2:
+        parser.error("--requests must be at least 2")
+
+    # Per-request EMF lines are useful when serving, but would drown the benchmark table
+    local = LocalLambda(user=args.user, emit_metrics=args.command == "serve")
+    try:
+        if args.command == "serve":
+            serve(local, args.port)
+            return 0
+        return bench(local, args)
+    finally:
+        local.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,13 +7,28 @@ in a serverless architecture using AWS Cognito and JSON Web Tokens (JWT).
 
 It supports:
 - Loading Cognito configuration from environment variables.
-- Verifying JWT tokens using the Cognito JWKS endpoint.
+- Loading the Cognito signing keys once per container, during init.
+- Verifying JWT tokens against pre-built public keys indexed by `kid`.
 - Extracting the authenticated user's `sub` from event headers.
 
+Signing keys are loaded by `configure_cognito()` at import time of each
+handler. If a JWKS snapshot file is bundled with the package, it is used
+as-is and no request to Cognito is made during a cold start; otherwise the
+JWKS is downloaded. Either way, a token signed with an unknown `kid`
+(e.g. after key rotation) triggers a fresh download, at most once per
+`JWKS_REFRESH_INTERVAL` seconds. If the download fails, the snapshot is
+used as a fallback.
+
+To bundle a snapshot, save the pool's JWKS before packaging:
+
+    curl "$COGNITO_ISSUER_URL/.well-known/jwks.json" > shared/jwks.json
+
 Environment Variables:
     COGNITO_POOL_ID (str): Cognito User Pool ID.
     COGNITO_CLIENT_ID (str): Cognito App Client ID.
     COGNITO_ISSUER_URL (str): Issuer base URL (e.g., https://cognito-idp.us-east-1.amazonaws.com).
+    COGNITO_JWKS_SNAPSHOT (str, optional): Path of the JWKS snapshot file
+        (defaults to `shared/jwks.json`).
 
 Usage Example:
     from shared.auth import configure_cognito, get_current_user_sub
@@ -25,16 +40,26 @@ Usage Example:
         ...
 """
 
+import json
 import os
-import requests
-from jose import jwt
+import time
+from jose import jwk, jwt
 from jose.exceptions import JWTError
 
-JWKS_CACHE = {}
+from shared.metrics import phase
+
+# Minimum delay between two JWKS downloads triggered by unknown key IDs
+JWKS_REFRESH_INTERVAL = 60
+JWKS_SNAPSHOT_DEFAULT = os.path.join(os.path.dirname(__file__), "jwks.json")
+
+SIGNING_KEYS = {}
 JWKS_URL = None
+JWKS_SNAPSHOT = None
 CLIENT_ID = None
 ISSUER = None
 
+_last_fetch = None
+
 
 def configure_cognito():
     """
@@ -44,11 +69,12 @@ def configure_cognito():
     - Cognito JWKS URL
     - Client ID
     - Issuer URL
+    - Signing keys (from the bundled snapshot or, if absent, from Cognito)
 
     Raises:
         KeyError: If any required environment variable is missing.
     """
-    global JWKS_URL, CLIENT_ID, ISSUER
+    global JWKS_URL, JWKS_SNAPSHOT, CLIENT_ID, ISSUER
 
     client_id = os.environ["COGNITO_CLIENT_ID"]
     issuer_url = os.environ["COGNITO_ISSUER_URL"].rstrip("/")
@@ -56,6 +82,92 @@ def configure_cognito():
     CLIENT_ID = client_id
     ISSUER = issuer_url
     JWKS_URL = f"{ISSUER}/.well-known/jwks.json"
+    JWKS_SNAPSHOT = os.environ.get("COGNITO_JWKS_SNAPSHOT", JWKS_SNAPSHOT_DEFAULT)
+
+    if not SIGNING_KEYS:
+        _set_signing_keys(_load_snapshot() or _fetch_jwks())
+
+
+def _build_keys(jwks: dict | None) -> dict:
+    """
+    Convert a JWKS document into ready-to-use RSA public keys.
+
+    Args:
+        jwks (dict | None): JWKS document with a `keys` list.
+
+    Returns:
+        dict: Public key objects indexed by `kid`.
+    """
+    if not jwks:
+        return {}
+    return {
+        key["kid"]: jwk.construct(key, algorithm="RS256")
+        for key in jwks.get("keys", [])
+        if key.get("kid")
+    }
+
+
+def _set_signing_keys(jwks: dict | None):
+    keys = _build_keys(jwks)
+    if keys:
+        SIGNING_KEYS.clear()
+        SIGNING_KEYS.update(keys)
+
+
+def _load_snapshot() -> dict | None:
+    """
+    Load the bundled JWKS snapshot, if present.
+
+    Returns:
+        dict | None: The snapshot JWKS document, or None if missing or unreadable.
+    """
+    try:
+        with open(JWKS_SNAPSHOT) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _fetch_jwks() -> dict | None:
+    """
+    Download the JWKS document from Cognito.
+
+    Returns:
+        dict | None: The JWKS document, or None if the request failed.
+    """
+    # Imported lazily: cold starts served from the bundled snapshot never need it
+    import requests
+
+    global _last_fetch
+
+    _last_fetch = time.monotonic()
+    try:
+        response = requests.get(JWKS_URL, timeout=3)
+        response.raise_for_status()
+        return response.json()
+    except (requests.RequestException, ValueError) as e:
+        print(f"JWKS download failed: {str(e)}")
+        return None
+
+
+def _get_signing_key(kid: str):
+    """
+    Return the public key for `kid`, refreshing the JWKS once on a miss.
+
+    Args:
+        kid (str): Key ID from the token header.
+
+    Returns:
+        The RSA public key object, or None if the key is unknown.
+    """
+    key = SIGNING_KEYS.get(kid)
+    if key is not None:
+        return key
+
+    if _last_fetch is None or time.monotonic() - _last_fetch >= JWKS_REFRESH_INTERVAL:
+        _set_signing_keys(_fetch_jwks() or _load_snapshot())
+
+    return SIGNING_KEYS.get(kid)
 
 
 def get_current_user_sub(event: dict) -> str:
@@ -80,11 +192,30 @@ def get_current_user_sub(event: dict) -> str:
     return sub
 
 
+def get_display_name(payload: dict) -> str:
+    """
+    Build the user's display name from verified token claims.
+
+    Uses the `given_name` and `family_name` claims of the Cognito ID token,
+    so callers do not need to load the user from the database.
+
+    Args:
+        payload (dict): Verified JWT payload.
+
+    Returns:
+        str: "First Last", or "Unknown (<sub>)" if the name claims are missing.
+    """
+    name = " ".join(
+        part for part in (payload.get("given_name"), payload.get("family_name")) if part
+    )
+    return name or f"Unknown ({payload.get('sub')})"
+
+
 def get_token_payload(event: dict) -> dict:
     """
     Extract and verify the JWT token from Lambda event headers.
 
-    Decodes the JWT using the JWKS public key from Cognito and validates claims.
+    Decodes the JWT using the pre-built Cognito public key for its `kid` and validates claims.
 
     Args:
         event (dict): Lambda event containing the 'Authorization' header.
@@ -103,33 +234,27 @@ def get_token_payload(event: dict) -> dict:
 
     token = auth_header.removeprefix("Bearer ").strip()
 
-    try:
-        # Cache JWKS
-        if not JWKS_CACHE.get("keys"):
-            response = requests.get(JWKS_URL)
-            response.raise_for_status()
-            JWKS_CACHE.update(response.json())
-
-        jwks = JWKS_CACHE["keys"]
-        unverified_header = jwt.get_unverified_header(token)
-        rsa_key = next((key for key in jwks if key["kid"] == unverified_header["kid"]), None)
-
-        if not rsa_key:
-            raise Exception("Unable to find matching key in JWKS")
-
-        payload = jwt.decode(
-            token,
-            rsa_key,
-            algorithms=["RS256"],
-            audience=CLIENT_ID,
-            issuer=ISSUER,
-            options={"verify_at_hash": False}
-        )
-
-        return payload
-
-    except JWTError as e:
-        raise Exception(f"Token validation failed: {str(e)}")
-
-    except Exception as e:
-        raise Exception(f"Error verifying token: {str(e)}")
+    with phase("jwt_verify"):
+        try:
+            unverified_header = jwt.get_unverified_header(token)
+            rsa_key = _get_signing_key(unverified_header.get("kid"))
+
+            if not rsa_key:
+                raise Exception("Unable to find matching key in JWKS")
+
+            payload = jwt.decode(
+                token,
+                rsa_key,
+                algorithms=["RS256"],
+                audience=CLIENT_ID,
+                issuer=ISSUER,
+                options={"verify_at_hash": False}
+            )
+
+            return payload
+
+        except JWTError as e:
+            raise Exception(f"Token validation failed: {str(e)}")
+
+        except Exception as e:
+            raise Exception(f"Error verifying token: {str(e)}")
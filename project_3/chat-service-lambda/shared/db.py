@@ -8,12 +8,33 @@ for use across AWS Lambda handlers in a microservice architecture.
 The connection uses the `psycopg2` driver to connect to a PostgreSQL database.
 All database credentials are loaded from environment variables.
 
+Connection modes (`PSQL_POOL_MODE`):
+    lambda (default): A Lambda container serves one request at a time, so it
+        keeps a single connection and reuses it across invocations. Instead of
+        pinging on every checkout, the connection is only checked with
+        `SELECT 1` after it has been idle for `PSQL_PING_AFTER_IDLE` seconds
+        (e.g. after the container was frozen); a dead connection is replaced
+        transparently.
+    null: No pooling in the container; a connection is opened per session.
+        Use this behind RDS Proxy or pgbouncer, which pool connections on
+        the server side.
+    queue: Regular connection pool with pre-ping, for long-running processes.
+
+The duration of every SQL statement is added to the `db` phase of the
+invocation's metrics (see `shared.metrics`).
+
+All modes avoid session-level state (no server-side prepared statements or
+`SET` commands), so they stay compatible with transaction-pooling proxies.
+
 Environment Variables:
     PSQL_USER (str): PostgreSQL username.
     PSQL_PASSWORD (str): PostgreSQL password.
-    PSQL_HOST (str): PostgreSQL host (hostname or IP address).
+    PSQL_HOST (str): PostgreSQL host (hostname, IP address or proxy endpoint).
     PSQL_PORT (str): PostgreSQL port number.
     PSQL_NAME (str): PostgreSQL database name.
+    PSQL_POOL_MODE (str, optional): `lambda`, `null` or `queue` (default: `lambda`).
+    PSQL_PING_AFTER_IDLE (str, optional): Idle seconds before a reused
+        connection is checked in `lambda` mode (default: 60).
 
 Example usage:
     with sync_session() as session:
@@ -21,8 +42,12 @@ Example usage:
 """
 
 import os
-from sqlalchemy import create_engine
+import time
+from sqlalchemy import create_engine, event, exc
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool
+
+from shared.metrics import add_duration
 
 # --- Environment Configuration ---
 DB_USER = os.environ["PSQL_USER"]
@@ -31,18 +56,98 @@ DB_HOST = os.environ["PSQL_HOST"]
 DB_PORT = os.environ["PSQL_PORT"]
 DB_NAME = os.environ["PSQL_NAME"]
 
+POOL_MODE = os.environ.get("PSQL_POOL_MODE", "lambda")
+PING_AFTER_IDLE = float(os.environ.get("PSQL_PING_AFTER_IDLE", "60"))
+
 DATABASE_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
+CONNECT_ARGS = {"connect_timeout": 5}
+
+
+def _create_engine():
+    """
+    Create the engine for the configured connection mode.
+
+    Returns:
+        Engine: SQLAlchemy engine.
+
+    Raises:
+        ValueError: If `PSQL_POOL_MODE` is not a known mode.
+    """
+    if POOL_MODE == "lambda":
+        lambda_engine = create_engine(
+            DATABASE_URL,
+            echo=False,
+            poolclass=QueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_recycle=1800,
+            connect_args=CONNECT_ARGS,
+        )
+        event.listen(lambda_engine, "checkout", _ping_if_idle)
+        event.listen(lambda_engine, "checkin", _mark_last_used)
+        return lambda_engine
+
+    if POOL_MODE == "null":
+        return create_engine(DATABASE_URL, echo=False, poolclass=NullPool, connect_args=CONNECT_ARGS)
+
+    if POOL_MODE == "queue":
+        return create_engine(
+            DATABASE_URL,
+            echo=False,
+            pool_pre_ping=True,
+            pool_size=5,
+            max_overflow=10,
+            pool_timeout=30,
+            pool_recycle=1800,
+            connect_args=CONNECT_ARGS,
+        )
+
+    raise ValueError(f"Unknown PSQL_POOL_MODE: {POOL_MODE}")
+
+
+def _mark_last_used(_dbapi_connection, connection_record):
+    connection_record.info["last_used"] = time.monotonic()
+
+
+def _ping_if_idle(dbapi_connection, connection_record, _connection_proxy):
+    """
+    Check a reused connection only if it sat idle for longer than `PING_AFTER_IDLE`.
+
+    Raising `DisconnectionError` makes the pool discard the connection and
+    retry the checkout with a new one.
+    """
+    last_used = connection_record.info.get("last_used")
+    if last_used is None or time.monotonic() - last_used < PING_AFTER_IDLE:
+        return
+
+    try:
+        with dbapi_connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except Exception:
+        raise exc.DisconnectionError()
+
+
+def _start_query_timer(conn, _cursor, _statement, _parameters, _context, _executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _record_query_time(conn, _cursor, _statement, _parameters, _context, _executemany):
+    """Add the duration of a finished SQL statement to the `db` phase (see `shared.metrics`)."""
+    add_duration("db", (time.perf_counter() - conn.info["query_start"].pop()) * 1000)
+
+
+def _discard_query_timer(context):
+    # A failed statement never reaches `after_cursor_execute`
+    if context.connection is not None and context.connection.info.get("query_start"):
+        context.connection.info["query_start"].pop()
+
+
 # --- Synchronous Engine and Session Factory ---
-engine = create_engine(
-    DATABASE_URL,
-    echo=False,
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
-    pool_timeout=30,
-    pool_recycle=1800,
-)
+engine = _create_engine()
+event.listen(engine, "before_cursor_execute", _start_query_timer)
+event.listen(engine, "after_cursor_execute", _record_query_time)
+event.listen(engine, "handle_error", _discard_query_timer)
 
 sync_session = sessionmaker(
     bind=engine,
@@ -8,21 +8,21 @@ Includes:
 """
 
 import os
+import re
 import requests
 from base64 import b64decode
-from io import BytesIO
 from typing import Tuple, Dict, Optional
-from email.parser import BytesParser
-from email.policy import EmailPolicy
-from email.message import Message
 
+_BOUNDARY_PATTERN = re.compile(r'boundary=(?:"([^"]+)"|([^;\s]+))', re.IGNORECASE)
+_PARAM_PATTERN = re.compile(r'(\w+)\s*=\s*(?:"((?:[^"\\]|\\.)*)"|([^;\s]+))')
 
-def upload_to_media_service(file_field: Tuple[str, bytes, str]) -> dict[str, str]:
+
+def upload_to_media_service(file_field: Tuple[str, bytes | memoryview, str]) -> dict[str, str]:
     """
     Upload a media file to the media-service and return metadata.
 
     Args:
-        file_field (tuple): A tuple containing (filename, file content as bytes, MIME type).
+        file_field (tuple): A tuple containing (filename, file content as bytes or memoryview, MIME type).
 
     Returns:
         dict: A dictionary with:
@@ -36,7 +36,7 @@ def upload_to_media_service(file_field: Tuple[str, bytes, str]) -> dict[str, str
     upload_url = f"http://{media_host}/media/upload"
 
     files = {
-        "file": (file_field[0], BytesIO(file_field[1]), file_field[2])
+        "file": (file_field[0], file_field[1], file_field[2])
     }
 
     try:
@@ -53,13 +53,56 @@ def upload_to_media_service(file_field: Tuple[str, bytes, str]) -> dict[str, str
         raise Exception(f"Failed to upload media: {str(e)}")
 
 
+def _get_boundary(content_type: str) -> bytes:
+    """
+    Extract the multipart boundary from a Content-Type header value.
+
+    Raises:
+        Exception: If the content type is not multipart/form-data or has no boundary.
+    """
+    if not content_type.lower().startswith("multipart/form-data"):
+        raise Exception("Provided content is not multipart")
+
+    match = _BOUNDARY_PATTERN.search(content_type)
+    if not match:
+        raise Exception("Missing multipart boundary")
+    return (match.group(1) or match.group(2)).encode("latin-1")
+
+
+def _parse_part_headers(raw: bytes) -> Dict[str, str]:
+    """
+    Parse the header block of a multipart part into a dict with lower-cased names.
+    """
+    headers = {}
+    for line in raw.decode("utf-8", errors="replace").split("\r\n"):
+        name, sep, value = line.partition(":")
+        if sep:
+            headers[name.strip().lower()] = value.strip()
+    return headers
+
+
+def _header_params(value: str) -> Dict[str, str]:
+    """
+    Parse `key=value` parameters of a header such as Content-Disposition.
+    """
+    return {
+        key.lower(): token or quoted.replace('\\"', '"')
+        for key, quoted, token in _PARAM_PATTERN.findall(value)
+    }
+
+
 def parse_multipart_file(
     body_base64: str,
     content_type: str
-) -> Tuple[Tuple[str, bytes, str], Dict[str, str]]:
+) -> Tuple[Tuple[str, memoryview, str], Dict[str, str]]:
     """
     Parse a multipart/form-data body from an API Gateway proxy event.
 
+    The body is base64-decoded once; boundaries are then located with
+    `bytes.find` on the decoded buffer, and the file content is returned as
+    a `memoryview` slice of it, so the file bytes are never copied. Only the
+    small part headers and text fields are decoded into new objects.
+
     Args:
         body_base64 (str): Base64-encoded body string from the event.
         content_type (str): Value of the Content-Type header, e.g.:
@@ -67,41 +110,53 @@ def parse_multipart_file(
 
     Returns:
         tuple:
-            - file_field (tuple): A tuple of (filename, file_bytes, content_type).
+            - file_field (tuple): A tuple of (filename, file content as memoryview, content_type).
             - fields (dict): A dictionary of additional form fields {name: value}.
 
     Raises:
         Exception: If the body cannot be parsed or no file part is found.
     """
     try:
-        body_bytes = b64decode(body_base64)
-        full_content = (
-            f"Content-Type: {content_type}\r\n\r\n".encode() + body_bytes
-        )
+        delimiter = b"--" + _get_boundary(content_type)
+        data = b64decode(body_base64)
+        view = memoryview(data)
 
-        msg: Message = BytesParser(policy=EmailPolicy()).parsebytes(full_content)
+        file_field: Optional[Tuple[str, memoryview, str]] = None
+        fields: Dict[str, str] = {}
 
-        if not msg.is_multipart():
-            raise Exception("Provided content is not multipart")
+        pos = data.find(delimiter)
+        if pos < 0:
+            raise Exception("Multipart boundary not found in body")
 
-        file_field: Optional[Tuple[str, bytes, str]] = None
-        fields: Dict[str, str] = {}
+        while True:
+            pos += len(delimiter)
+            # "--" right after a delimiter marks the end of the body
+            if data.startswith(b"--", pos):
+                break
+
+            headers_start = data.find(b"\r\n", pos) + 2
+            headers_end = data.find(b"\r\n\r\n", headers_start - 2)
+            next_delimiter = data.find(b"\r\n" + delimiter, headers_start)
+            if headers_start < 2 or headers_end < 0 or next_delimiter < 0 or headers_end > next_delimiter:
+                raise Exception("Truncated multipart body")
+
+            headers = _parse_part_headers(data[headers_start:headers_end])
+            content_start = headers_end + 4
+            pos = next_delimiter + 2
 
-        for part in msg.get_payload():
-            disposition = part.get("Content-Disposition", "")
-            if "form-data" not in disposition:
+            disposition = headers.get("content-disposition", "")
+            if not disposition.lower().startswith("form-data"):
                 continue
 
-            name = part.get_param("name", header="Content-Disposition")
-            filename = part.get_param("filename", header="Content-Disposition")
+            params = _header_params(disposition)
+            name = params.get("name")
+            filename = params.get("filename")
 
             if filename:
-                file_bytes = part.get_payload(decode=True)
-                file_type = part.get_content_type()
-                file_field = (filename, file_bytes, file_type)
+                file_type = headers.get("content-type", "application/octet-stream").split(";")[0].strip()
+                file_field = (filename, view[content_start:next_delimiter], file_type)
             elif name:
-                value = part.get_content()
-                fields[name] = value
+                fields[name] = data[content_start:next_delimiter].decode("utf-8")
 
         if file_field is None:
             raise Exception("No file uploaded in form-data")
@@ -0,0 +1,110 @@
+# === shared/messages.py ===
+"""
+Single-statement message insertion.
+
+Builds a statement that checks chat membership and inserts a message in one
+database round trip, so handlers do not need to load the chat first.
+
+Usage Example:
+    row = db.execute(build_insert_message_statement(chat_id, sender_sub, content="Hi")).one_or_none()
+
+    if row is None:          -> chat does not exist
+    elif not row.is_participant: -> sender is not a participant
+    elif row.id is None:     -> media message already exists (duplicate confirm);
+                                load it with `select_message_by_media_id(media_id)`
+    else:                    -> row holds the inserted message columns
+"""
+
+from uuid import UUID
+from sqlalchemy import select, literal, true
+from sqlalchemy.dialects.postgresql import insert
+
+from shared.models.chat import Chat
+from shared.models.message import Message
+
+
+def build_insert_message_statement(
+    chat_id: int,
+    sender_sub: str,
+    content: str | None = None,
+    media_url: str | None = None,
+    media_id: UUID | None = None,
+):
+    """
+    Build a statement that inserts a message only if the sender is a chat participant.
+
+    The statement returns no rows if the chat does not exist. Otherwise it
+    returns one row with `is_participant` and the inserted message columns,
+    which are NULL when nothing was inserted. For media messages the insert
+    is also skipped if a message with the same `media_id` already exists;
+    the unique index `uq_messages_media_id` makes this safe against
+    concurrent confirms (`ON CONFLICT DO NOTHING`).
+
+    Args:
+        chat_id (int): Target chat ID.
+        sender_sub (str): Cognito `sub` of the sender.
+        content (str | None): Message text, if any.
+        media_url (str | None): URL of the attached media, if any.
+        media_id (UUID | None): ID of the attached media, if any.
+
+    Returns:
+        Select: The combined select/insert statement.
+    """
+    target = (
+        select(Chat.id, Chat.user1_sub, Chat.user2_sub)
+        .where(Chat.id == chat_id)
+        .cte("target")
+    )
+    sender = literal(sender_sub)
+    is_participant = sender.in_([target.c.user1_sub, target.c.user2_sub])
+
+    source = select(
+        target.c.id,
+        sender,
+        literal(content, Message.content.type),
+        literal(media_url, Message.media_url.type),
+        literal(media_id, Message.media_id.type),
+    ).where(is_participant)
+
+    inserted = insert(Message).from_select(
+        ["chat_id", "sender_sub", "content", "media_url", "media_id"], source
+    )
+    if media_id is not None:
+        inserted = inserted.on_conflict_do_nothing(
+            index_elements=[Message.media_id],
+            index_where=Message.media_id.isnot(None),
+        )
+    inserted = (
+        inserted
+        .returning(
+            Message.id,
+            Message.chat_id,
+            Message.sender_sub,
+            Message.content,
+            Message.media_url,
+            Message.media_id,
+            Message.sent_at,
+        )
+        .cte("inserted")
+    )
+    return (
+        select(is_participant.label("is_participant"), *inserted.c)
+        .select_from(target.outerjoin(inserted, true()))
+    )
+
+
+def select_message_by_media_id(media_id: UUID):
+    """
+    Build a statement that loads the message holding the given media.
+
+    Used after a duplicate confirm, whose insert was skipped. It runs as a
+    separate statement, so it also sees a message committed by a concurrent
+    confirm after the insert statement started.
+
+    Args:
+        media_id (UUID): ID of the attached media.
+
+    Returns:
+        Select: Statement returning the message, if any.
+    """
+    return select(Message).where(Message.media_id == media_id)
@@ -0,0 +1,131 @@
+# === shared/metrics.py ===
+"""
+Per-invocation phase timings in CloudWatch Embedded Metric Format (EMF).
+
+Handlers wrapped with `shared.middleware.lambda_handler` record how long each
+phase of a request takes. Shared modules mark their own phases with `phase()`:
+
+    - jwt_verify: token verification (`shared.auth`)
+    - parse: request body parsing and validation (`shared.middleware`)
+    - db: SQL statements, timed around each cursor execute (`shared.db`)
+    - sqs_publish: publishing notifications (`shared.sqs`)
+    - serialize: JSON encoding and compression of the response (`shared.utils`)
+
+Handlers can time their own calls the same way (e.g. `media_upload`, `s3`).
+
+At the end of the invocation a single JSON log line is printed to stdout.
+In Lambda, CloudWatch Logs turns it into metrics (one per phase, plus the
+total duration) with the route as dimension, so percentiles per route and
+phase can be graphed without any API calls. Run locally, the same line is
+simply printed.
+
+A Lambda container handles one request at a time, so the current recording
+is kept in a module global. Outside a recording `phase()` does nothing.
+
+Optional environment variables:
+    - METRICS_ENABLED: Set to `false` to disable metric log lines (default: `true`).
+    - METRICS_NAMESPACE: CloudWatch namespace (default: `MessengerApp/ChatService`).
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() != "false"
+METRICS_NAMESPACE = os.environ.get("METRICS_NAMESPACE", "MessengerApp/ChatService")
+
+_phases = None
+_cold_start = True
+
+
+def start_recording():
+    """Start recording phase durations for a new invocation."""
+    global _phases
+    _phases = {}
+
+
+def stop_recording() -> dict:
+    """
+    Stop recording and return the recorded phase durations.
+
+    Returns:
+        dict: Total milliseconds per phase name.
+    """
+    global _phases
+    phases, _phases = _phases or {}, None
+    return phases
+
+
+@contextmanager
+def phase(name: str):
+    """
+    Add the time spent in the `with` block to phase `name` of the current invocation.
+
+    A phase entered several times in one invocation (e.g. several SQL
+    statements) accumulates its durations.
+    """
+    if _phases is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_duration(name, (time.perf_counter() - start) * 1000)
+
+
+def add_duration(name: str, milliseconds: float):
+    """Add a duration measured elsewhere to phase `name` of the current invocation."""
+    if _phases is not None:
+        _phases[name] = _phases.get(name, 0.0) + milliseconds
+
+
+def build_metric_log(route: str, duration: float, phases: dict, properties: dict | None = None) -> dict:
+    """
+    Build an EMF log record for one invocation.
+
+    Args:
+        route (str): Route key, used as the metric dimension (e.g. `GET /api/chats`).
+        duration (float): Total handler duration in milliseconds.
+        phases (dict): Milliseconds per phase.
+        properties (dict | None): Extra searchable fields (not metrics).
+
+    Returns:
+        dict: The EMF record.
+    """
+    values = {"duration": duration, **phases}
+    return {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": METRICS_NAMESPACE,
+                "Dimensions": [["Route"]],
+                "Metrics": [{"Name": name, "Unit": "Milliseconds"} for name in values],
+            }],
+        },
+        "Route": route,
+        **(properties or {}),
+        **{name: round(value, 3) for name, value in values.items()},
+    }
+
+
+def emit(route: str, duration: float, phases: dict, properties: dict | None = None):
+    """
+    Print the EMF log line of one invocation to stdout.
+
+    Args:
+        route (str): Route key.
+        duration (float): Total handler duration in milliseconds.
+        phases (dict): Milliseconds per phase.
+        properties (dict | None): Extra searchable fields.
+    """
+    global _cold_start
+
+    cold_start, _cold_start = _cold_start, False
+    if not METRICS_ENABLED:
+        return
+
+    record = build_metric_log(route, duration, phases, {"ColdStart": cold_start, **(properties or {})})
+    print(json.dumps(record, separators=(",", ":")))
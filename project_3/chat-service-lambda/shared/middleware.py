@@ -0,0 +1,191 @@
+# === shared/middleware.py ===
+"""
+Middleware pipeline for Lambda handlers.
+
+Handlers declare the steps they need (authentication, body parsing, database
+session) instead of repeating them, and raise `HTTPError` instead of building
+error responses by hand. The decorator maps errors to responses and records
+per-phase timings, emitted as one CloudWatch EMF log line per invocation
+(see `shared.metrics`).
+
+Each middleware is a function `(request, call_next) -> response` that can
+prepare the request before calling the next step, handle its errors, or
+clean up after it. Middlewares run in the order given.
+
+Usage Example:
+    @lambda_handler("POST /api/messages/text", authenticate, parse_body_as(MessageTextIn), db_session)
+    def handler(request: Request) -> dict:
+        chat = request.db.get(Chat, request.body.chat_id)
+        if chat is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, "Chat not found")
+        ...
+        return build_response(HTTPStatus.OK, message, event=request.event)
+
+The decorated function is a regular `handler(event, context)` Lambda entry
+point, so it can be deployed on its own or dispatched by `handlers/router.py`.
+"""
+
+import functools
+import time
+from collections.abc import Callable
+from http import HTTPStatus
+
+from shared import metrics
+from shared.utils import build_response, parse_body
+
+
+class HTTPError(Exception):
+    """
+    Error that is returned to the client as an HTTP response.
+
+    Attributes:
+        status_code (int): HTTP status code of the response.
+        message (str): Error message, returned under the handler's error key.
+    """
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+class Request:
+    """
+    State of one invocation, filled in by the middlewares.
+
+    Attributes:
+        event (dict): API Gateway proxy event.
+        context (LambdaContext): AWS Lambda context.
+        claims (dict | None): Verified JWT claims (set by `authenticate`).
+        body (BaseModel | None): Validated request body (set by `parse_body_as`).
+        db (Session | None): Database session (set by `db_session`).
+    """
+
+    __slots__ = ("event", "context", "claims", "body", "db")
+
+    def __init__(self, event: dict, context):
+        self.event = event
+        self.context = context
+        self.claims = None
+        self.body = None
+        self.db = None
+
+    @property
+    def user_sub(self) -> str:
+        """Cognito `sub` of the authenticated user."""
+        return self.claims["sub"]
+
+
+Middleware = Callable[[Request, Callable[[Request], dict]], dict]
+
+
+def authenticate(request: Request, call_next) -> dict:
+    """
+    Verify the JWT of the request and store its claims in `request.claims`.
+
+    Raises:
+        HTTPError: 401 if the token is missing or invalid.
+    """
+    # Imported here so handlers without authentication do not load python-jose
+    from shared.auth import get_token_payload
+
+    try:
+        request.claims = get_token_payload(request.event)
+    except Exception as e:
+        raise HTTPError(HTTPStatus.UNAUTHORIZED, str(e))
+
+    if not request.claims.get("sub"):
+        raise HTTPError(HTTPStatus.UNAUTHORIZED, "Missing 'sub' in token payload.")
+    return call_next(request)
+
+
+def parse_body_as(schema) -> Middleware:
+    """
+    Return a middleware that validates the JSON body against a Pydantic model.
+
+    The validated model is stored in `request.body`.
+
+    Args:
+        schema (type[BaseModel]): Model of the request body.
+
+    Returns:
+        Middleware: The parsing middleware (400 on invalid input).
+    """
+    from pydantic import ValidationError
+
+    def parse(request: Request, call_next) -> dict:
+        with metrics.phase("parse"):
+            try:
+                request.body = schema.model_validate(parse_body(request.event))
+            except (ValidationError, ValueError) as e:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, str(e))
+        return call_next(request)
+
+    return parse
+
+
+def db_session(request: Request, call_next) -> dict:
+    """
+    Open a database session for the rest of the pipeline as `request.db`.
+
+    The session is closed when the handler returns; changes must be
+    committed by the handler.
+    """
+    # Imported here so handlers without database access do not load SQLAlchemy
+    from shared.db import sync_session
+
+    with sync_session() as db:
+        request.db = db
+        return call_next(request)
+
+
+def lambda_handler(route: str, *middlewares: Middleware, error_key: str = "detail"):
+    """
+    Turn a function of `Request` into a Lambda handler running the given middlewares.
+
+    Errors are mapped to responses: `HTTPError` to its status code, any other
+    exception to 500 (logged with its traceback). Error bodies have the form
+    `{error_key: message}`.
+
+    After each invocation, the total duration and the phase timings are
+    emitted as an EMF log line with `route` as dimension.
+
+    Args:
+        route (str): Route key of the handler (e.g. `GET /api/chats`).
+        *middlewares (Middleware): Steps to run before the handler, in order.
+        error_key (str): Key of the message in error response bodies.
+
+    Returns:
+        Callable: Decorator producing a `handler(event, context)` function.
+    """
+
+    def decorator(func: Callable[[Request], dict]):
+        def call(request: Request, index: int = 0) -> dict:
+            if index == len(middlewares):
+                return func(request)
+            return middlewares[index](request, lambda req: call(req, index + 1))
+
+        @functools.wraps(func)
+        def handler(event, context):
+            metrics.start_recording()
+            start = time.perf_counter()
+
+            try:
+                response = call(Request(event, context))
+            except HTTPError as e:
+                response = build_response(e.status_code, {error_key: e.message})
+            except Exception as e:
+                import traceback
+                print(f"Unhandled error in {route}:\n{traceback.format_exc()}")
+                response = build_response(HTTPStatus.INTERNAL_SERVER_ERROR, {error_key: str(e)})
+
+            duration = (time.perf_counter() - start) * 1000
+            metrics.emit(route, duration, metrics.stop_recording(), {
+                "StatusCode": int(response["statusCode"]),
+                "RequestId": getattr(context, "aws_request_id", None),
+            })
+            return response
+
+        return handler
+
+    return decorator
@@ -6,7 +6,7 @@ SQLAlchemy model for the Chat table.
 This model represents a conversation between two users.
 """
 
-from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, func
+from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from .base import Base
 
@@ -19,6 +19,8 @@ class Chat(Base):
         user1_sub (str): Cognito `sub` of the first user in the chat.
         user2_sub (str): Cognito `sub` of the second user in the chat.
         created_at (datetime): Timestamp when the chat was created (auto-generated).
+        user1_last_read_id (int | None): ID of the newest message user1 has read.
+        user2_last_read_id (int | None): ID of the newest message user2 has read.
 
     Relationships:
         user1 (User): Relationship to the first user (foreign key: user1_sub).
@@ -32,6 +34,20 @@ class Chat(Base):
     user1_sub = Column(String, ForeignKey("users.sub"), nullable=False)
     user2_sub = Column(String, ForeignKey("users.sub"), nullable=False)
     created_at = Column(DateTime, server_default=func.now())
+    user1_last_read_id = Column(Integer, nullable=True)
+    user2_last_read_id = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index("ix_chats_user1_sub", "user1_sub"),
+        Index("ix_chats_user2_sub", "user2_sub"),
+        # At most one chat per unordered pair of users
+        Index(
+            "uq_chats_participant_pair",
+            func.least(user1_sub, user2_sub),
+            func.greatest(user1_sub, user2_sub),
+            unique=True,
+        ),
+    )
 
     user1 = relationship(
         "User",
@@ -0,0 +1,52 @@
+# === shared/pagination.py ===
+"""
+Cursor helpers for keyset pagination.
+
+Paginated handlers return an opaque cursor that carries the sort key of the
+last row of a page, so the next page can be fetched with a keyset condition
+instead of an OFFSET scan. The cursor is a URL-safe base64 string of a JSON
+array; clients must pass it back unchanged.
+"""
+
+import base64
+import json
+
+
+def encode_cursor(*values) -> str:
+    """
+    Encode sort key values into an opaque, URL-safe cursor string.
+
+    Args:
+        *values: JSON-serializable values of the sort key, in key order.
+
+    Returns:
+        str: URL-safe base64 cursor without padding.
+    """
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """
+    Decode an opaque cursor back into its sort key values.
+
+    Args:
+        cursor (str): Cursor previously produced by `encode_cursor`.
+        size (int): Expected number of values in the sort key.
+
+    Returns:
+        list: The decoded sort key values.
+
+    Raises:
+        ValueError: If the cursor is malformed or has an unexpected shape.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+
+    return values
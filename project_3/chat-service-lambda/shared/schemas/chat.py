@@ -6,6 +6,8 @@ Includes models for representing chat participants, chat list items,
 and payloads for creating new chats.
 """
 
+from datetime import datetime
+from typing import Optional
 from pydantic import BaseModel, Field
 
 
@@ -28,12 +30,16 @@ class ChatListItem(BaseModel):
     """
     A single chat entry in the user's chat list.
 
-    Returned by the GET /api/chats endpoint. Includes the chat ID
-    and the basic data of the other participant.
+    Returned by the GET /api/chats endpoint. Includes the chat ID,
+    the basic data of the other participant, a preview of the last message
+    and the number of messages the user has not read yet.
     """
 
     id: int = Field(..., description="Unique identifier of the chat")
     participant: ChatParticipant = Field(..., description="Basic information about the other participant")
+    last_message_preview: Optional[str] = Field(None, description="Shortened text of the most recent message, if any")
+    last_message_at: Optional[datetime] = Field(None, description="Timestamp of the most recent message, if any")
+    unread_count: int = Field(0, description="Number of messages from the other participant not read yet")
 
     class Config:
         from_attributes = True
@@ -30,6 +30,16 @@ class MessageOut(BaseModel):
         from_attributes = True
 
 
+class MarkReadIn(BaseModel):
+    """
+    Schema for marking a chat as read.
+
+    Used in POST /api/messages/{chat_id}/read requests.
+    """
+
+    message_id: int = Field(..., description="ID of the newest message the user has seen")
+
+
 class MessageTextIn(BaseModel):
     """
     Schema for sending a plain text message.
@@ -55,4 +65,41 @@ class MessageMediaIn(BaseModel):
     sender_sub: str = Field(..., description="Cognito subject identifier (sub) of the sender")
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class MediaUploadIn(BaseModel):
+    """
+    Schema for requesting a direct media upload (first phase of a media message).
+
+    Used in POST /api/messages/media/upload requests.
+    """
+
+    chat_id: int = Field(..., description="ID of the chat to which the media message will be sent")
+    filename: str = Field(..., min_length=1, max_length=255, description="Original name of the file")
+    content_type: str = Field(..., pattern=r"^image/[\w.+-]+$", description="MIME type of the file (images only)")
+
+
+class MediaUploadOut(BaseModel):
+    """
+    Presigned S3 upload target for a media file.
+
+    The client uploads the file with a multipart POST to `url`, sending all
+    `fields` before the `file` field, then confirms the upload.
+    """
+
+    media_id: UUID = Field(..., description="ID reserved for the media; pass it to the confirm request")
+    url: str = Field(..., description="S3 URL to POST the file to")
+    fields: dict[str, str] = Field(..., description="Form fields required by the presigned POST policy")
+    max_bytes: int = Field(..., description="Maximum accepted file size in bytes")
+    expires_in: int = Field(..., description="Seconds until the upload target expires")
+
+
+class MediaConfirmIn(BaseModel):
+    """
+    Schema for confirming a finished direct media upload (second phase of a media message).
+
+    Used in POST /api/messages/media/confirm requests.
+    """
+
+    chat_id: int = Field(..., description="ID of the chat to which the media message is sent")
+    media_id: UUID = Field(..., description="Media ID returned by the upload request")
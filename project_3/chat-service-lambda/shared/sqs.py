@@ -2,8 +2,12 @@
 """
 SQS integration utilities for publishing notification messages.
 
-This module initializes the SQS client and exposes a function to
-send notification messages (as JSON) to the designated SQS queue.
+This module exposes a function to send notification messages (as JSON)
+to the designated SQS queue. Every message carries an `event_id`, which
+notification-service uses to deliver each notification only once although
+SQS may deliver a message more than once. The SQS client (and boto3 itself) is created
+lazily on first use, so importing this module does not slow down the cold
+start of handlers that never publish notifications.
 
 Required environment variables:
     - AWS_REGION
@@ -16,34 +20,50 @@ Required environment variables:
 
 import os
 import json
-import boto3
-from botocore.exceptions import BotoCoreError, ClientError
-from sqlalchemy import select
-from sqlalchemy.orm import Session as SyncSession
-from shared.models import User
-
-# Initialize the SQS client using credentials from environment variables
-sqs = boto3.client(
-    "sqs",
-    region_name=os.environ["AWS_REGION"],
-    aws_access_key_id=os.environ["AWS_ACCESS_KEY_ID"],
-    aws_secret_access_key=os.environ["AWS_SECRET_ACCESS_KEY"],
-    aws_session_token=os.environ["AWS_SESSION_TOKEN"],
-)
+from datetime import datetime
+from uuid import uuid4
+
+from shared.metrics import phase
 
 QUEUE_URL = os.environ.get("AWS_SQS_NOTIFICATION_QUEUE_URL")
 
+_sqs_client = None
+
+
+def get_sqs_client():
+    """
+    Return the shared SQS client, creating it on first use.
 
-def send_notification_to_sqs(user_email: str, message: str) -> None:
+    Returns:
+        botocore.client.SQS: SQS client configured from environment variables.
+    """
+    global _sqs_client
+    if _sqs_client is None:
+        import boto3
+
+        _sqs_client = boto3.client(
+            "sqs",
+            region_name=os.environ["AWS_REGION"],
+            aws_access_key_id=os.environ["AWS_ACCESS_KEY_ID"],
+            aws_secret_access_key=os.environ["AWS_SECRET_ACCESS_KEY"],
+            aws_session_token=os.environ["AWS_SESSION_TOKEN"],
+        )
+    return _sqs_client
+
+
+def send_notification_to_sqs(user_email: str, message: str, event_id: str | None = None) -> None:
     """
     Publish a notification message to Amazon SQS.
 
-    The message payload includes the recipient email and the message content,
-    serialized as JSON and sent to the queue defined by `AWS_SQS_NOTIFICATION_QUEUE_URL`.
+    The message payload includes the event ID, the recipient email and the
+    message content, serialized as JSON and sent to the queue defined by
+    `AWS_SQS_NOTIFICATION_QUEUE_URL`.
 
     Args:
         user_email: Recipient's email address.
         message: Notification message content.
+        event_id: Unique ID of the notification event, used for deduplication
+            by the consumer. A random ID is generated when omitted.
 
     Raises:
         RuntimeError: If QUEUE_URL is not defined or if sending fails.
@@ -52,44 +72,49 @@ def send_notification_to_sqs(user_email: str, message: str) -> None:
         raise RuntimeError("SQS queue URL is not configured")
 
     payload = {
+        "event_id": event_id or str(uuid4()),
         "user_email": user_email,
         "message": message,
     }
 
+    from botocore.exceptions import BotoCoreError, ClientError
+
     try:
-        sqs.send_message(
-            QueueUrl=QUEUE_URL,
-            MessageBody=json.dumps(payload)
-        )
+        with phase("sqs_publish"):
+            get_sqs_client().send_message(
+                QueueUrl=QUEUE_URL,
+                MessageBody=json.dumps(payload)
+            )
     except (BotoCoreError, ClientError) as exc:
         raise RuntimeError("Failed to send message to SQS") from exc
 
 
 def notify_about_message(
-    db: SyncSession,
-    sender_sub: str,
+    message_id: int,
+    chat_id: int,
+    sent_at: datetime,
+    sender_name: str,
     message_text: str | None,
     has_media: bool,
 ) -> None:
     """
     Construct and send a notification to SQS for a new message event.
 
+    The event ID is derived from the message, so at most one notification
+    is delivered per message. Message IDs are reused after the database is
+    reset, so the ID is combined with the chat ID and the send timestamp.
+
     Args:
-        db: Open SQLAlchemy session.
-        sender_sub: Cognito sub of the sender.
+        message_id: ID of the new message.
+        chat_id: ID of the chat the message was sent to.
+        sent_at: Timestamp of the new message.
+        sender_name: Display name of the sender (see `shared.auth.get_display_name`).
         message_text: The plain text message, if any.
         has_media: Whether the message contains media.
 
     Raises:
         RuntimeError: If recipient email is missing in environment.
     """
-    result = db.execute(select(User).where(User.sub == sender_sub))
-    sender = result.scalar_one_or_none()
-    sender_name = (
-        f"{sender.first_name} {sender.last_name}"
-        if sender else f"Unknown ({sender_sub})"
-    )
-
     notification_message = (
         f"You have received a new message\n\n"
         f"From: {sender_name}\n"
@@ -103,5 +128,6 @@ def notify_about_message(
 
     send_notification_to_sqs(
         user_email=receiver_email,
-        message=notification_message
+        message=notification_message,
+        event_id=f"message-{chat_id}-{message_id}-{sent_at.isoformat()}",
     )
@@ -0,0 +1,186 @@
+# === shared/storage.py ===
+"""
+Direct-to-S3 media uploads.
+
+Media messages are created in two phases, so media bytes never pass through
+API Gateway or Lambda:
+
+1. `create_media_upload` reserves an object key for a new media ID and returns
+   a presigned POST that lets the client upload the file straight to S3
+   (size and content type are enforced by the POST policy).
+2. After the upload, `get_uploaded_media` checks the object exists, and the
+   handler creates the message row.
+
+Object keys have the form `uploads/<chat_id>/<sender_sub>/<media_id>`, so a
+confirm request can only refer to uploads reserved by the same user for the
+same chat.
+
+The S3 and DynamoDB clients (and boto3 itself) are created lazily on first use.
+
+Required environment variables:
+    - AWS_REGION
+    - AWS_ACCESS_KEY_ID
+    - AWS_SECRET_ACCESS_KEY
+    - AWS_SESSION_TOKEN
+    - AWS_S3_BUCKET_NAME
+
+Optional environment variables:
+    - AWS_DYNAMODB_MEDIA_TABLE_NAME: Media metadata table; metadata is not
+      saved when unset.
+    - MEDIA_UPLOAD_MAX_BYTES: Maximum file size in bytes (default: 10 MiB).
+    - MEDIA_UPLOAD_EXPIRES_IN: Validity of the presigned POST in seconds (default: 300).
+"""
+
+import os
+from datetime import datetime
+from urllib.parse import quote, unquote
+from uuid import UUID
+
+MEDIA_UPLOAD_MAX_BYTES = int(os.environ.get("MEDIA_UPLOAD_MAX_BYTES", 10 * 1024 * 1024))
+MEDIA_UPLOAD_EXPIRES_IN = int(os.environ.get("MEDIA_UPLOAD_EXPIRES_IN", 300))
+
+_s3_client = None
+_dynamodb_resource = None
+
+
+def get_s3_client():
+    """
+    Return the shared S3 client, creating it on first use.
+
+    Returns:
+        botocore.client.S3: S3 client configured from environment variables.
+    """
+    global _s3_client
+    if _s3_client is None:
+        import boto3
+        from botocore.config import Config
+
+        _s3_client = boto3.client(
+            "s3",
+            region_name=os.environ["AWS_REGION"],
+            aws_access_key_id=os.environ["AWS_ACCESS_KEY_ID"],
+            aws_secret_access_key=os.environ["AWS_SECRET_ACCESS_KEY"],
+            aws_session_token=os.environ["AWS_SESSION_TOKEN"],
+            config=Config(signature_version="s3v4"),
+        )
+    return _s3_client
+
+
+def get_dynamodb():
+    """
+    Return the shared DynamoDB resource, creating it on first use.
+
+    Returns:
+        boto3.resources.factory.dynamodb.ServiceResource: Shared DynamoDB resource.
+    """
+    global _dynamodb_resource
+    if _dynamodb_resource is None:
+        import boto3
+
+        _dynamodb_resource = boto3.resource(
+            "dynamodb",
+            region_name=os.environ["AWS_REGION"],
+            aws_access_key_id=os.environ["AWS_ACCESS_KEY_ID"],
+            aws_secret_access_key=os.environ["AWS_SECRET_ACCESS_KEY"],
+            aws_session_token=os.environ["AWS_SESSION_TOKEN"],
+        )
+    return _dynamodb_resource
+
+
+def build_media_key(chat_id: int, sender_sub: str, media_id: UUID) -> str:
+    """Return the S3 object key reserved for a media upload."""
+    return f"uploads/{chat_id}/{sender_sub}/{media_id}"
+
+
+def build_media_url(key: str) -> str:
+    """Return the public URL of an S3 object in the media bucket."""
+    return f"https://{os.environ['AWS_S3_BUCKET_NAME']}.s3.{os.environ['AWS_REGION']}.amazonaws.com/{key}"
+
+
+def create_media_upload(key: str, filename: str, content_type: str) -> dict:
+    """
+    Create a presigned POST for uploading one media file directly to S3.
+
+    The POST policy pins the object key, the content type and the original
+    file name, and limits the size to `MEDIA_UPLOAD_MAX_BYTES`.
+
+    Args:
+        key (str): Reserved object key (see `build_media_key`).
+        filename (str): Original file name, stored as object metadata.
+        content_type (str): MIME type the file must be uploaded with.
+
+    Returns:
+        dict: `url` to POST to and form `fields` to send before the file field.
+    """
+    fields = {
+        "Content-Type": content_type,
+        "x-amz-meta-filename": quote(filename),
+    }
+    return get_s3_client().generate_presigned_post(
+        Bucket=os.environ["AWS_S3_BUCKET_NAME"],
+        Key=key,
+        Fields=fields,
+        Conditions=[
+            {"Content-Type": content_type},
+            {"x-amz-meta-filename": fields["x-amz-meta-filename"]},
+            ["content-length-range", 1, MEDIA_UPLOAD_MAX_BYTES],
+        ],
+        ExpiresIn=MEDIA_UPLOAD_EXPIRES_IN,
+    )
+
+
+def get_uploaded_media(key: str) -> dict | None:
+    """
+    Return metadata of an uploaded media object.
+
+    Args:
+        key (str): Object key of the upload.
+
+    Returns:
+        dict | None: `filename`, `content_type` and `size` of the object,
+        or None if nothing was uploaded under the key.
+
+    Raises:
+        botocore.exceptions.ClientError: For errors other than a missing object.
+    """
+    from botocore.exceptions import ClientError
+
+    try:
+        head = get_s3_client().head_object(Bucket=os.environ["AWS_S3_BUCKET_NAME"], Key=key)
+    except ClientError as exc:
+        if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+            return None
+        raise
+
+    return {
+        "filename": unquote(head.get("Metadata", {}).get("filename", "")),
+        "content_type": head.get("ContentType", ""),
+        "size": head.get("ContentLength", 0),
+    }
+
+
+def save_media_metadata(media_id: UUID, filename: str, key: str, content_type: str, media_url: str) -> None:
+    """
+    Save metadata of an uploaded media file to DynamoDB, like media-service does.
+
+    Does nothing when `AWS_DYNAMODB_MEDIA_TABLE_NAME` is not set.
+
+    Args:
+        media_id (UUID): ID of the media.
+        filename (str): Original file name.
+        key (str): Object key in S3.
+        content_type (str): MIME type of the file.
+        media_url (str): Public URL of the file.
+    """
+    table_name = os.environ.get("AWS_DYNAMODB_MEDIA_TABLE_NAME")
+    if not table_name:
+        return
+
+    get_dynamodb().Table(table_name).put_item(Item={
+        "id": str(media_id),
+        "filename": filename,
+        "s3_key": key,
+        "content_type": content_type,
+        "uploaded_at": datetime.utcnow().isoformat(),
+        "url": media_url,
+    })
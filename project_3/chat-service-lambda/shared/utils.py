@@ -8,13 +8,116 @@ microservices.
 Functions:
     - build_response: Wraps the payload in a standard API Gateway-compatible response.
     - parse_body: Parses the JSON body from an API Gateway event.
+
+Responses are serialized straight to bytes with pydantic-core's encoder, which
+also handles Pydantic models, datetimes and UUIDs, so handlers can pass
+validated models without dumping them first. When the request event is passed
+and the client accepts it, bodies of at least `RESPONSE_COMPRESSION_MIN_BYTES`
+are Brotli- or gzip-compressed and returned as a base64-encoded (binary)
+API Gateway response.
+
+Optional environment variables:
+    - RESPONSE_COMPRESSION_MIN_BYTES: Smallest body that is compressed (default: 1024).
 """
 
+import base64
+import gzip
 import json
+import os
 from typing import Any
 
+from shared.metrics import phase
+
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.environ.get("RESPONSE_COMPRESSION_MIN_BYTES", 1024))
+
+# Fast settings: responses are compressed on every request, not cached
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+# Default CORS headers allowing all origins and headers (dev mode)
+_BASE_HEADERS = {
+    "Content-Type": "application/json",
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Headers": "*",
+    "Access-Control-Allow-Methods": "GET,POST,PUT,DELETE,OPTIONS,PATCH"
+}
+
+# Precomputed response headers per content encoding (None = uncompressed);
+# shared by all responses, so every response gets its own copy
+_HEADERS = {
+    None: _BASE_HEADERS,
+    "br": {**_BASE_HEADERS, "Content-Encoding": "br", "Vary": "Accept-Encoding"},
+    "gzip": {**_BASE_HEADERS, "Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+}
+
+# `brotli` module, imported on first use (False if it is not installed)
+_brotli = None
+
+
+def _get_brotli():
+    """Return the `brotli` module, or None if it is not installed."""
+    global _brotli
+    if _brotli is None:
+        try:
+            import brotli
+            _brotli = brotli
+        except ImportError:
+            _brotli = False
+    return _brotli or None
+
+
+def _accepted_encodings(event: dict | None) -> set[str]:
+    """
+    Return the content encodings accepted by the client of an API Gateway event.
+
+    Encodings listed with `q=0` are treated as not accepted.
+    """
+    if not event:
+        return set()
+
+    headers = event.get("headers") or {}
+    accept = headers.get("accept-encoding") or headers.get("Accept-Encoding") or ""
+
+    accepted = set()
+    for item in accept.split(","):
+        name, _, params = item.partition(";")
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip().lower())
+    return accepted
+
 
-def build_response(status_code: int, body: Any = None) -> dict:
+def _compress(data: bytes, event: dict | None) -> tuple[bytes, str | None]:
+    """
+    Compress a response body with the best encoding the client accepts.
+
+    Returns:
+        tuple: The (possibly) compressed body and its encoding, or None if
+        the body was left uncompressed.
+    """
+    if len(data) < RESPONSE_COMPRESSION_MIN_BYTES:
+        return data, None
+
+    accepted = _accepted_encodings(event)
+    brotli = _get_brotli() if "br" in accepted else None
+    if brotli is not None:
+        return brotli.compress(data, quality=BROTLI_QUALITY), "br"
+    if "gzip" in accepted or "*" in accepted:
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0), "gzip"
+    return data, None
+
+
+def build_response(
+    status_code: int,
+    body: Any = None,
+    event: dict | None = None,
+    headers: dict | None = None,
+) -> dict:
     """
     Builds a standard HTTP JSON response for API Gateway integration.
 
@@ -22,31 +125,46 @@ def build_response(status_code: int, body: Any = None) -> dict:
 
     Args:
         status_code (int): HTTP status code.
-        body (dict | None): Response payload or None (for 204).
+        body (Any): Response payload (dicts, lists, Pydantic models, ...) or None (for 204).
+        event (dict | None): Request event; enables compression based on its
+            `Accept-Encoding` header.
+        headers (dict | None): Extra response headers (e.g. `X-Next-Cursor`).
 
     Returns:
         dict: API Gateway-compatible response.
     """
-    headers = {
-        "Content-Type": "application/json",
-        "Access-Control-Allow-Origin": "*",
-        "Access-Control-Allow-Headers": "*",
-        "Access-Control-Allow-Methods": "GET,POST,PUT,DELETE,OPTIONS,PATCH"
-    }
-
     if status_code == 204:
         return {
             "statusCode": status_code,
-            "headers": headers,
+            "headers": {**_BASE_HEADERS, **(headers or {})},
             "body": ""
         }
 
+    # Imported on first use so the router and health check stay cheap to import
+    from pydantic_core import to_json
+
+    with phase("serialize"):
+        data = to_json({} if body is None else body)
+        data, encoding = _compress(data, event)
+
+    # Copied even without extra headers, so callers may modify the response's headers
+    response_headers = {**_HEADERS[encoding], **(headers or {})}
+
+    if encoding is None:
+        return {
+            "statusCode": status_code,
+            "headers": response_headers,
+            "body": data.decode()
+        }
+
     return {
         "statusCode": status_code,
-        "headers": headers,
-        "body": json.dumps(body or {})
+        "headers": response_headers,
+        "body": base64.b64encode(data).decode(),
+        "isBase64Encoded": True
     }
 
+
 def parse_body(event: dict) -> dict:
     """
     Parses and returns the JSON body from an API Gateway event.
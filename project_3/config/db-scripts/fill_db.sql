@@ -17,7 +17,9 @@ CREATE TABLE chats (
     id SERIAL PRIMARY KEY,
     user1_sub TEXT NOT NULL REFERENCES users(sub),
     user2_sub TEXT NOT NULL REFERENCES users(sub),
-    created_at TIMESTAMP DEFAULT NOW()
+    created_at TIMESTAMP DEFAULT NOW(),
+    user1_last_read_id INTEGER,
+    user2_last_read_id INTEGER
 );
 
 CREATE TABLE messages (
@@ -30,6 +32,27 @@ CREATE TABLE messages (
     sent_at TIMESTAMP DEFAULT NOW()
 );
 
+-- === Create indexes ===
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Trigram index for user search; must match the query's full-name expression
+CREATE INDEX ix_users_full_name_trgm
+    ON users USING gin ((first_name || ' ' || last_name) gin_trgm_ops);
+
+CREATE INDEX ix_chats_user1_sub ON chats (user1_sub);
+CREATE INDEX ix_chats_user2_sub ON chats (user2_sub);
+
+-- At most one chat per unordered pair of users
+CREATE UNIQUE INDEX uq_chats_participant_pair
+    ON chats (LEAST(user1_sub, user2_sub), GREATEST(user1_sub, user2_sub));
+
+CREATE INDEX ix_messages_chat_id_sent_at ON messages (chat_id, sent_at, id);
+CREATE INDEX ix_messages_sender_sub ON messages (sender_sub);
+
+-- One message per uploaded media, so concurrent media confirms cannot both insert
+CREATE UNIQUE INDEX uq_messages_media_id ON messages (media_id) WHERE media_id IS NOT NULL;
+
 -- === Seed sample users ===
 
 INSERT INTO users (sub, email, first_name, last_name) VALUES
@@ -0,0 +1,9 @@
+-- 0001_chat_read_markers.sql
+-- Per-participant read markers used to compute unread counts in the chats_get Lambda.
+--
+-- fill_db.sql recreates the schema with these columns; this script upgrades an
+-- existing database in place and is safe to run more than once:
+--   psql "$DATABASE_URL" -f config/db-scripts/migrations/0001_chat_read_markers.sql
+
+ALTER TABLE chats ADD COLUMN IF NOT EXISTS user1_last_read_id INTEGER;
+ALTER TABLE chats ADD COLUMN IF NOT EXISTS user2_last_read_id INTEGER;
@@ -0,0 +1,14 @@
+-- 0002_messages_media_id_unique.sql
+-- Unique media ID per message, used by the media confirm Lambda's ON CONFLICT DO NOTHING.
+--
+-- fill_db.sql recreates the schema with this index; this script upgrades an
+-- existing database in place and is safe to run more than once:
+--   psql "$DATABASE_URL" -f config/db-scripts/migrations/0002_messages_media_id_unique.sql
+--
+-- Fails if messages already share a media_id; keep the oldest of each before running:
+--   DELETE FROM messages m USING messages older
+--   WHERE m.media_id = older.media_id AND m.id > older.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_messages_media_id
+    ON messages (media_id)
+    WHERE media_id IS NOT NULL;
@@ -0,0 +1,13 @@
+-- 0003_user_search_trigram.sql
+-- Trigram index used by the users_get_search Lambda's full-name ILIKE filter.
+--
+-- fill_db.sql recreates the schema with this index; this script upgrades an
+-- existing database in place and is safe to run more than once:
+--   psql "$DATABASE_URL" -f config/db-scripts/migrations/0003_user_search_trigram.sql
+--
+-- The indexed expression must match the query's full-name expression.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS ix_users_full_name_trgm
+    ON users USING gin ((first_name || ' ' || last_name) gin_trgm_ops);
@@ -0,0 +1,19 @@
+-- 0004_hot_path_indexes.sql
+-- Indexes for the chat list, chat history and the one-chat-per-pair rule.
+-- The chats_post Lambda's ON CONFLICT clause requires uq_chats_participant_pair.
+--
+-- fill_db.sql recreates the schema with these indexes; this script upgrades an
+-- existing database in place and is safe to run more than once:
+--   psql "$DATABASE_URL" -f config/db-scripts/migrations/0004_hot_path_indexes.sql
+--
+-- The unique index fails if a pair of users already has several chats;
+-- merge or delete the extra chats before running.
+
+CREATE INDEX IF NOT EXISTS ix_chats_user1_sub ON chats (user1_sub);
+CREATE INDEX IF NOT EXISTS ix_chats_user2_sub ON chats (user2_sub);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_chats_participant_pair
+    ON chats (LEAST(user1_sub, user2_sub), GREATEST(user1_sub, user2_sub));
+
+CREATE INDEX IF NOT EXISTS ix_messages_chat_id_sent_at ON messages (chat_id, sent_at, id);
+CREATE INDEX IF NOT EXISTS ix_messages_sender_sub ON messages (sender_sub);
@@ -43,6 +43,10 @@ locals {
         { name = "AWS_SNS_TOPIC_ARN", value = module.sns.topic_arn },
         { name = "AWS_DYNAMODB_NOTIFICATION_TABLE_NAME", value = var.dynamodb_notification_table_name },
         { name = "AWS_SQS_NOTIFICATION_QUEUE_URL", value = module.sqs_notification_queue.queue_url },
+        { name = "AWS_SQS_NOTIFICATION_DLQ_URL", value = module.sqs_notification_queue.dlq_url },
+        { name = "SQS_POLLERS", value = tostring(var.notification_sqs_pollers) },
+        { name = "SQS_MAX_RECEIVES", value = tostring(var.notification_sqs_max_receives) },
+        { name = "METRICS_PORT", value = tostring(var.default_container_port) },
         { name = "AWS_ACCESS_KEY_ID", value = var.aws_access_key_id },
         { name = "AWS_SECRET_ACCESS_KEY", value = var.aws_secret_access_key },
         { name = "AWS_SESSION_TOKEN", value = var.aws_session_token },
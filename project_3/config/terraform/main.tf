@@ -58,9 +58,10 @@ module "dynamodb_notification" {
 }
 
 module "sqs_notification_queue" {
-  source     = "./modules/sqs"
-  queue_name = var.sqs_notification_queue_name          # Nazwa kolejki SQS
-  tags       = var.tags                                 # Wspólne tagi dla wszystkich zasobów
+  source            = "./modules/sqs"
+  queue_name        = var.sqs_notification_queue_name     # Nazwa kolejki SQS
+  max_receive_count = var.notification_sqs_max_receives   # Liczba odbiorów, po której wiadomość trafia do DLQ
+  tags              = var.tags                            # Wspólne tagi dla wszystkich zasobów
 }
 
 module "alb" {
@@ -112,6 +113,7 @@ module "api_gateway" {
   source = "./modules/api_gateway"
 
   lambda_arns         = module.chat_service.lambda_function_arns                  # Mapowanie ścieżek HTTP do funkcji Lambda
+  router_lambda_arn   = var.use_router_lambda ? module.chat_service.lambda_function_arns["router"] : null # Jedna funkcja-router dla wszystkich tras
   cognito_pool_id     = module.cognito.pool_id                                    # ID puli użytkowników Cognito
   cognito_issuer_url  = "https://cognito-idp.${var.aws_region}.amazonaws.com/${module.cognito.pool_id}" # URL issuer'a tokenów JWT Cognito
   tags                = var.tags         # Wspólne tagi dla zasobów
@@ -138,6 +140,10 @@ module "chat_service" {
   # Adres hosta media-service dostępny przez ALB
   media_service_host = module.alb.alb_dns_names["media_service"]
 
+  # Bezpośrednie wysyłanie mediów do S3 (presigned POST) i metadane mediów
+  s3_bucket_name            = module.s3.bucket_name                          # Bucket S3 na pliki mediów
+  dynamodb_media_table_name = module.dynamodb_media.table_name               # Tabela DynamoDB z metadanymi mediów
+
   # Konfiguracja notyfikacji
   sqs_notification_queue_url = module.sqs_notification_queue.queue_url       # URL kolejki SQS do wysyłania zdarzeń
   sns_notification_email     = var.sns_notification_email                    # E-mail do powiadomień SNS
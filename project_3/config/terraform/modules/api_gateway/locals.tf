@@ -38,6 +38,11 @@ locals {
       path       = "/api/messages/{chat_id}"
       authorizer = true
     }
+    mark_chat_read = {
+      method     = "POST"
+      path       = "/api/messages/{chat_id}/read"
+      authorizer = true
+    }
     send_message_text = {
       method     = "POST"
       path       = "/api/messages/text"
@@ -48,5 +53,15 @@ locals {
       path       = "/api/messages/media"
       authorizer = true
     }
+    request_media_upload = {
+      method     = "POST"
+      path       = "/api/messages/media/upload"
+      authorizer = true
+    }
+    confirm_media_upload = {
+      method     = "POST"
+      path       = "/api/messages/media/confirm"
+      authorizer = true
+    }
   }
 }
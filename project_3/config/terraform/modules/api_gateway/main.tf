@@ -6,9 +6,10 @@ resource "aws_apigatewayv2_api" "main" {
   name          = "messenger-app-api"
   protocol_type = "HTTP"
   cors_configuration {
-    allow_origins = ["*"]                      # Zezwól na żądania z dowolnego źródła
-    allow_methods = ["GET", "POST", "OPTIONS"] # Dozwolone metody HTTP
-    allow_headers = ["*"]                      # Dozwolone wszystkie nagłówki
+    allow_origins  = ["*"]                      # Zezwól na żądania z dowolnego źródła
+    allow_methods  = ["GET", "POST", "OPTIONS"] # Dozwolone metody HTTP
+    allow_headers  = ["*"]                      # Dozwolone wszystkie nagłówki
+    expose_headers = ["X-Next-Cursor"]          # Nagłówek stronicowania czytelny dla przeglądarki
   }
   tags          = var.tags
 }
@@ -32,7 +33,7 @@ resource "aws_apigatewayv2_integration" "lambda" {
 
   api_id                 = aws_apigatewayv2_api.main.id
   integration_type       = "AWS_PROXY"                         # Typ integracji proxy – bezpośrednie wywołanie Lambdy
-  integration_uri        = var.lambda_arns[each.key]           # Adres URI funkcji Lambda
+  integration_uri        = coalesce(var.router_lambda_arn, var.lambda_arns[each.key]) # Adres URI funkcji Lambda (router lub funkcja trasy)
   integration_method     = each.value.method                   # Metoda HTTP (GET, POST itd.)
   payload_format_version = "2.0"                               # Format payloadu w wersji 2.0
 }
@@ -55,7 +56,7 @@ resource "aws_lambda_permission" "apigw_lambda" {
 
   statement_id  = "AllowExecutionFromAPIGateway-${each.key}"          # Unikalny identyfikator oświadczenia IAM
   action        = "lambda:InvokeFunction"                             # Działanie: zezwolenie na wywołanie funkcji Lambda
-  function_name = var.lambda_arns[each.key]                           # Nazwa (ARN) funkcji Lambda, do której przydzielane są uprawnienia
+  function_name = coalesce(var.router_lambda_arn, var.lambda_arns[each.key]) # Nazwa (ARN) funkcji Lambda, do której przydzielane są uprawnienia
   principal     = "apigateway.amazonaws.com"                          # Podmiot wykonujący: API Gateway
   source_arn    = "${aws_apigatewayv2_api.main.execution_arn}/*/*"    # Dozwolone źródło wywołania (dowolna metoda i ścieżka w API Gateway)
 }
@@ -5,6 +5,12 @@ variable "lambda_arns" {
   type        = map(string)
 }
 
+variable "router_lambda_arn" {
+  description = "ARN of a single router Lambda handling all routes; when null, each route uses its own function from lambda_arns."
+  type        = string
+  default     = null
+}
+
 variable "cognito_pool_id" {
   description = "ID of the Cognito user pool used to validate JWT tokens."
   type        = string
@@ -105,6 +105,22 @@ locals {
       }
     }
 
+    mark_chat_read = {
+      description = "Handles POST /api/messages/{chat_id}/read in chat-service"
+      handler     = "handlers/messages_post_read.handler"
+      timeout     = 5
+      env = {
+        PSQL_HOST          = var.psql_host
+        PSQL_PORT          = var.psql_port
+        PSQL_USER          = var.psql_user
+        PSQL_PASSWORD      = var.psql_password
+        PSQL_NAME          = var.psql_name
+        COGNITO_POOL_ID    = var.cognito_pool_id
+        COGNITO_CLIENT_ID  = var.cognito_client_id
+        COGNITO_ISSUER_URL = var.cognito_issuer_url
+      }
+    }
+
     send_message_text = {
       description = "Handles POST /api/messages/text in chat-service"
       handler     = "handlers/messages_post_text.handler"
@@ -141,5 +157,66 @@ locals {
         NOTIFICATION_RECEIVER_EMAIL = var.sns_notification_email
       }
     }
+
+    # Dwuetapowe wysyłanie mediów: presigned POST bezpośrednio do S3 (z pominięciem API Gateway i Lambdy)
+    request_media_upload = {
+      description = "Handles POST /api/messages/media/upload in chat-service"
+      handler     = "handlers/messages_post_media_upload.handler"
+      timeout     = 5
+      env = {
+        PSQL_HOST          = var.psql_host
+        PSQL_PORT          = var.psql_port
+        PSQL_USER          = var.psql_user
+        PSQL_PASSWORD      = var.psql_password
+        PSQL_NAME          = var.psql_name
+        COGNITO_POOL_ID    = var.cognito_pool_id
+        COGNITO_CLIENT_ID  = var.cognito_client_id
+        COGNITO_ISSUER_URL = var.cognito_issuer_url
+        AWS_S3_BUCKET_NAME = var.s3_bucket_name
+      }
+    }
+
+    confirm_media_upload = {
+      description = "Handles POST /api/messages/media/confirm in chat-service"
+      handler     = "handlers/messages_post_media_confirm.handler"
+      timeout     = 5
+      env = {
+        PSQL_HOST          = var.psql_host
+        PSQL_PORT          = var.psql_port
+        PSQL_USER          = var.psql_user
+        PSQL_PASSWORD      = var.psql_password
+        PSQL_NAME          = var.psql_name
+        COGNITO_POOL_ID    = var.cognito_pool_id
+        COGNITO_CLIENT_ID  = var.cognito_client_id
+        COGNITO_ISSUER_URL = var.cognito_issuer_url
+        AWS_S3_BUCKET_NAME = var.s3_bucket_name
+        AWS_DYNAMODB_MEDIA_TABLE_NAME = var.dynamodb_media_table_name
+        AWS_SQS_NOTIFICATION_QUEUE_URL = var.sqs_notification_queue_url
+        NOTIFICATION_RECEIVER_EMAIL = var.sns_notification_email
+      }
+    }
+
+    # Wspólny punkt wejścia dla wszystkich endpointów (handlers/router.py) –
+    # współdzieli ciepłe kontenery, klucze Cognito i połączenie z bazą między trasami
+    router = {
+      description = "Dispatches all chat-service API routes to their handlers"
+      handler     = "handlers/router.handler"
+      timeout     = 5
+      env = {
+        PSQL_HOST          = var.psql_host
+        PSQL_PORT          = var.psql_port
+        PSQL_USER          = var.psql_user
+        PSQL_PASSWORD      = var.psql_password
+        PSQL_NAME          = var.psql_name
+        COGNITO_POOL_ID    = var.cognito_pool_id
+        COGNITO_CLIENT_ID  = var.cognito_client_id
+        COGNITO_ISSUER_URL = var.cognito_issuer_url
+        MEDIA_SERVICE_HOST = var.media_service_host
+        AWS_S3_BUCKET_NAME = var.s3_bucket_name
+        AWS_DYNAMODB_MEDIA_TABLE_NAME = var.dynamodb_media_table_name
+        AWS_SQS_NOTIFICATION_QUEUE_URL = var.sqs_notification_queue_url
+        NOTIFICATION_RECEIVER_EMAIL = var.sns_notification_email
+      }
+    }
   }
 }
@@ -59,3 +59,13 @@ variable "sns_notification_email" {
   description = "The email address to subscribe to the SNS topic for notifications"
   type        = string
 }
+
+variable "s3_bucket_name" {
+  description = "Name of the S3 bucket that media files are uploaded to directly"
+  type        = string
+}
+
+variable "dynamodb_media_table_name" {
+  description = "Name of the DynamoDB table storing media metadata"
+  type        = string
+}
@@ -43,6 +43,21 @@ resource "aws_s3_bucket_policy" "this" {
   })
 }
 
+# === CORS ===
+
+# Pozwala przeglądarce wysyłać pliki bezpośrednio do bucketa (presigned POST z chat-service-lambda)
+resource "aws_s3_bucket_cors_configuration" "this" {
+  bucket = aws_s3_bucket.this.id
+
+  cors_rule {
+    allowed_methods = ["GET", "POST", "PUT"]     # Odczyt plików oraz upload przez presigned POST/PUT
+    allowed_origins = ["*"]                      # Dowolne źródło – dostęp kontroluje podpis żądania
+    allowed_headers = ["*"]
+    expose_headers  = ["ETag", "Location"]
+    max_age_seconds = 3000                       # Czas cache'owania odpowiedzi preflight
+  }
+}
+
 # === WŁASNOŚĆ I UPRAWNIENIA ===
 
 resource "aws_s3_bucket_ownership_controls" "this" {
@@ -1,10 +1,33 @@
 # sqs/main.tf
 
+resource "aws_sqs_queue" "dead_letter" {
+  name                      = "${var.queue_name}-dlq"
+  message_retention_seconds = 1209600          # Czas przechowywania wiadomości w DLQ – 14 dni (maksimum)
+
+  tags = var.tags                              # Tagi wspólne dla wszystkich zasobów
+}
+
 resource "aws_sqs_queue" "this" {
   name                       = var.queue_name
   message_retention_seconds = 86400            # Czas przechowywania wiadomości w kolejce – 1 dzień
   visibility_timeout_seconds = 30              # Czas ukrycia wiadomości po jej pobraniu
   receive_wait_time_seconds  = 10              # Czas oczekiwania na nowe wiadomości (long pooling)
 
+  # Wiadomości odebrane więcej niż max_receive_count razy trafiają do DLQ
+  redrive_policy = jsonencode({
+    deadLetterTargetArn = aws_sqs_queue.dead_letter.arn
+    maxReceiveCount     = var.max_receive_count
+  })
+
   tags = var.tags                              # Tagi wspólne dla wszystkich zasobów
-}
\ No newline at end of file
+}
+
+# Do DLQ mogą trafiać tylko wiadomości z głównej kolejki
+resource "aws_sqs_queue_redrive_allow_policy" "dead_letter" {
+  queue_url = aws_sqs_queue.dead_letter.id
+
+  redrive_allow_policy = jsonencode({
+    redrivePermission = "byQueue"
+    sourceQueueArns   = [aws_sqs_queue.this.arn]
+  })
+}
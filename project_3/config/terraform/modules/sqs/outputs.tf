@@ -3,4 +3,9 @@
 output "queue_url" {
   description = "The URL of the SQS queue used to send notification events."
   value       = aws_sqs_queue.this.url
-}
\ No newline at end of file
+}
+
+output "dlq_url" {
+  description = "The URL of the dead-letter queue receiving notification events that failed repeatedly."
+  value       = aws_sqs_queue.dead_letter.url
+}
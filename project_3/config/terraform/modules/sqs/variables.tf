@@ -5,7 +5,13 @@ variable "queue_name" {
   type        = string
 }
 
+variable "max_receive_count" {
+  description = "Number of receives after which a message is moved to the dead-letter queue."
+  type        = number
+  default     = 5
+}
+
 variable "tags" {
   description = "Common tags to apply to all resources."
   type        = map(string)
-}
+}
\ No newline at end of file
@@ -193,8 +193,27 @@ variable "sqs_notification_queue_name" {
   type        = string
 }
 
+variable "notification_sqs_pollers" {
+  description = "Number of concurrent SQS long-pollers in notification-service"
+  type        = number
+  default     = 4
+}
+
+variable "notification_sqs_max_receives" {
+  description = "Number of failed receives after which notification-service moves a message to the DLQ"
+  type        = number
+  default     = 5
+}
+
 # === ECS Cluster configuration ===
 variable "ecs_cluster_name" {
   description = "Name of the ECS cluster"
   type        = string
-}
\ No newline at end of file
+}
+
+# === Lambda routing ===
+variable "use_router_lambda" {
+  description = "Route all API Gateway endpoints to the single router Lambda instead of one function per endpoint."
+  type        = bool
+  default     = true
+}
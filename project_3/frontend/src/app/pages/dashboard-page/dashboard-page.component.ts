@@ -19,6 +19,7 @@ export class DashboardPageComponent implements OnInit, OnDestroy {
   userSub: string | null = null;
   messages: any[] = [];
   loadingMessages: boolean = false;
+  lastReadId: number | null = null;
   messagePollingSub: Subscription | null = null;
   activeView: ViewMode = 'chats';
 
@@ -50,6 +51,7 @@ export class DashboardPageComponent implements OnInit, OnDestroy {
   selectChat(chat: any): void {
     this.selectedChat = chat;
     this.messages = [];
+    this.lastReadId = null;
     this.loadingMessages = true;
 
     this.loadMessagesOnce();
@@ -83,6 +85,25 @@ export class DashboardPageComponent implements OnInit, OnDestroy {
       this.messages = prepared;
       this.loadingMessages = false;
       this.chatWindowRef?.scrollToBottom?.();
+      this.markRead();
+    });
+  }
+
+  // Advances the read marker of the open chat to its newest loaded message
+  private markRead(): void {
+    const chatId = this.selectedChat?.id;
+    const newestId = this.messages[this.messages.length - 1]?.id;
+    if (!chatId || !newestId || (this.lastReadId !== null && this.lastReadId >= newestId)) {
+      return;
+    }
+
+    this.lastReadId = newestId;
+    this.messageService.markChatRead(chatId, newestId).subscribe({
+      error: () => {
+        if (this.selectedChat?.id === chatId && this.lastReadId === newestId) {
+          this.lastReadId = null;
+        }
+      }
     });
   }
 
@@ -93,6 +114,7 @@ export class DashboardPageComponent implements OnInit, OnDestroy {
       loading: !!msg.media_url
     }));
     this.chatWindowRef?.scrollToBottom?.();
+    this.markRead();
   }
 
   onMessageSent(): void {
@@ -1,6 +1,6 @@
 import { Injectable } from '@angular/core';
 import { HttpClient } from '@angular/common/http';
-import { Observable } from 'rxjs';
+import { Observable, switchMap, map } from 'rxjs';
 
 
 @Injectable({
@@ -14,6 +14,11 @@ export class MessageService {
     return this.http.get<any[]>(`api/messages/${chatId}`);
   }
 
+  // Marks a chat as read up to the given message
+  markChatRead(chatId: number, messageId: number): Observable<void> {
+    return this.http.post<void>(`api/messages/${chatId}/read`, { message_id: messageId });
+  }
+
   // Sends a text message to the specified chat
   sendTextMessage(chatId: number, content: string): Observable<any> {
     return this.http.post('api/messages/text', {
@@ -22,12 +27,27 @@ export class MessageService {
     });
   }
 
-  // Sends a media file (e.g., image) to the specified chat
+  // Sends a media file (e.g., image) to the specified chat:
+  // requests a presigned upload, uploads the file directly to S3, then confirms it
   sendMediaMessage(chatId: number, file: File): Observable<any> {
-    const formData = new FormData();
-    formData.append('chat_id', chatId.toString());
-    formData.append('media_file', file);
+    return this.http.post<any>('api/messages/media/upload', {
+      chat_id: chatId,
+      filename: file.name,
+      content_type: file.type
+    }).pipe(
+      switchMap(upload => {
+        const formData = new FormData();
+        Object.entries(upload.fields as Record<string, string>).forEach(
+          ([name, value]) => formData.append(name, value)
+        );
+        formData.append('file', file);
 
-    return this.http.post('api/messages/media', formData);
+        return this.http.post(upload.url, formData).pipe(map(() => upload.media_id));
+      }),
+      switchMap(mediaId => this.http.post('api/messages/media/confirm', {
+        chat_id: chatId,
+        media_id: mediaId
+      }))
+    );
   }
 }
@@ -5,6 +5,44 @@
 This script continuously polls an SQS queue for notification messages,
 sends notifications via SNS, and stores them in DynamoDB.
 
+Messages are consumed concurrently and in batches:
+    - `SQS_POLLERS` threads long-poll the queue, each receiving batches of
+      up to 10 messages.
+    - The notifications of a batch are published with one SNS `PublishBatch`
+      call and saved with one DynamoDB `BatchWriteItem` call.
+    - Successfully processed messages of a batch are acknowledged with a
+      single `DeleteMessageBatch` call.
+
+Each poller finishes its batch before receiving the next one, so at most
+`SQS_POLLERS * 10` messages are in flight.
+
+Notifications are delivered once per producer event ID (`event_id` in the
+message body), although SQS may deliver a message more than once:
+    - IDs delivered recently by this task are kept in an in-memory LRU
+      (see `services.dedup`); their redeliveries are acknowledged right away.
+    - Other IDs are looked up in the notification table, then claimed with
+      a conditional write keyed by the event ID before publishing; only the
+      claimed notifications are published, then marked sent.
+
+Failures are handled per message:
+    - Transient failures (SNS or DynamoDB errors) make the message visible
+      again after an exponential backoff based on its receive count, set with
+      `ChangeMessageVisibility` instead of waiting for the visibility timeout.
+    - Poison messages (invalid body, rejected by SNS, or failed
+      `SQS_MAX_RECEIVES` times) are moved to the dead-letter queue.
+    - While a batch is processed, a heartbeat keeps extending the visibility
+      timeout of its messages, so slow batches are not redelivered to another
+      poller in the meantime.
+
+Instrumentation (see `services.metrics`): error counts, receive batch sizes,
+per-stage latencies (parse, SNS, DynamoDB, delete), message age from
+`SentTimestamp` to processing, and the approximate queue backlog are printed
+as a CloudWatch EMF log line every `METRICS_INTERVAL_SECONDS` and served as
+JSON on `GET /metrics` (port `METRICS_PORT`).
+
+The service stops gracefully on SIGTERM/SIGINT (e.g. when ECS stops the task):
+pollers finish and acknowledge their current batch, then exit.
+
 Environment Variables:
     - AWS_REGION
     - AWS_ACCESS_KEY_ID
@@ -12,77 +50,455 @@ Environment Variables:
     - AWS_SESSION_TOKEN
     - AWS_SQS_NOTIFICATION_QUEUE_URL
     - AWS_SNS_TOPIC_ARN
+    - AWS_SQS_NOTIFICATION_DLQ_URL (optional): Dead-letter queue. When unset, poison
+      messages are left to the queue's redrive policy.
+    - SQS_POLLERS (optional): Number of concurrent long-pollers (default: 4).
+    - SQS_WAIT_TIME_SECONDS (optional): Long-poll wait time, max 20 (default: 20).
+    - SQS_VISIBILITY_TIMEOUT (optional): Visibility timeout of received messages in seconds (default: 30).
+    - SQS_MAX_RECEIVES (optional): Receives after which a failing message is dead-lettered (default: 5).
 """
 
 import json
 import os
+import signal
+import threading
 import time
+from contextlib import contextmanager
 from datetime import datetime
-from uuid import uuid4
 
 import boto3
+from botocore.config import Config
 
-from services.dynamo import save_notification
-from services.sns import send_notification_to_sns
+from services import metrics
+from services.dedup import recent_events
+from services.dynamo import claim_notifications, find_saved_notifications, mark_notifications_sent, release_claims
+from services.sns import get_sns_client, publish_notifications
 
-# Initialize SQS client
+# Maximum batch size supported by ReceiveMessage and the SQS batch actions
+SQS_BATCH_SIZE = 10
+
+SQS_POLLERS = int(os.environ.get("SQS_POLLERS", 4))
+SQS_WAIT_TIME_SECONDS = int(os.environ.get("SQS_WAIT_TIME_SECONDS", 20))
+SQS_VISIBILITY_TIMEOUT = int(os.environ.get("SQS_VISIBILITY_TIMEOUT", 30))
+SQS_MAX_RECEIVES = int(os.environ.get("SQS_MAX_RECEIVES", 5))
+
+# Visibility extension interval while a batch is processed
+HEARTBEAT_INTERVAL_SECONDS = SQS_VISIBILITY_TIMEOUT / 2
+
+# Retry backoff of a failed message: 5s, 10s, 20s, ... up to 5 minutes
+RETRY_BACKOFF_BASE_SECONDS = 5
+RETRY_BACKOFF_MAX_SECONDS = 300
+
+# Delay before polling again after a failed receive
+ERROR_BACKOFF_SECONDS = 5
+
+# Initialize SQS client (thread-safe; each poller uses at most two connections, with its heartbeat)
 sqs = boto3.client(
     "sqs",
     region_name=os.environ["AWS_REGION"],
     aws_access_key_id=os.environ["AWS_ACCESS_KEY_ID"],
     aws_secret_access_key=os.environ["AWS_SECRET_ACCESS_KEY"],
     aws_session_token=os.environ["AWS_SESSION_TOKEN"],
+    config=Config(max_pool_connections=max(10, SQS_POLLERS * 2)),
 )
 
 queue_url = os.environ.get("AWS_SQS_NOTIFICATION_QUEUE_URL")
 if not queue_url:
     raise RuntimeError("Missing SQS queue URL")
 
+dlq_url = os.environ.get("AWS_SQS_NOTIFICATION_DLQ_URL")
 
-def poll_sqs():
-    """Continuously poll the SQS queue and process incoming messages.
+stop_event = threading.Event()
+
+
+def process_batch(messages: list[dict]) -> tuple[list[dict], list[dict], list[tuple[dict, str]]]:
+    """Send and store the notifications carried by a batch of SQS messages.
 
-    For each message received, this function will:
-    - Parse the message body.
-    - Send a notification via SNS.
-    - Persist the notification in DynamoDB.
-    - Remove the message from the SQS queue.
+    Notifications are deduplicated by event ID: IDs delivered recently by this
+    task are skipped without any AWS call, the others are looked up in the
+    notification table with one BatchGetItem call. The new notifications are
+    claimed with one conditional TransactWriteItems call, the claimed ones are
+    published with one PublishBatch call, and the published ones are marked
+    sent. Notifications claimed by another poller are retried later.
+
+    Args:
+        messages (list[dict]): Up to 10 SQS messages as returned by `receive_message`.
+
+    Returns:
+        tuple: Messages whose notification was sent and saved (or had been
+        delivered before), messages that failed transiently, and poison
+        messages with the reason of their rejection.
     """
-    while True:
+    # Entry IDs are the message positions in the batch
+    notifications = {}
+    duplicates = []
+    rejected = []
+    with metrics.timer("ParseLatency"):
+        for index, msg in enumerate(messages):
+            try:
+                payload = json.loads(msg["Body"])
+                notification = {
+                    # Messages from older producers are deduplicated by SQS message ID
+                    "notification_id": payload.get("event_id") or msg["MessageId"],
+                    "user_email": payload["user_email"],
+                    "message": payload["message"],
+                }
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                print(f"Invalid message {msg.get('MessageId')}: {str(e)}")
+                rejected.append((msg, f"Invalid message body: {str(e)}"))
+                continue
+
+            notification_id = notification["notification_id"]
+            if notification_id in recent_events or any(
+                other["notification_id"] == notification_id for other in notifications.values()
+            ):
+                duplicates.append(msg)
+            else:
+                notifications[str(index)] = notification
+    metrics.increment("InvalidMessages", len(rejected))
+
+    if notifications:
+        try:
+            with metrics.timer("DedupLatency"):
+                saved = find_saved_notifications([n["notification_id"] for n in notifications.values()])
+        except Exception as e:
+            print(f"Failed to look up batch of {len(notifications)} notifications: {str(e)}")
+            metrics.increment("DedupErrors", len(notifications))
+            return duplicates, [messages[int(entry_id)] for entry_id in notifications], rejected
+
+        recent_events.add(saved)
+        for entry_id in [entry_id for entry_id, n in notifications.items() if n["notification_id"] in saved]:
+            duplicates.append(messages[int(entry_id)])
+            del notifications[entry_id]
+    metrics.increment("DuplicatesSkipped", len(duplicates))
+
+    if not notifications:
+        return duplicates, [], rejected
+
+    try:
+        with metrics.timer("DynamoDbLatency"):
+            held = claim_notifications(list(notifications.values()))
+    except Exception as e:
+        print(f"Failed to claim batch of {len(notifications)} notifications: {str(e)}")
+        metrics.increment("ClaimErrors", len(notifications))
+        return duplicates, [messages[int(entry_id)] for entry_id in notifications], rejected
+
+    # Held by another poller, or sent in the meantime; the retry finds out which
+    failed = [messages[int(entry_id)] for entry_id, n in notifications.items() if n["notification_id"] in held]
+    metrics.increment("ClaimConflicts", len(held))
+    notifications = {entry_id: n for entry_id, n in notifications.items() if n["notification_id"] not in held}
+    if not notifications:
+        return duplicates, failed, rejected
+
+    try:
+        with metrics.timer("SnsLatency"):
+            published, sns_rejected = publish_notifications(notifications)
+    except Exception as e:
+        print(f"Failed to publish batch of {len(notifications)} notifications: {str(e)}")
+        metrics.increment("PublishErrors", len(notifications))
+        published, sns_rejected = set(), set()
+
+    metrics.increment("PublishErrors", len(notifications) - len(published) - len(sns_rejected))
+    rejected += [(messages[int(entry_id)], "Rejected by SNS") for entry_id in sns_rejected]
+    failed += [messages[int(entry_id)] for entry_id in notifications if entry_id not in published | sns_rejected]
+
+    # Remembered before saving, so redeliveries are skipped even if the save fails
+    published_ids = [notifications[entry_id]["notification_id"] for entry_id in published]
+    recent_events.add(published_ids)
+
+    unpublished_ids = [n["notification_id"] for entry_id, n in notifications.items() if entry_id not in published]
+    if unpublished_ids:
+        try:
+            release_claims(unpublished_ids)
+        except Exception as e:
+            # The claims expire after their lease
+            print(f"Failed to release {len(unpublished_ids)} notification claims: {str(e)}")
+
+    if published_ids:
+        sent_at = datetime.utcnow().isoformat()
+        try:
+            with metrics.timer("DynamoDbLatency"):
+                mark_notifications_sent(published_ids, sent_at)
+        except Exception as e:
+            # Published anyway, so the messages are acknowledged; the claims expire after their lease
+            print(f"Failed to mark {len(published_ids)} notifications sent: {str(e)}")
+            metrics.increment("SaveErrors", len(published_ids))
+
+    return duplicates + [messages[int(entry_id)] for entry_id in sorted(published, key=int)], failed, rejected
+
+
+def delete_messages(messages: list[dict]):
+    """Acknowledge processed messages with a single DeleteMessageBatch call.
+
+    Args:
+        messages (list[dict]): Up to 10 SQS messages to delete.
+    """
+    if not messages:
+        return
+
+    with metrics.timer("DeleteLatency"):
+        response = sqs.delete_message_batch(
+            QueueUrl=queue_url,
+            Entries=[
+                {"Id": str(index), "ReceiptHandle": msg["ReceiptHandle"]}
+                for index, msg in enumerate(messages)
+            ],
+        )
+    for failure in response.get("Failed", []):
+        # The message will be redelivered after the visibility timeout
+        print(f"Failed to delete message {messages[int(failure['Id'])]['MessageId']}: {failure.get('Message')}")
+    metrics.increment("DeleteErrors", len(response.get("Failed", [])))
+
+
+def change_visibility(messages: list[dict], timeouts: list[int]):
+    """Set the visibility timeout of messages with a single ChangeMessageVisibilityBatch call.
+
+    Args:
+        messages (list[dict]): Up to 10 received SQS messages.
+        timeouts (list[int]): New visibility timeout in seconds of each message.
+    """
+    if not messages:
+        return
+
+    response = sqs.change_message_visibility_batch(
+        QueueUrl=queue_url,
+        Entries=[
+            {"Id": str(index), "ReceiptHandle": msg["ReceiptHandle"], "VisibilityTimeout": timeout}
+            for index, (msg, timeout) in enumerate(zip(messages, timeouts))
+        ],
+    )
+    for failure in response.get("Failed", []):
+        print(f"Failed to change visibility of message {messages[int(failure['Id'])]['MessageId']}: {failure.get('Message')}")
+    metrics.increment("VisibilityErrors", len(response.get("Failed", [])))
+
+
+def message_age(msg: dict) -> float:
+    """Return the milliseconds since a message was sent to the queue."""
+    return time.time() * 1000 - int(msg["Attributes"]["SentTimestamp"])
+
+
+def queue_backlog() -> dict:
+    """Return the approximate number of messages in the queue, by state.
+
+    Returns:
+        dict: `Backlog` (visible), `BacklogInFlight` (received, not deleted)
+        and `BacklogDelayed` message counts.
+    """
+    attributes = sqs.get_queue_attributes(
+        QueueUrl=queue_url,
+        AttributeNames=[
+            "ApproximateNumberOfMessages",
+            "ApproximateNumberOfMessagesNotVisible",
+            "ApproximateNumberOfMessagesDelayed",
+        ],
+    )["Attributes"]
+    return {
+        "Backlog": int(attributes["ApproximateNumberOfMessages"]),
+        "BacklogInFlight": int(attributes["ApproximateNumberOfMessagesNotVisible"]),
+        "BacklogDelayed": int(attributes["ApproximateNumberOfMessagesDelayed"]),
+    }
+
+
+def receive_count(msg: dict) -> int:
+    """Return how many times a message has been received, including this time."""
+    return int(msg.get("Attributes", {}).get("ApproximateReceiveCount", 1))
+
+
+def retry_later(messages: list[dict]):
+    """Make failed messages visible again after an exponential backoff.
+
+    The backoff doubles with every receive of the message, from
+    `RETRY_BACKOFF_BASE_SECONDS` up to `RETRY_BACKOFF_MAX_SECONDS`.
+
+    Args:
+        messages (list[dict]): Up to 10 received SQS messages.
+    """
+    change_visibility(messages, [
+        min(RETRY_BACKOFF_BASE_SECONDS * 2 ** (receive_count(msg) - 1), RETRY_BACKOFF_MAX_SECONDS)
+        for msg in messages
+    ])
+    metrics.increment("MessagesRetried", len(messages))
+
+
+def dead_letter_messages(rejected: list[tuple[dict, str]]):
+    """Move poison messages to the dead-letter queue.
+
+    Messages are copied to the DLQ with their failure reason as a message
+    attribute, then deleted from the queue. Without a configured DLQ, or if
+    copying fails, they are hidden for the maximum backoff and left to the
+    queue's redrive policy.
+
+    Args:
+        rejected (list[tuple[dict, str]]): Up to 10 received SQS messages with the reason of their rejection.
+    """
+    if not rejected:
+        return
+
+    messages = [msg for msg, _reason in rejected]
+    if not dlq_url:
+        change_visibility(messages, [RETRY_BACKOFF_MAX_SECONDS] * len(messages))
+        return
+
+    try:
+        response = sqs.send_message_batch(
+            QueueUrl=dlq_url,
+            Entries=[
+                {
+                    "Id": str(index),
+                    "MessageBody": msg["Body"],
+                    "MessageAttributes": {
+                        "FailureReason": {"DataType": "String", "StringValue": reason[:1024]},
+                        "ReceiveCount": {"DataType": "Number", "StringValue": str(receive_count(msg))},
+                    },
+                }
+                for index, (msg, reason) in enumerate(rejected)
+            ],
+        )
+    except Exception as e:
+        print(f"Failed to move {len(messages)} messages to the DLQ: {str(e)}")
+        response = {"Failed": [{"Id": str(index)} for index in range(len(messages))]}
+
+    failed_ids = {failure["Id"] for failure in response.get("Failed", [])}
+    moved = [msg for index, msg in enumerate(messages) if str(index) not in failed_ids]
+    not_moved = [msg for index, msg in enumerate(messages) if str(index) in failed_ids]
+
+    for msg in moved:
+        print(f"Moved message {msg['MessageId']} to the DLQ after {receive_count(msg)} receives")
+    metrics.increment("MessagesDeadLettered", len(moved))
+    metrics.increment("DeadLetterErrors", len(not_moved))
+
+    delete_messages(moved)
+    change_visibility(not_moved, [RETRY_BACKOFF_MAX_SECONDS] * len(not_moved))
+
+
+@contextmanager
+def visibility_heartbeat(messages: list[dict]):
+    """Keep extending the visibility timeout of messages while the `with` block runs.
+
+    Every `HEARTBEAT_INTERVAL_SECONDS` the messages are made invisible for
+    another `SQS_VISIBILITY_TIMEOUT` seconds.
+
+    Args:
+        messages (list[dict]): Received SQS messages being processed.
+    """
+    done = threading.Event()
+
+    def extend():
+        while not done.wait(HEARTBEAT_INTERVAL_SECONDS):
+            try:
+                change_visibility(messages, [SQS_VISIBILITY_TIMEOUT] * len(messages))
+                metrics.increment("VisibilityExtensions")
+            except Exception as e:
+                print(f"Visibility heartbeat error: {str(e)}")
+                metrics.increment("VisibilityErrors", len(messages))
+
+    heartbeat = threading.Thread(target=extend, name=f"{threading.current_thread().name}-heartbeat", daemon=True)
+    heartbeat.start()
+    try:
+        yield
+    finally:
+        done.set()
+        heartbeat.join()
+
+
+def handle_batch(messages: list[dict]):
+    """Process a received batch and settle every message.
+
+    Processed messages are deleted, transient failures are retried after a
+    backoff, and poison messages are moved to the dead-letter queue.
+
+    Args:
+        messages (list[dict]): Up to 10 SQS messages as returned by `receive_message`.
+    """
+    with visibility_heartbeat(messages):
+        processed, failed, rejected = process_batch(messages)
+
+    delete_messages(processed)
+    metrics.increment("MessagesProcessed", len(processed))
+    for msg in processed:
+        metrics.observe("MessageAge", message_age(msg))
+
+    retry = []
+    for msg in failed:
+        if receive_count(msg) >= SQS_MAX_RECEIVES:
+            rejected.append((msg, f"Failed {receive_count(msg)} times"))
+        else:
+            retry.append(msg)
+
+    retry_later(retry)
+    dead_letter_messages(rejected)
+
+
+def poll_batches():
+    """Receive and process batches from SQS until stopped."""
+    while not stop_event.is_set():
         try:
             response = sqs.receive_message(
                 QueueUrl=queue_url,
-                MaxNumberOfMessages=5,
-                WaitTimeSeconds=10,
+                MaxNumberOfMessages=SQS_BATCH_SIZE,
+                WaitTimeSeconds=SQS_WAIT_TIME_SECONDS,
+                VisibilityTimeout=SQS_VISIBILITY_TIMEOUT,
+                AttributeNames=["ApproximateReceiveCount", "SentTimestamp"],
             )
 
             messages = response.get("Messages", [])
+            metrics.observe("BatchSize", len(messages), "Count")
             if not messages:
                 continue
 
-            for msg in messages:
-                try:
-                    payload = json.loads(msg["Body"])
-                    user_email = payload["user_email"]
-                    message = payload["message"]
+            with metrics.timer("BatchLatency"):
+                handle_batch(messages)
+
+        except Exception as e:
+            print(f"SQS polling error: {type(e).__name__}: {str(e)}")
+            metrics.increment("ReceiveErrors")
+            stop_event.wait(ERROR_BACKOFF_SECONDS)
+
+
+def poll_sqs():
+    """Continuously poll the SQS queue and process incoming messages.
+
+    Starts `SQS_POLLERS` long-polling threads, the metrics reporter and
+    the metrics endpoint, and blocks until a stop signal is received. For each batch received, this
+    function will:
+    - Parse the message bodies.
+    - Skip notifications delivered before.
+    - Claim the notifications in DynamoDB (batched).
+    - Send the claimed notifications via SNS (batched).
+    - Mark the sent notifications in DynamoDB (batched).
+    - Remove the processed messages from the SQS queue (batched).
+    - Retry or dead-letter the failed messages.
+    """
+    # Create the shared SNS client before threads start using it
+    get_sns_client()
+
+    metrics_server = metrics.start_http_server()
+    reporter = threading.Thread(target=metrics.report_periodically, args=(stop_event, queue_backlog), name="metrics")
+    reporter.start()
 
-                    notification_id = str(uuid4())
-                    sent_at = datetime.utcnow().isoformat()
+    pollers = [
+        threading.Thread(target=poll_batches, name=f"poller-{index}")
+        for index in range(SQS_POLLERS)
+    ]
+    for poller in pollers:
+        poller.start()
 
-                    send_notification_to_sns(user_email, message)
-                    save_notification(notification_id, user_email, message, sent_at)
+    print(f"Notification service started: {SQS_POLLERS} pollers")
+    for poller in pollers:
+        poller.join()
 
-                    sqs.delete_message(
-                        QueueUrl=queue_url,
-                        ReceiptHandle=msg["ReceiptHandle"],
-                    )
+    reporter.join()
+    if metrics_server is not None:
+        metrics_server.shutdown()
+    print("Notification service stopped")
 
-                except Exception:
-                    pass  # Silently skip to the next message
 
-        except Exception:
-            time.sleep(5)
+def _handle_stop_signal(signum, _frame):
+    print(f"Received signal {signum}, finishing in-flight messages")
+    stop_event.set()
 
 
 if __name__ == "__main__":
+    signal.signal(signal.SIGTERM, _handle_stop_signal)
+    signal.signal(signal.SIGINT, _handle_stop_signal)
     poll_sqs()
@@ -0,0 +1,59 @@
+# === services/dedup.py ===
+
+"""In-memory deduplication of notification events.
+
+SQS delivers messages at least once, so the same notification event can be
+received several times. The IDs of recently delivered events are kept in an
+LRU set, so redeliveries within the hot window are acknowledged without any
+AWS call. Older duplicates are caught by the notification table
+(see `services.dynamo`).
+
+Environment Variables:
+    - DEDUP_CACHE_SIZE (optional): Number of event IDs remembered (default: 10000).
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+DEDUP_CACHE_SIZE = int(os.environ.get("DEDUP_CACHE_SIZE", 10000))
+
+
+class RecentEvents:
+    """Thread-safe LRU set of recently delivered event IDs.
+
+    Attributes:
+        capacity (int): Maximum number of IDs kept; the least recently seen are evicted.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._ids = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, event_id: str) -> bool:
+        with self._lock:
+            if event_id not in self._ids:
+                return False
+            self._ids.move_to_end(event_id)
+            return True
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, event_ids):
+        """Remember delivered event IDs.
+
+        Args:
+            event_ids (Iterable[str]): IDs of delivered events.
+        """
+        with self._lock:
+            for event_id in event_ids:
+                self._ids[event_id] = None
+                self._ids.move_to_end(event_id)
+            while len(self._ids) > self.capacity:
+                self._ids.popitem(last=False)
+
+
+# Events delivered by this task, shared by all pollers
+recent_events = RecentEvents(DEDUP_CACHE_SIZE)
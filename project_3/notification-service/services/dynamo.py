@@ -2,52 +2,209 @@
 
 """DynamoDB service for persisting notification metadata.
 
-Provides a shared DynamoDB client and a helper function to save
-notification records in a specified DynamoDB table.
+Provides a DynamoDB resource and helper functions to claim, look up and
+save batches of notification records in a specified DynamoDB table. Records
+are keyed by the producer's event ID, which makes the table the durable
+record of delivered notifications.
+
+A notification is claimed before it is published: its record is written
+with a conditional put and a `claimed_until` lease, and only the poller
+whose put succeeded publishes it. After publishing, the record is marked
+sent (`sent_at` set, lease removed); on a publish failure the claim is
+released. Claims of a poller that stopped in between expire after
+`NOTIFICATION_CLAIM_LEASE_SECONDS` and can be taken over.
+
+Environment Variables:
+    - NOTIFICATION_CLAIM_LEASE_SECONDS (optional): Lifetime of a claim (default: 300).
+
+boto3 resources are not thread-safe, so each poller thread gets its own
+resource (created from its own session) and notification table.
 """
 
 import os
+import threading
+import time
 import boto3
 
-# Shared DynamoDB resource (singleton)
-_dynamodb_resource = None
+NOTIFICATION_CLAIM_LEASE_SECONDS = int(os.environ.get("NOTIFICATION_CLAIM_LEASE_SECONDS", 300))
+
+# Retries of keys left unprocessed by BatchGetItem
+UNPROCESSED_RETRIES = 3
+UNPROCESSED_RETRY_DELAY = 0.1
+
+# DynamoDB resource of the current thread
+_local = threading.local()
 
 
 def get_dynamodb():
-    """Lazily initialize and return a shared DynamoDB resource.
+    """Lazily initialize and return the DynamoDB resource of the current thread.
 
     Returns:
-        boto3.resources.factory.dynamodb.ServiceResource: A shared DynamoDB resource object.
+        boto3.resources.factory.dynamodb.ServiceResource: The thread's DynamoDB resource object.
     """
-    global _dynamodb_resource
-    if _dynamodb_resource is None:
-        _dynamodb_resource = boto3.resource(
+    if getattr(_local, "dynamodb_resource", None) is None:
+        _local.dynamodb_resource = boto3.session.Session().resource(
             "dynamodb",
             region_name=os.environ["AWS_REGION"],
             aws_access_key_id=os.environ["AWS_ACCESS_KEY_ID"],
             aws_secret_access_key=os.environ["AWS_SECRET_ACCESS_KEY"],
             aws_session_token=os.environ["AWS_SESSION_TOKEN"],
         )
-    return _dynamodb_resource
+    return _local.dynamodb_resource
+
+
+def get_notification_table():
+    """Return the notification table of the current thread's DynamoDB resource.
+
+    The Table object is created once per thread instead of once per write.
+
+    Returns:
+        boto3.resources.factory.dynamodb.Table: The notification table.
+    """
+    if getattr(_local, "notification_table", None) is None:
+        _local.notification_table = get_dynamodb().Table(os.environ["AWS_DYNAMODB_NOTIFICATION_TABLE_NAME"])
+    return _local.notification_table
 
 
-def save_notification(notification_id: str, user_email: str, message: str, sent_at: str):
-    """Save a notification record to DynamoDB.
+def find_saved_notifications(notification_ids: list[str]) -> set[str]:
+    """Return which notifications were already sent, with BatchGetItem.
+
+    Reads are strongly consistent, so notifications sent by any poller just
+    before are found. Records that are only claimed (`claimed_until` set) are
+    not returned. Keys DynamoDB leaves unprocessed are requested again up to
+    `UNPROCESSED_RETRIES` times.
 
     Args:
-        notification_id (str): Unique UUID for the notification.
-        user_email (str): Email address of the recipient.
-        message (str): Content of the notification message.
-        sent_at (str): ISO 8601 UTC timestamp of when the notification was sent.
+        notification_ids (list[str]): Up to 100 notification IDs.
+
+    Returns:
+        set[str]: IDs of the sent notifications found in the table.
+
+    Raises:
+        RuntimeError: If keys remain unprocessed after the retries.
     """
-    dynamodb = get_dynamodb()
-    table = dynamodb.Table(os.environ["AWS_DYNAMODB_NOTIFICATION_TABLE_NAME"])
-
-    item = {
-        "notification_id": notification_id,
-        "user_email": user_email,
-        "message": message,
-        "sent_at": sent_at,
+    table = get_notification_table()
+    request = {
+        table.name: {
+            "Keys": [{"notification_id": notification_id} for notification_id in notification_ids],
+            "ConsistentRead": True,
+            "ProjectionExpression": "notification_id, claimed_until",
+        }
     }
 
-    table.put_item(Item=item)
+    found = set()
+    for attempt in range(UNPROCESSED_RETRIES + 1):
+        if attempt:
+            time.sleep(UNPROCESSED_RETRY_DELAY * attempt)
+
+        response = get_dynamodb().batch_get_item(RequestItems=request)
+        found.update(
+            item["notification_id"]
+            for item in response["Responses"].get(table.name, [])
+            if "claimed_until" not in item
+        )
+
+        request = response.get("UnprocessedKeys")
+        if not request:
+            return found
+
+    raise RuntimeError("Notification lookup left unprocessed keys")
+
+
+def claim_notifications(notifications: list[dict]) -> set[str]:
+    """Claim new notifications before publishing, with one TransactWriteItems call.
+
+    Every put is conditional on the notification ID not being saved yet, or
+    on its claim having expired, so a notification is claimed by at most one
+    poller at a time. If some notifications are held by others (sent, or
+    claimed by another poller processing a redelivered message), the
+    transaction is cancelled and repeated without them.
+
+    Args:
+        notifications (list[dict]): Up to 100 records with `notification_id`,
+            `user_email` and `message`.
+
+    Returns:
+        set[str]: IDs of the notifications that could not be claimed.
+
+    Raises:
+        Exception: If the transaction fails for another reason; nothing was claimed.
+    """
+    table = get_notification_table()
+    # The resource's client converts Python values to DynamoDB attribute values
+    client = table.meta.client
+
+    now = int(time.time())
+    claimed_until = now + NOTIFICATION_CLAIM_LEASE_SECONDS
+    held = set()
+    pending = list(notifications)
+    while pending:
+        try:
+            client.transact_write_items(TransactItems=[
+                {
+                    "Put": {
+                        "TableName": table.name,
+                        "Item": {**notification, "claimed_until": claimed_until},
+                        "ConditionExpression": "attribute_not_exists(notification_id) OR claimed_until < :now",
+                        "ExpressionAttributeValues": {":now": now},
+                    }
+                }
+                for notification in pending
+            ])
+            break
+        except client.exceptions.TransactionCanceledException as e:
+            reasons = e.response.get("CancellationReasons", [])
+            conflicts = {
+                notification["notification_id"]
+                for notification, reason in zip(pending, reasons)
+                if reason.get("Code") == "ConditionalCheckFailed"
+            }
+            if not conflicts:
+                raise
+            held |= conflicts
+            pending = [notification for notification in pending if notification["notification_id"] not in conflicts]
+
+    return held
+
+
+def mark_notifications_sent(notification_ids: list[str], sent_at: str):
+    """Mark claimed notifications as sent with one TransactWriteItems call.
+
+    Args:
+        notification_ids (list[str]): Up to 100 IDs of published notifications.
+        sent_at (str): ISO 8601 UTC timestamp of the publication.
+    """
+    table = get_notification_table()
+    table.meta.client.transact_write_items(TransactItems=[
+        {
+            "Update": {
+                "TableName": table.name,
+                "Key": {"notification_id": notification_id},
+                "UpdateExpression": "SET sent_at = :sent_at REMOVE claimed_until",
+                "ExpressionAttributeValues": {":sent_at": sent_at},
+            }
+        }
+        for notification_id in notification_ids
+    ])
+
+
+def release_claims(notification_ids: list[str]):
+    """Delete the claims of notifications that were not published.
+
+    Each delete is conditional on the record still being a claim, so sent
+    records are never removed. Claims that cannot be released expire after
+    `NOTIFICATION_CLAIM_LEASE_SECONDS`.
+
+    Args:
+        notification_ids (list[str]): IDs of claimed notifications.
+    """
+    table = get_notification_table()
+    client = table.meta.client
+    for notification_id in notification_ids:
+        try:
+            table.delete_item(
+                Key={"notification_id": notification_id},
+                ConditionExpression="attribute_exists(claimed_until)",
+            )
+        except client.exceptions.ConditionalCheckFailedException:
+            pass
@@ -0,0 +1,300 @@
+# === services/metrics.py ===
+
+"""Metrics of the notification poller.
+
+Pollers record three kinds of metrics:
+    - counters with `increment()`: processed messages, errors by kind, retries, ...
+    - distributions with `observe()` or `timer()`: receive batch sizes,
+      per-stage latencies, message age from `SentTimestamp` to processing
+    - gauges with `set_gauge()`: queue backlog, sampled by the reporter
+
+A reporter thread prints the metrics of the last `METRICS_INTERVAL_SECONDS`
+as one JSON log line in CloudWatch Embedded Metric Format (EMF). The ECS task
+logs to CloudWatch Logs, which turns the line into metrics (distributions are
+sent as value arrays, so percentiles can be graphed and alarmed on).
+
+The same data is served as JSON by a small HTTP endpoint (`GET /metrics`):
+cumulative counters, current gauges and the summary of the last interval.
+
+Metrics are shared by all poller threads and protected by a lock.
+
+Environment Variables:
+    - METRICS_ENABLED (optional): Set to `false` to disable metric log lines (default: `true`).
+    - METRICS_NAMESPACE (optional): CloudWatch namespace (default: `MessengerApp/NotificationService`).
+    - METRICS_INTERVAL_SECONDS (optional): Interval between reports (default: 60).
+    - METRICS_PORT (optional): Port of the HTTP endpoint, `0` to disable (default: 8080).
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() != "false"
+METRICS_NAMESPACE = os.environ.get("METRICS_NAMESPACE", "MessengerApp/NotificationService")
+METRICS_INTERVAL_SECONDS = int(os.environ.get("METRICS_INTERVAL_SECONDS", 60))
+METRICS_PORT = int(os.environ.get("METRICS_PORT", 8080))
+
+# Counters reported even when zero, so alarms see explicit zeros
+ERROR_COUNTERS = (
+    "ReceiveErrors",
+    "InvalidMessages",
+    "PublishErrors",
+    "DedupErrors",
+    "ClaimErrors",
+    "SaveErrors",
+    "DeleteErrors",
+    "VisibilityErrors",
+    "DeadLetterErrors",
+)
+
+# Maximum number of values of one metric in an EMF record
+MAX_SAMPLES = 100
+
+_lock = threading.Lock()
+_counters = {}
+_totals = {}
+_distributions = {}
+_gauges = {}
+_last_interval = {}
+_started_at = _last_report_at = time.time()
+
+
+class Distribution:
+    """Values of one metric observed during a reporting interval.
+
+    Count, sum and maximum are exact; percentiles are computed from a uniform
+    sample of at most `MAX_SAMPLES` values (reservoir sampling).
+    """
+
+    def __init__(self, unit: str):
+        self.unit = unit
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = []
+
+    def add(self, value: float):
+        """Add one observed value."""
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append(value)
+        else:
+            index = random.randrange(self.count)
+            if index < MAX_SAMPLES:
+                self.samples[index] = value
+
+    def percentile(self, fraction: float) -> float:
+        """Return the sampled value at `fraction` (0-1) of the ordered samples."""
+        ordered = sorted(self.samples)
+        return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+    def summary(self) -> dict:
+        """Return count, average, maximum and percentiles of the values."""
+        return {
+            "count": self.count,
+            "avg": round(self.total / self.count, 3),
+            "p50": round(self.percentile(0.50), 3),
+            "p95": round(self.percentile(0.95), 3),
+            "p99": round(self.percentile(0.99), 3),
+            "max": round(self.max, 3),
+        }
+
+
+def increment(name: str, value: int = 1):
+    """Add `value` to counter `name`.
+
+    Args:
+        name (str): Metric name (e.g. `PublishErrors`).
+        value (int): Amount to add.
+    """
+    if not value:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+        _totals[name] = _totals.get(name, 0) + value
+
+
+def observe(name: str, value: float, unit: str = "Milliseconds"):
+    """Record one value of distribution `name`.
+
+    Args:
+        name (str): Metric name (e.g. `SnsLatency`).
+        value (float): Observed value.
+        unit (str): CloudWatch unit of the metric.
+    """
+    with _lock:
+        if name not in _distributions:
+            _distributions[name] = Distribution(unit)
+        _distributions[name].add(value)
+
+
+@contextmanager
+def timer(name: str):
+    """Record the duration of the `with` block in milliseconds as distribution `name`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, (time.perf_counter() - start) * 1000)
+
+
+def set_gauge(name: str, value: float):
+    """Set the current value of gauge `name` (e.g. `Backlog`)."""
+    with _lock:
+        _gauges[name] = value
+
+
+def collect() -> tuple[dict, dict, dict]:
+    """Return the metrics of the interval since the previous call and reset them.
+
+    Returns:
+        tuple[dict, dict, dict]: Count per counter, `Distribution` per
+        distribution, and value per gauge.
+    """
+    global _counters, _distributions
+    with _lock:
+        counters, _counters = _counters, {}
+        distributions, _distributions = _distributions, {}
+        gauges = dict(_gauges)
+    return {**dict.fromkeys(ERROR_COUNTERS, 0), **counters}, distributions, gauges
+
+
+def build_metric_log(counters: dict, distributions: dict, gauges: dict) -> dict:
+    """Build an EMF log record for one reporting interval.
+
+    Distributions are included as value arrays, with their summary as a
+    `<name>Summary` property for log queries.
+
+    Args:
+        counters (dict): Count per metric name.
+        distributions (dict): `Distribution` per metric name.
+        gauges (dict): Value per metric name.
+
+    Returns:
+        dict: The EMF record.
+    """
+    metrics = (
+        [{"Name": name, "Unit": "Count"} for name in counters]
+        + [{"Name": name, "Unit": distribution.unit} for name, distribution in distributions.items()]
+        + [{"Name": name, "Unit": "None"} for name in gauges]
+    )
+    return {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": METRICS_NAMESPACE,
+                "Dimensions": [["Service"]],
+                "Metrics": metrics,
+            }],
+        },
+        "Service": "notification-service",
+        **counters,
+        **{name: [round(value, 3) for value in distribution.samples] for name, distribution in distributions.items()},
+        **{f"{name}Summary": distribution.summary() for name, distribution in distributions.items()},
+        **gauges,
+    }
+
+
+def report():
+    """Print the metrics accumulated since the previous report as an EMF log line.
+
+    Throughput (`MessagesPerSecond`) is derived from the processed messages
+    and the actual time since the previous report.
+    """
+    global _last_interval, _last_report_at
+
+    counters, distributions, gauges = collect()
+    now = time.time()
+    elapsed, _last_report_at = now - _last_report_at, now
+    gauges["MessagesPerSecond"] = round(counters.get("MessagesProcessed", 0) / max(elapsed, 0.001), 3)
+
+    _last_interval = {
+        "seconds": round(elapsed, 1),
+        "counters": counters,
+        "throughput": gauges["MessagesPerSecond"],
+        "distributions": {name: distribution.summary() for name, distribution in distributions.items()},
+    }
+    if METRICS_ENABLED:
+        print(json.dumps(build_metric_log(counters, distributions, gauges), separators=(",", ":")))
+
+
+def report_periodically(stop_event: threading.Event, sample_gauges=None):
+    """Report metrics every `METRICS_INTERVAL_SECONDS` until stopped, then once more.
+
+    Args:
+        stop_event (threading.Event): Event set when the service stops.
+        sample_gauges (Callable[[], dict] | None): Called before each report;
+            returns gauge values to set (e.g. the queue backlog).
+    """
+    while True:
+        stopped = stop_event.wait(METRICS_INTERVAL_SECONDS)
+        if sample_gauges is not None and not stopped:
+            try:
+                for name, value in sample_gauges().items():
+                    set_gauge(name, value)
+            except Exception as e:
+                print(f"Failed to sample gauges: {str(e)}")
+        report()
+        if stopped:
+            return
+
+
+def snapshot() -> dict:
+    """Return the metrics served by the HTTP endpoint.
+
+    Returns:
+        dict: Uptime, cumulative counters, current gauges and the last reported interval.
+    """
+    with _lock:
+        totals = dict(_totals)
+        gauges = dict(_gauges)
+    return {
+        "uptime_seconds": round(time.time() - _started_at, 1),
+        "interval_seconds": METRICS_INTERVAL_SECONDS,
+        "counters": totals,
+        "gauges": gauges,
+        "last_interval": _last_interval,
+    }
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Serve `snapshot()` as JSON on `GET /metrics`."""
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+
+        body = json.dumps(snapshot()).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes would flood the service logs
+        pass
+
+
+def start_http_server() -> ThreadingHTTPServer | None:
+    """Serve the metrics endpoint on `METRICS_PORT` in a daemon thread.
+
+    Returns:
+        ThreadingHTTPServer | None: The running server (call `shutdown()` to
+        stop it), or None if the endpoint is disabled.
+    """
+    if not METRICS_PORT:
+        return None
+
+    server = ThreadingHTTPServer(("", METRICS_PORT), MetricsRequestHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    print(f"Metrics endpoint listening on port {METRICS_PORT}")
+    return server
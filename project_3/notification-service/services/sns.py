@@ -3,7 +3,7 @@
 """SNS service for publishing notifications.
 
 Provides utility functions to initialize an SNS client and publish
-messages to a configured SNS topic.
+batches of messages to a configured SNS topic.
 
 Environment Variables:
     - AWS_REGION
@@ -14,7 +14,16 @@ Environment Variables:
 """
 
 import os
+import time
 import boto3
+from botocore.config import Config
+
+# Enough HTTP connections for the concurrent pollers in main.py (botocore defaults to 10)
+MAX_POOL_CONNECTIONS = max(10, int(os.environ.get("SQS_POLLERS", 4)))
+
+# Retries of PublishBatch entries that failed on the SNS side
+PUBLISH_RETRIES = 2
+PUBLISH_RETRY_DELAY = 0.2
 
 _sns_client = None
 
@@ -22,6 +31,8 @@ _sns_client = None
 def get_sns_client():
     """Initialize and return a shared SNS client instance.
 
+    Clients are thread-safe, so one instance is shared by all pollers.
+
     Returns:
         boto3.client: A configured SNS client.
 
@@ -39,28 +50,63 @@ def get_sns_client():
         aws_access_key_id=os.environ["AWS_ACCESS_KEY_ID"],
         aws_secret_access_key=os.environ["AWS_SECRET_ACCESS_KEY"],
         aws_session_token=os.environ["AWS_SESSION_TOKEN"],
+        config=Config(max_pool_connections=MAX_POOL_CONNECTIONS),
     )
     return _sns_client
 
 
-def send_notification_to_sns(user_email: str, message: str) -> dict:
-    """Publish a notification message to the configured SNS topic.
+def publish_notifications(notifications: dict[str, dict]) -> tuple[set[str], set[str]]:
+    """Publish up to 10 notifications to the configured SNS topic in one PublishBatch call.
+
+    Entries rejected by SNS for server-side reasons (e.g. throttling) are
+    retried up to `PUBLISH_RETRIES` times; only the failed entries are sent
+    again. Entries rejected because of their content are not retried.
 
     Args:
-        user_email (str): Recipient email address (for context only).
-        message (str): Notification message body.
+        notifications (dict[str, dict]): Notifications keyed by batch entry ID,
+            each with `user_email` (for context only) and `message`.
 
     Returns:
-        dict: Response from SNS publish operation.
+        tuple[set[str], set[str]]: IDs of the notifications that were published,
+        and IDs of the notifications SNS rejected because of their content.
+        Any other ID failed transiently.
 
     Raises:
-        Exception: If the message fails to publish.
+        Exception: If the PublishBatch request itself fails.
     """
     sns = get_sns_client()
-
-    response = sns.publish(
-        TopicArn=os.environ["AWS_SNS_TOPIC_ARN"],
-        Message=message,
-        Subject=f"New notification for {user_email}",
-    )
-    return response
+    topic_arn = os.environ["AWS_SNS_TOPIC_ARN"]
+
+    published = set()
+    rejected = set()
+    pending = dict(notifications)
+    for attempt in range(PUBLISH_RETRIES + 1):
+        if attempt:
+            time.sleep(PUBLISH_RETRY_DELAY * attempt)
+
+        response = sns.publish_batch(
+            TopicArn=topic_arn,
+            PublishBatchRequestEntries=[
+                {
+                    "Id": entry_id,
+                    "Message": notification["message"],
+                    "Subject": f"New notification for {notification['user_email']}",
+                }
+                for entry_id, notification in pending.items()
+            ],
+        )
+        published.update(entry["Id"] for entry in response.get("Successful", []))
+
+        retryable = {}
+        for failure in response.get("Failed", []):
+            print(f"SNS rejected notification {failure['Id']}: {failure.get('Code')} {failure.get('Message')}")
+            if failure.get("SenderFault"):
+                rejected.add(failure["Id"])
+            else:
+                retryable[failure["Id"]] = pending[failure["Id"]]
+
+        if not retryable:
+            break
+        pending = retryable
+
+    return published, rejected